@@ -0,0 +1,109 @@
+"""Бенчмарк импорта модуля с большим количеством контроллеров.
+
+Генерирует модуль с `--controllers` контроллерами (обычными и обобщёнными наследниками) и измеряет время его импорта.
+
+Запуск:
+    python -m benchmarks.class_construction --controllers 1000 --repeat 5
+"""
+import argparse
+import importlib
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+HEADER = '''
+from typing import Generic, List, TypeVar
+
+from fastapi import Depends
+from pydantic import BaseModel
+
+from class_based_fastapi import Routable, delete, get, post, put
+
+T = TypeVar("T")
+
+
+def get_db() -> int:
+    return 1
+
+
+class Item(BaseModel):
+    id: int
+
+
+class BaseController(Routable):
+    db: int = Depends(get_db)
+
+    @get("{id}")
+    def get_item(self, id: int) -> int:
+        return id
+
+    @post("")
+    def add_item(self) -> int:
+        return self.db
+
+
+class GenericController(Routable, Generic[T]):
+
+    @get("")
+    def get_list(self) -> List[T]:
+        return []
+
+    @put("")
+    def update(self, model: T) -> T:
+        return model
+
+    @delete("{id}")
+    def remove(self, id: int) -> bool:
+        return True
+'''
+
+CONTROLLER = '''
+
+class Controller{i}(BaseController):
+    NAME_MODULE = "Module{i}"
+
+    @get("extra")
+    def extra(self) -> str:
+        return "{i}"
+
+
+class GenericController{i}(GenericController[Item]):
+    NAME_MODULE = "Module{i}"
+'''
+
+
+def generate_module(directory: Path, name: str, controllers: int) -> None:
+    source = HEADER + ''.join(CONTROLLER.format(i=i) for i in range(controllers // 2))
+    (directory / f'{name}.py').write_text(source, encoding='utf-8')
+
+
+def measure(name: str) -> float:
+    sys.modules.pop(name, None)
+    importlib.invalidate_caches()
+    start = time.perf_counter()
+    importlib.import_module(name)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--controllers', type=int, default=1000)
+    parser.add_argument('--repeat', type=int, default=5)
+    options = parser.parse_args()
+
+    name = 'bench_generated_controllers'
+    with tempfile.TemporaryDirectory() as directory:
+        generate_module(Path(directory), name, options.controllers)
+        sys.path.insert(0, directory)
+        sys.dont_write_bytecode = True
+        timings = [measure(name) for _ in range(options.repeat)]
+
+    print(f'controllers: {options.controllers}')
+    print(f'import, min:    {min(timings) * 1000:.1f} ms')
+    print(f'import, median: {statistics.median(timings) * 1000:.1f} ms')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,78 @@
+"""Бенчмарк экземпляров контроллера с `SLOTS = True` и без.
+
+Измеряет время создания экземпляра (так же, как это делает FastAPI для каждого запроса) и память,
+занимаемую `--instances` одновременно живущими экземплярами.
+
+Запуск:
+    python -m benchmarks.controller_slots --instances 100000
+"""
+import argparse
+import timeit
+import tracemalloc
+
+from fastapi import Depends
+
+from class_based_fastapi import Routable, get
+
+
+def get_db() -> int:
+    return 1
+
+
+def get_cache() -> dict:
+    return {}
+
+
+class DictController(Routable):
+    db: int = Depends(get_db)
+    cache: dict = Depends(get_cache)
+    user: str = Depends(get_db)
+
+    @get('')
+    def index(self) -> int:
+        return self.db
+
+
+class SlotsController(Routable):
+    SLOTS = True
+    db: int = Depends(get_db)
+    cache: dict = Depends(get_cache)
+    user: str = Depends(get_db)
+
+    @get('')
+    def index(self) -> int:
+        return self.db
+
+
+def construction_ns(controller: type, number: int) -> float:
+    cache = {}
+    timings = timeit.repeat(lambda: controller(db=1, cache=cache, user='user'), number=number, repeat=5)
+    return min(timings) / number * 1e9
+
+
+def memory_bytes(controller: type, instances: int) -> float:
+    cache = {}
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    objects = [controller(db=i, cache=cache, user='user') for i in range(instances)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del objects
+    return (after - before) / instances
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--instances', type=int, default=100000)
+    options = parser.parse_args()
+
+    for controller in (DictController, SlotsController):
+        print(
+            f'{controller.__name__:16} '
+            f'construction: {construction_ns(controller, options.instances):7.1f} ns, '
+            f'memory: {memory_bytes(controller, options.instances):6.1f} B/instance'
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,74 @@
+"""Микробенчмарк формирования путей методов API.
+
+Сравнивает скомпилированные шаблоны (`format_route_path`) с прежним алгоритмом на последовательных
+`str.replace` и `snake_case` без кэша для `--endpoints` методов.
+
+Запуск:
+    python -m benchmarks.path_templates --endpoints 10000
+"""
+import argparse
+import time
+
+from class_based_fastapi.templates_formatting import format_route_path
+from class_based_fastapi.utilities import snake_case
+
+BASE_TEMPLATE = '/{module}/{controller}/v{version}/{user_path}'
+USER_PATHS = ('', '{id}', 'items/{id}', 'get-list/{x}', '/{module}/get')
+
+
+def legacy_rest_api_naming(name: str) -> str:
+    return snake_case(name).replace('_', '-')
+
+
+def legacy_format_route_path(base_template: str, user_path: str, name_module: str, version_api: str, controller: str) -> str:
+    if not str.startswith(user_path, '/'):
+        user_path = base_template.replace('{user_path}', user_path)
+    if '{module}' in user_path and (name_module is None or name_module == ''):
+        user_path = user_path.replace('/{module}', '')
+    if str.endswith(user_path, '/'):
+        user_path = user_path[:-1]
+    name_module = legacy_rest_api_naming(name_module)
+    return (
+        user_path.replace('{module}', name_module)
+        .replace('{version}', str.lower(version_api))
+        .replace('{controller}', legacy_rest_api_naming(controller))
+    )
+
+
+def endpoints(count: int) -> list:
+    controllers = max(count // len(USER_PATHS), 1)
+    return [
+        (BASE_TEMPLATE, user_path, f'Module{i % 20}', '1.0', f'GeneratedController{i}')
+        for i in range(controllers)
+        for user_path in USER_PATHS
+    ][:count]
+
+
+def measure(function, items: list, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for item in items:
+            function(*item)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--endpoints', type=int, default=10000)
+    parser.add_argument('--repeat', type=int, default=5)
+    options = parser.parse_args()
+
+    items = endpoints(options.endpoints)
+    assert [format_route_path(*item) for item in items] == [legacy_format_route_path(*item) for item in items]
+
+    legacy = measure(legacy_format_route_path, items, options.repeat)
+    compiled = measure(format_route_path, items, options.repeat)
+    print(f'endpoints: {len(items)}')
+    print(f'str.replace + snake_case: {legacy * 1000:7.2f} ms')
+    print(f'compiled templates:       {compiled * 1000:7.2f} ms')
+
+
+if __name__ == '__main__':
+    main()
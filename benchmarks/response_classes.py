@@ -0,0 +1,75 @@
+"""Бенчмарк классов JSON-ответа на телах от 1 КБ до 10 МБ.
+
+Сравнивает сериализацию списка моделей pydantic (UUID, datetime, вложенные списки):
+
+* `JSONResponse` — как в FastAPI по умолчанию: модель ответа формирует словари (`mode='json'`), затем `json.dumps`;
+* `FastJSONResponse` после модели ответа — замена класса ответа (`RESPONSE_CLASS`) без других изменений;
+* `FastJSONResponse` без модели ответа — модели сериализуются orjson напрямую;
+* `TypeAdapter.dump_json` — заранее подготовленный сериализатор (`precompile=True`).
+
+Запуск:
+    python -m benchmarks.response_classes --repeat 5
+"""
+import argparse
+import datetime
+import time
+import uuid
+from typing import Callable, List
+
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel, TypeAdapter
+
+from class_based_fastapi.responses import FAST_JSON_AVAILABLE, FastJSONResponse
+
+SIZES = [('1 KB', 1024), ('10 KB', 10 * 1024), ('100 KB', 100 * 1024), ('1 MB', 1024 ** 2), ('10 MB', 10 * 1024 ** 2)]
+
+
+class Row(BaseModel):
+    id: uuid.UUID
+    name: str
+    price: float
+    created: datetime.datetime
+    tags: List[str]
+
+
+def make_rows(size: int) -> List[Row]:
+    created = datetime.datetime(2024, 1, 1, tzinfo=datetime.timezone.utc)
+    rows: List[Row] = []
+    total = 2
+    while total < size:
+        row = Row(id=uuid.uuid4(), name=f'row {len(rows)}', price=len(rows) * 1.25, created=created, tags=['a', 'bc'])
+        rows.append(row)
+        total += len(row.model_dump_json()) + 1
+    return rows
+
+
+def measure(render: Callable[[], bytes], repeat: int) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        render()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--repeat', type=int, default=5)
+    options = parser.parse_args()
+
+    adapter = TypeAdapter(List[Row])
+    print(f'orjson: {"yes" if FAST_JSON_AVAILABLE else "no (fallback to json)"}')
+    print(f'{"payload":>8} {"JSONResponse":>14} {"Fast+model":>14} {"Fast":>10} {"dump_json":>10}  (ms, best of {options.repeat})')
+    for label, size in SIZES:
+        rows = make_rows(size)
+        results = [
+            measure(lambda: JSONResponse(adapter.dump_python(rows, mode='json')).body, options.repeat),
+            measure(lambda: FastJSONResponse(adapter.dump_python(rows, mode='json')).body, options.repeat),
+            measure(lambda: FastJSONResponse(rows).body, options.repeat),
+            measure(lambda: FastJSONResponse(adapter.dump_json(rows)).body, options.repeat),
+        ]
+        print(f'{label:>8} {results[0]:14.2f} {results[1]:14.2f} {results[2]:10.2f} {results[3]:10.2f}')
+
+
+if __name__ == '__main__':
+    main()
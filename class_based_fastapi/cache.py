@@ -0,0 +1,258 @@
+"""Кэш сериализованных ответов методов API.
+
+    class CatalogueAPI(Routable):
+        @get('items', cache=60)
+        def items(self, category: str) -> List[Item]:
+            ...
+
+        @cached(ttl=300, headers=('accept-language',))
+        @get('items/{key}')
+        async def item(self, key: int) -> Item:
+            ...
+
+В кэше хранится тело ответа в байтах с кодом и заголовками, поэтому повторный запрос не вызывает метод API
+и не сериализует результат. Ключ кэша — класс контроллера, метод HTTP, путь, параметры запроса и значения
+заголовков `headers` (тело запроса в ключ не входит, поэтому кэшируются только GET и HEAD). Cookie (`Set-Cookie`)
+в общий кэш не записываются.
+
+Хранилище задаётся аргументом `backend`, атрибутом контроллера `CACHE_BACKEND` или `set_default_backend`;
+по умолчанию — `MemoryCache` процесса. Для внешнего хранилища (Redis, memcached и т.п.) достаточно реализовать
+четыре асинхронных метода `CacheBackend`.
+"""
+import json
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Optional, Sequence, Tuple, Union
+
+from starlette.requests import Request
+from starlette.responses import Response
+
+from class_based_fastapi.decorators import AnyCallable, set_route_options
+from class_based_fastapi.defaults import CACHE_BACKEND_KEY, REQUEST_PARAMETER, RESPONSE_PARAMETER
+from class_based_fastapi.route_args import RouteArgs
+from class_based_fastapi.serialization import response_renderer
+from class_based_fastapi.wrappers import (
+    call_endpoint,
+    merge_sub_response,
+    request_key,
+    require_safe_methods,
+    special_parameter,
+    wrap_endpoint,
+)
+
+# Время жизни записи кэша по умолчанию (секунд), если задано `cache=True`
+DEFAULT_CACHE_TTL = 60.0
+
+
+class CacheBackend:
+    """Асинхронное хранилище кэша: байты по строковому ключу с временем жизни."""
+
+    async def get(self, key: str) -> Optional[bytes]:
+        """Значение по ключу (None, если его нет или время жизни истекло)."""
+        raise NotImplementedError
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        """Сохранение значения на `ttl` секунд."""
+        raise NotImplementedError
+
+    async def delete(self, key: str) -> None:
+        """Удаление значения."""
+        raise NotImplementedError
+
+    async def clear(self) -> None:
+        """Удаление всех значений."""
+        raise NotImplementedError
+
+
+class MemoryCache(CacheBackend):
+    """Кэш в памяти процесса: LRU с временем жизни записей и ограничением количества и суммарного размера.
+
+    Args:
+        max_entries: Максимальное количество записей
+        max_bytes: Максимальный суммарный размер значений (байт); значения больше него не сохраняются
+    """
+
+    def __init__(self, max_entries: int = 1024, max_bytes: int = 64 * 1024 * 1024) -> None:
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._entries: 'OrderedDict[str, Tuple[float, bytes]]' = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _pop(self, key: str) -> None:
+        _, value = self._entries.pop(key)
+        self.size -= len(value)
+
+    async def get(self, key: str) -> Optional[bytes]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires, value = entry
+        if expires <= time.monotonic():
+            self._pop(key)
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        if key in self._entries:
+            self._pop(key)
+        if len(value) > self.max_bytes:
+            return
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self.size += len(value)
+        # Вытесняются давно не использованные записи
+        while len(self._entries) > self.max_entries or self.size > self.max_bytes:
+            self._pop(next(iter(self._entries)))
+
+    async def delete(self, key: str) -> None:
+        if key in self._entries:
+            self._pop(key)
+
+    async def clear(self) -> None:
+        self._entries.clear()
+        self.size = 0
+
+
+_default_backend: CacheBackend = MemoryCache()
+
+
+def get_default_backend() -> CacheBackend:
+    """Хранилище кэша по умолчанию."""
+    return _default_backend
+
+
+def set_default_backend(backend: CacheBackend) -> None:
+    """Замена хранилища кэша по умолчанию (для контроллеров без `CACHE_BACKEND` и методов без `backend`)."""
+    global _default_backend
+    _default_backend = backend
+
+
+@dataclass(frozen=True)
+class CacheOptions:
+    """Параметры кэширования метода API
+
+    Args:
+        ttl: Время жизни записи (секунд)
+        key: Функция `key(request) -> str`, заменяющая путь и параметры запроса в ключе
+        headers: Заголовки запроса, значения которых входят в ключ
+        backend: Хранилище (по умолчанию — `CACHE_BACKEND` контроллера или `get_default_backend()`)
+    """
+    ttl: float = DEFAULT_CACHE_TTL
+    key: Optional[Callable[[Request], str]] = None
+    headers: Tuple[str, ...] = ()
+    backend: Optional[CacheBackend] = None
+
+    @classmethod
+    def create(cls, value: Union[bool, float, 'CacheOptions', None]) -> Optional['CacheOptions']:
+        """Параметры из значения `cache=` декоратора метода API: True, время жизни или `CacheOptions`."""
+        if value is None or value is False:
+            return None
+        if isinstance(value, CacheOptions):
+            return value
+        if value is True:
+            return cls()
+        return cls(ttl=float(value))
+
+
+def cached(
+    ttl: float = DEFAULT_CACHE_TTL,
+    key: Optional[Callable[[Request], str]] = None,
+    headers: Sequence[str] = (),
+    backend: Optional[CacheBackend] = None,
+) -> Callable[[AnyCallable], AnyCallable]:
+    """Декоратор метода API, включающий кэширование ответа (равносильно `cache=CacheOptions(...)`)
+
+    Args:
+        ttl: Время жизни записи (секунд)
+        key: Функция `key(request) -> str`, заменяющая путь и параметры запроса в ключе
+        headers: Заголовки запроса, значения которых входят в ключ
+        backend: Хранилище
+
+    Returns: Декоратор
+    """
+    options = CacheOptions(ttl=ttl, key=key, headers=tuple(name.lower() for name in headers), backend=backend)
+
+    def marker(method: AnyCallable) -> AnyCallable:
+        return set_route_options(method, cache=options)
+
+    return marker
+
+
+def dump_response(response: Response) -> bytes:
+    """Сериализация ответа (код, заголовки без `Set-Cookie`, тело) для хранилища кэша."""
+    headers = [
+        [name.decode('latin-1'), value.decode('latin-1')]
+        for name, value in response.raw_headers
+        if name.lower() != b'set-cookie'
+    ]
+    head = json.dumps([response.status_code, headers], separators=(',', ':'))
+    return head.encode('latin-1') + b'\n' + response.body
+
+
+def load_response(data: bytes) -> Response:
+    """Ответ из значения хранилища кэша (`dump_response`)."""
+    head, body = data.split(b'\n', 1)
+    status_code, headers = json.loads(head)
+    response = Response(body, status_code=status_code)
+    response.raw_headers = [(name.encode('latin-1'), value.encode('latin-1')) for name, value in headers]
+    return response
+
+
+def cache_key(cls: type, options: CacheOptions, request: Request) -> str:
+    """Ключ кэша ответа на запрос
+
+    Args:
+        cls: Класс контроллера
+        options: Параметры кэширования метода API
+        request: Запрос
+
+    Returns: Ключ
+    """
+    return request_key(cls, request, options.key, options.headers)
+
+
+def cache_endpoint(cls: type, endpoint: Callable[..., Any], args: RouteArgs) -> Callable[..., Any]:
+    """Обёртка метода API, кэширующая сериализованный ответ (если задан `cache=`)
+
+    Кэшируются только ответы на GET и HEAD с кодом 200 и телом, сформированным целиком (не `StreamingResponse`).
+    Заголовки, cookie и код ответа, заданные через параметр `response: Response` метода API, переносятся в ответ.
+
+    Raises:
+        ValueError: Маршрут обрабатывает другие методы HTTP
+
+    Args:
+        cls: Класс контроллера
+        endpoint: Метод API
+        args: Аргументы маршрута метода API
+
+    Returns: Метод API
+    """
+    options = CacheOptions.create(args.cache)
+    if options is None:
+        return endpoint
+    require_safe_methods(cls, endpoint, args, 'cache')
+    render = response_renderer(args)
+    request_parameter, hidden_request = special_parameter(endpoint, Request, REQUEST_PARAMETER)
+    response_parameter, hidden_response = special_parameter(endpoint, Response, RESPONSE_PARAMETER)
+
+    async def cached_endpoint(**kwargs: Any) -> Response:
+        request = kwargs.pop(request_parameter) if hidden_request else kwargs[request_parameter]
+        sub_response = kwargs.pop(response_parameter) if hidden_response else kwargs[response_parameter]
+        store = options.backend or getattr(cls, CACHE_BACKEND_KEY, None) or get_default_backend()
+        key = cache_key(cls, options, request)
+        data = await store.get(key)
+        if data is not None:
+            return load_response(data)
+
+        result = await call_endpoint(endpoint, kwargs)
+        # Готовый ответ (в том числе внутренней обёртки) уже содержит промежуточный ответ
+        response = result if isinstance(result, Response) else merge_sub_response(render(result), sub_response)
+        if response.status_code == 200 and getattr(response, 'body', None) is not None:
+            await store.set(key, dump_response(response), options.ttl)
+        return response
+
+    return wrap_endpoint(endpoint, cached_endpoint, with_request=True, with_response=True)
@@ -0,0 +1,190 @@
+"""Условные запросы GET/HEAD: `ETag`, `Last-Modified` и ответ `304 Not Modified`.
+
+    class CatalogueAPI(Routable):
+        ETAG = True  # ETag по телу ответа для всех GET контроллера
+
+        async def catalogue_version(self, request: Request) -> str:
+            return await self.repository.version()
+
+        @get('items', etag=ETag(version=catalogue_version))
+        async def items(self) -> List[Item]:
+            ...
+
+Без функции версии ответ формируется и сериализуется как обычно, ETag вычисляется по телу ответа; при совпадении
+с `If-None-Match` клиенту отправляется `304` без тела. С функцией версии ETag вычисляется по её результату до
+вызова метода API, поэтому при совпадении метод API не вызывается и ответ не сериализуется. Функции версии и
+времени изменения получают экземпляр контроллера и запрос и могут быть асинхронными.
+"""
+import hashlib
+import inspect
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, Awaitable, Callable, Optional, Union
+
+from starlette.requests import Request
+from starlette.responses import Response
+
+from class_based_fastapi.defaults import ETAG_KEY, REQUEST_PARAMETER, RESPONSE_PARAMETER, SIGNATURE_KEY
+from class_based_fastapi.route_args import RouteArgs
+from class_based_fastapi.serialization import response_renderer
+from class_based_fastapi.wrappers import (
+    call_endpoint, is_streaming_route, merge_sub_response, special_parameter, wrap_endpoint
+)
+
+# Методы HTTP, для которых обрабатываются условные запросы
+CONDITIONAL_METHODS = ('GET', 'HEAD')
+
+Validator = Callable[[Any, Request], Union[Any, Awaitable[Any]]]
+
+
+@dataclass(frozen=True)
+class ETag:
+    """Параметры условных запросов метода API
+
+    Args:
+        version: Функция `version(controller, request)`, значение которой определяет ETag (вместо тела ответа)
+        last_modified: Функция `last_modified(controller, request) -> datetime` для `Last-Modified`
+            и `If-Modified-Since`
+    """
+    version: Optional[Validator] = None
+    last_modified: Optional[Validator] = None
+
+    @classmethod
+    def create(cls, value: Union[bool, 'ETag', None]) -> Optional['ETag']:
+        """Параметры из значения `etag=` декоратора метода API или атрибута контроллера `ETAG`."""
+        if not value:
+            return None
+        if isinstance(value, ETag):
+            return value
+        return cls()
+
+
+def make_etag(data: Union[bytes, str]) -> str:
+    """Строгий ETag (в кавычках) по телу ответа или значению версии."""
+    if isinstance(data, str):
+        data = data.encode()
+    return '"' + hashlib.blake2b(data, digest_size=16).hexdigest() + '"'
+
+
+def etag_matches(etag: str, if_none_match: str) -> bool:
+    """Совпадение ETag с заголовком `If-None-Match` (слабое сравнение, RFC 7232)."""
+    if if_none_match.strip() == '*':
+        return True
+    tag = etag[2:] if etag.startswith('W/') else etag
+    for candidate in if_none_match.split(','):
+        candidate = candidate.strip()
+        if candidate.startswith('W/'):
+            candidate = candidate[2:]
+        if candidate == tag:
+            return True
+    return False
+
+
+def not_modified(request: Request, etag: Optional[str], last_modified: Optional[datetime]) -> bool:
+    """Ресурс не изменился с версии клиента: `If-None-Match`, а при его отсутствии — `If-Modified-Since`."""
+    if_none_match = request.headers.get('if-none-match')
+    if if_none_match is not None:
+        return etag is not None and etag_matches(etag, if_none_match)
+    if_modified_since = request.headers.get('if-modified-since')
+    if if_modified_since is None or last_modified is None:
+        return False
+    try:
+        since = _as_utc(parsedate_to_datetime(if_modified_since))
+    except (TypeError, ValueError):
+        return False
+    # Точность заголовка — секунды
+    return last_modified.replace(microsecond=0) <= since
+
+
+def _validator_headers(etag: Optional[str], last_modified: Optional[datetime]) -> dict:
+    headers = {}
+    if etag is not None:
+        headers['etag'] = etag
+    if last_modified is not None:
+        headers['last-modified'] = format_datetime(last_modified, usegmt=True)
+    return headers
+
+
+def _as_utc(value: Optional[datetime]) -> Optional[datetime]:
+    if value is None:
+        return None
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value.astimezone(timezone.utc)
+
+
+async def _call(validator: Optional[Validator], controller: Any, request: Request) -> Any:
+    if validator is None:
+        return None
+    result = validator(controller, request)
+    if inspect.isawaitable(result):
+        result = await result
+    return result
+
+
+def _skip_streaming(cls: type, endpoint: Callable[..., Any], args: RouteArgs, options: ETag) -> bool:
+    """Потоковый ответ без функции версии: обёртка не нужна (`ETAG` контроллера) или недопустима (`etag=`)."""
+    if options.version is not None or not is_streaming_route(args):
+        return False
+    # Тело потокового ответа заранее неизвестно: ETag возможен только по функции версии
+    if args.etag is None:
+        return True
+    raise ValueError(f'{cls.__name__}.{endpoint.__name__}: a streamed response needs an ETag version function')
+
+
+def _validate_response(
+    request: Request, response: Response, sub_response: Response, etag: Optional[str], last_modified: Optional[datetime]
+) -> Response:
+    """Проверка условий запроса по сформированному ответу: ETag по телу, `Last-Modified` из заголовков ответа."""
+    if response.status_code != 200:
+        return response
+    if etag is None and getattr(response, 'body', None) is not None:
+        etag = make_etag(response.body)
+    if last_modified is None and 'last-modified' in response.headers:
+        last_modified = _as_utc(parsedate_to_datetime(response.headers['last-modified']))
+    if not_modified(request, etag, last_modified):
+        not_modified_response = Response(status_code=304, headers=_validator_headers(etag, last_modified))
+        return merge_sub_response(not_modified_response, sub_response, status=False)
+    for name, value in _validator_headers(etag, last_modified).items():
+        response.headers.setdefault(name, value)
+    return response
+
+
+def conditional_endpoint(cls: type, endpoint: Callable[..., Any], args: RouteArgs) -> Callable[..., Any]:
+    """Обёртка метода API, обрабатывающая условные запросы (если задан `etag=` или `ETAG` контроллера)
+
+    Args:
+        cls: Класс контроллера
+        endpoint: Метод API
+        args: Аргументы маршрута метода API
+
+    Returns: Метод API
+    """
+    options = ETag.create(getattr(cls, ETAG_KEY, False) if args.etag is None else args.etag)
+    if options is None or not set(method.upper() for method in args.methods or ()) & set(CONDITIONAL_METHODS):
+        return endpoint
+    if _skip_streaming(cls, endpoint, args, options):
+        return endpoint
+    render = response_renderer(args)
+    request_parameter, hidden_request = special_parameter(endpoint, Request, REQUEST_PARAMETER)
+    response_parameter, hidden_response = special_parameter(endpoint, Response, RESPONSE_PARAMETER)
+    controller_parameter = next(iter(getattr(endpoint, SIGNATURE_KEY).parameters))
+
+    async def conditional(**kwargs: Any) -> Response:
+        request = kwargs.pop(request_parameter) if hidden_request else kwargs[request_parameter]
+        sub_response = kwargs.pop(response_parameter) if hidden_response else kwargs[response_parameter]
+        if request.method not in CONDITIONAL_METHODS:
+            return await call_endpoint(endpoint, kwargs)
+
+        controller = kwargs[controller_parameter]
+        version = await _call(options.version, controller, request)
+        last_modified = _as_utc(await _call(options.last_modified, controller, request))
+        etag = None if version is None else make_etag(str(version))
+        if (etag is not None or last_modified is not None) and not_modified(request, etag, last_modified):
+            return Response(status_code=304, headers=_validator_headers(etag, last_modified))
+
+        result = await call_endpoint(endpoint, kwargs)
+        # Готовый ответ (в том числе внутренней обёртки) уже содержит промежуточный ответ
+        response = result if isinstance(result, Response) else merge_sub_response(render(result), sub_response)
+        return _validate_response(request, response, sub_response, etag, last_modified)
+
+    return wrap_endpoint(endpoint, conditional, with_request=True, with_response=True)
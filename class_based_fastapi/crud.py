@@ -0,0 +1,213 @@
+"""Обобщённый асинхронный CRUD-контроллер для SQLAlchemy (`sqlalchemy[asyncio]>=2.0`)."""
+from typing import Any, Dict, Generic, Iterable, List, Sequence, Type, TypeVar
+
+from fastapi import Body, Depends, HTTPException, Query
+
+try:
+    import sqlalchemy as sa
+    from sqlalchemy.ext.asyncio import AsyncSession
+except ImportError as error:  # pragma: no cover
+    raise ImportError(
+        'CrudRoutable requires SQLAlchemy 2.0 with asyncio support: pip install "sqlalchemy[asyncio]>=2.0"'
+    ) from error
+
+from class_based_fastapi.decorators import delete, get, patch, post
+from class_based_fastapi.pagination import KeysetPagination, PageParams, Paginated
+from class_based_fastapi.routable import Routable
+from class_based_fastapi.utilities import get_generic_types
+
+TModel = TypeVar('TModel')
+TCreate = TypeVar('TCreate')
+TUpdate = TypeVar('TUpdate')
+# Тип первичного ключа: не параметр класса, выводится из столбца первичного ключа `TModel` (`crud_key_type`)
+TKey = TypeVar('TKey')
+
+
+async def session_not_configured() -> AsyncSession:
+    raise RuntimeError(
+        'CrudRoutable.session is not configured: declare "session: AsyncSession = Depends(get_session)" '
+        'in the controller'
+    )
+
+
+class CrudRoutable(KeysetPagination, Routable, Generic[TModel, TCreate, TUpdate]):
+    """Обобщённый контроллер CRUD для модели SQLAlchemy (или SQLModel с `table=True`).
+
+    * `TModel` — модель таблицы и модель ответа;
+    * `TCreate` — модель тела запроса создания;
+    * `TUpdate` — модель тела запроса изменения (передаются только заданные поля).
+
+    Тип первичного ключа в пути и в списках `ids` (и в схеме OpenAPI) определяется по столбцу первичного ключа.
+
+    Каждая операция выполняется одним SQL-запросом: массовое создание — один `INSERT` (executemany /
+    insertmanyvalues), массовое изменение и удаление — один `UPDATE/DELETE ... WHERE id IN (...)`.
+    Если СУБД поддерживает `RETURNING`, созданные и изменённые строки возвращаются тем же запросом.
+    Список строк возвращается постранично по ключу (`KeysetPagination`, по умолчанию — по первичному ключу):
+    следующая страница запрашивается с `cursor=<next_cursor предыдущей страницы>`.
+
+    Сессия базы данных задаётся в наследнике: `session: AsyncSession = Depends(get_session)`.
+    """
+
+    session: AsyncSession = Depends(session_not_configured)
+
+    # Название атрибута первичного ключа (по умолчанию — первичный ключ таблицы)
+    PRIMARY_KEY = None
+
+    @classmethod
+    def crud_model(cls) -> Type[Any]:
+        """Модель таблицы контроллера (`TModel`)."""
+        model = get_generic_types(cls).get(TModel.__name__)
+        if model is None:
+            raise TypeError(f'{cls.__name__} does not specify the model type: CrudRoutable[TModel, TCreate, TUpdate]')
+        return model
+
+    @classmethod
+    def crud_primary_key(cls) -> Any:
+        """Атрибут первичного ключа модели."""
+        model = cls.crud_model()
+        if cls.PRIMARY_KEY is not None:
+            return getattr(model, cls.PRIMARY_KEY)
+        primary_key = sa.inspect(model).primary_key
+        if len(primary_key) != 1:
+            raise TypeError(f'{model.__name__} has a composite primary key, set {cls.__name__}.PRIMARY_KEY')
+        return getattr(model, sa.inspect(model).get_property_by_column(primary_key[0]).key)
+
+    @classmethod
+    def crud_key_type(cls) -> Type[Any]:
+        """Тип значений первичного ключа (`str`, если тип столбца его не сообщает)."""
+        try:
+            return cls.crud_primary_key().type.python_type
+        except NotImplementedError:
+            return str
+
+    @classmethod
+    def route_generic_types(cls) -> Dict[str, Any]:
+        """Типы для сигнатур методов API: параметры класса и тип первичного ключа (`TKey`)."""
+        if get_generic_types(cls).get(TModel.__name__) is None:
+            return {}
+        return {TKey.__name__: cls.crud_key_type()}
+
+    def _coerce_key(self, value: Any) -> Any:
+        """Приведение значения первичного ключа к типу столбца (для вызовов `crud_*` не из маршрутов)."""
+        python_type = self.crud_key_type()
+        if isinstance(value, python_type):
+            return value
+        try:
+            return python_type(value)
+        except (TypeError, ValueError) as error:
+            raise HTTPException(status_code=422, detail=f'Invalid primary key: {value!r}') from error
+
+    def _dialect(self) -> Any:
+        return self.session.get_bind().dialect
+
+    def _to_row(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Значения столбцов новой строки
+
+        Экземпляр модели создаётся для заполнения значений по умолчанию на стороне Python (например,
+        `default_factory` SQLModel). Пустые значения столбцов, которые заполняет СУБД (автоинкремент, `default`,
+        `server_default`), не передаются.
+        """
+        model = self.crud_model()
+        instance = model(**data)
+        row = {}
+        for attribute in sa.inspect(model).column_attrs:
+            value = getattr(instance, attribute.key, None)
+            column = attribute.columns[0]
+            if value is None and (column.primary_key or column.default is not None or column.server_default is not None):
+                continue
+            row[attribute.key] = value
+        return row
+
+    async def _commit(self, instances: Iterable[Any] = ()) -> None:
+        """Фиксация транзакции; возвращаемые объекты отсоединяются от сессии, чтобы фиксация не сбросила
+        их загруженные атрибуты."""
+        for instance in instances:
+            if instance in self.session:
+                self.session.expunge(instance)
+        await self.session.commit()
+
+    async def crud_list(self, page: PageParams) -> Paginated:
+        """Страница строк в порядке ключа `ORDER_BY`."""
+        return await self.paginate(self.session, sa.select(self.crud_model()), page)
+
+    async def crud_create(self, items: Sequence[Any]) -> List[Any]:
+        """Создание строк одним запросом `INSERT`."""
+        model = self.crud_model()
+        rows = [self._to_row(item.model_dump(exclude_unset=True)) for item in items]
+        if not rows:
+            return []
+        if self._dialect().insert_executemany_returning:
+            instances = list((await self.session.scalars(sa.insert(model).returning(model), rows)).all())
+        else:
+            instances = [model(**row) for row in rows]
+            self.session.add_all(instances)
+            await self.session.flush()
+        await self._commit(instances)
+        return instances
+
+    async def crud_update(self, keys: Sequence[Any], values: Any) -> List[Any]:
+        """Изменение строк одним запросом `UPDATE ... WHERE <первичный ключ> IN (...)`."""
+        model = self.crud_model()
+        primary_key = self.crud_primary_key()
+        keys = [self._coerce_key(key) for key in keys]
+        data = values.model_dump(exclude_unset=True)
+        condition = primary_key.in_(keys)
+        if not data:
+            instances = list((await self.session.scalars(sa.select(model).where(condition))).all())
+        elif self._dialect().update_returning:
+            statement = sa.update(model).where(condition).values(**data).returning(model)
+            instances = list((await self.session.scalars(statement)).all())
+        else:
+            await self.session.execute(sa.update(model).where(condition).values(**data))
+            statement = sa.select(model).where(condition).execution_options(populate_existing=True)
+            instances = list((await self.session.scalars(statement)).all())
+        await self._commit(instances)
+        return instances
+
+    async def crud_delete(self, keys: Sequence[Any]) -> int:
+        """Удаление строк одним запросом `DELETE ... WHERE <первичный ключ> IN (...)`."""
+        keys = [self._coerce_key(key) for key in keys]
+        statement = sa.delete(self.crud_model()).where(self.crud_primary_key().in_(keys))
+        result = await self.session.execute(statement, execution_options={'synchronize_session': False})
+        await self._commit()
+        return result.rowcount
+
+    @get('')
+    async def list_items(self, page: PageParams = Depends()) -> Paginated[TModel]:
+        return await self.crud_list(page)
+
+    @get('{key}')
+    async def get_item(self, key: TKey) -> TModel:
+        instance = await self.session.get(self.crud_model(), key)
+        if instance is None:
+            raise HTTPException(status_code=404, detail='Not found')
+        return instance
+
+    @post('')
+    async def create_item(self, model: TCreate) -> TModel:
+        return (await self.crud_create([model]))[0]
+
+    @post('bulk')
+    async def create_items(self, models: List[TCreate]) -> List[TModel]:
+        return await self.crud_create(models)
+
+    @patch('{key}')
+    async def update_item(self, key: TKey, model: TUpdate) -> TModel:
+        instances = await self.crud_update([key], model)
+        if not instances:
+            raise HTTPException(status_code=404, detail='Not found')
+        return instances[0]
+
+    @patch('')
+    async def update_items(self, ids: List[TKey] = Body(...), values: TUpdate = Body(...)) -> List[TModel]:
+        return await self.crud_update(ids, values)
+
+    @delete('{key}')
+    async def delete_item(self, key: TKey) -> bool:
+        if not await self.crud_delete([key]):
+            raise HTTPException(status_code=404, detail='Not found')
+        return True
+
+    @delete('')
+    async def delete_items(self, ids: List[TKey] = Query(...)) -> int:
+        return await self.crud_delete(ids)
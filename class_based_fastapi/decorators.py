@@ -1,4 +1,5 @@
 from enum import Enum
+from dataclasses import replace
 from typing import (Any, Callable, Dict, List, Optional, Sequence, Type,
                     Union, TypeVar, Set)
 
@@ -12,6 +13,8 @@ from .route_args import EndpointDefinition, RouteArgs
 AnyCallable = TypeVar('AnyCallable', bound=Callable[..., Any])
 
 CONTROLLER_METHOD_KEY = '__controller_method__'
+# Route options set by decorators applied before the route decorator (see `set_route_options`)
+ROUTE_OPTIONS_KEY = '__route_options__'
 
 SetIntStr = Set[Union[int, str]]
 DictIntStrAny = Dict[Union[int, str], Any]
@@ -26,9 +29,10 @@ def route(path: str, methods: List[str], **kwargs: Any) -> Callable[[AnyCallable
     """
 
     def marker(method: AnyCallable, type_=None) -> AnyCallable:
+        options = getattr(method, ROUTE_OPTIONS_KEY, {})
         setattr(
             method, '_endpoint',
-            EndpointDefinition(endpoint=method, args=RouteArgs(path=path, methods=methods, **kwargs))
+            EndpointDefinition(endpoint=method, args=RouteArgs(path=path, methods=methods, **{**options, **kwargs}))
         )
         setattr(
             method, CONTROLLER_METHOD_KEY, True
@@ -38,6 +42,20 @@ def route(path: str, methods: List[str], **kwargs: Any) -> Callable[[AnyCallable
     return marker
 
 
+def set_route_options(method: AnyCallable, **options: Any) -> AnyCallable:
+    """Set RouteArgs fields of an endpoint from a companion decorator such as `@cached`.
+
+    Works on either side of the route decorator: above it the RouteArgs are replaced, below it the options are
+    stored on the function and picked up by `route`.
+    """
+    endpoint = getattr(method, '_endpoint', None)
+    if endpoint is not None:
+        endpoint.args = replace(endpoint.args, **options)
+    else:
+        setattr(method, ROUTE_OPTIONS_KEY, {**getattr(method, ROUTE_OPTIONS_KEY, {}), **options})
+    return method
+
+
 def get(
         path: str,
         *,
@@ -63,7 +81,6 @@ def get(
         callbacks: Optional[List[BaseRoute]] = None,
         openapi_extra: Optional[Dict[str, Any]] = None,
         **kwargs: Any) -> Callable[[AnyCallable], AnyCallable]:
-    print(path)
     return route(
         path,
         methods=['GET'],
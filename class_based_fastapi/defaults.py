@@ -3,7 +3,59 @@ CBV_CLASS_KEY = "__cbv_class__"
 CLASS_TYPE = "__cbv_class__"
 
 SIGNATURE_KEY = "__signature__"
+# Скрытый параметр метода API, в который FastAPI передаёт запрос обёрткам (кэш, условные запросы и т.п.)
+REQUEST_PARAMETER = "_cbv_request"
+# Скрытый параметр метода API с промежуточным ответом FastAPI (`response: Response`)
+RESPONSE_PARAMETER = "_cbv_response"
 API_METHODS = "__api_methods__"
 INIT_MODIFIED = "__init_modified__"
+INIT_ORIGINAL = "__init_original__"
 GENERIC_ATTRIBUTES = "__generic_attribute__"
-TAGGING_KEY = "TAGGING"
\ No newline at end of file
+GENERIC_TYPES = "__generic_types__"
+TAGGING_KEY = "TAGGING"
+SLOTS_KEY = "SLOTS"
+SLOTS_DEFAULTS = "__slots_defaults__"
+
+# Время жизни экземпляра контроллера
+LIFETIME_KEY = "LIFETIME"
+LIFETIME_REQUEST = "request"
+LIFETIME_APP = "app"
+LIFETIME_SCOPED = "scoped"
+LIFETIMES = (LIFETIME_REQUEST, LIFETIME_APP, LIFETIME_SCOPED)
+CONTROLLER_PROVIDER = "__controller_provider__"
+# Создание экземпляра контроллера в пуле потоков: True, False или None (только при собственном `__init__`)
+INIT_IN_THREADPOOL_KEY = "INIT_IN_THREADPOOL"
+# Асинхронные фабрики экземпляров контроллера (по признаку создания в пуле потоков)
+CONTROLLER_FACTORY = "__controller_factory__"
+
+LAZY_ROUTES_KEY = "LAZY_ROUTES"
+
+# Хранилище кэша ответов контроллера (см. `cache.CacheBackend`)
+CACHE_BACKEND_KEY = "CACHE_BACKEND"
+# Условные запросы (ETag) для всех GET контроллера
+ETAG_KEY = "ETAG"
+
+# Сериализация ответов заранее подготовленным TypeAdapter и проверка ответов моделью ответа
+PRECOMPILE_SERIALIZERS_KEY = "PRECOMPILE_SERIALIZERS"
+VALIDATE_RESPONSES_KEY = "VALIDATE_RESPONSES"
+# Класс ответа по умолчанию
+RESPONSE_CLASS_KEY = "RESPONSE_CLASS"
+# Пул потоков синхронных методов API контроллера (см. `executors.ThreadPool`)
+EXECUTOR_KEY = "EXECUTOR"
+
+# Ограничение одновременных запросов к контроллеру (см. `limits.ConcurrencyLimiter`)
+MAX_CONCURRENCY_KEY = "MAX_CONCURRENCY"
+MAX_QUEUE_KEY = "MAX_QUEUE"
+QUEUE_TIMEOUT_KEY = "QUEUE_TIMEOUT"
+SHED_STATUS_CODE_KEY = "SHED_STATUS_CODE"
+RETRY_AFTER_KEY = "RETRY_AFTER"
+CONCURRENCY_LIMITER = "__concurrency_limiter__"
+
+ROUTER_CACHE = "__router_cache__"
+# Кэшированные фрагменты схемы OpenAPI контроллера
+OPENAPI_CACHE = "__openapi_cache__"
+# Атрибуты класса, от которых зависят маршруты
+ROUTER_CACHE_ATTRIBUTES = ("NAME_MODULE", "VERSION_API", "BASE_TEMPLATE_PATH", "TAGS", "TAGGING", "LIFETIME", "LAZY_ROUTES",
+                           "ETAG", "PRECOMPILE_SERIALIZERS", "VALIDATE_RESPONSES", "RESPONSE_CLASS",
+                           "INIT_IN_THREADPOOL", "EXECUTOR",
+                           "MAX_CONCURRENCY", "MAX_QUEUE", "QUEUE_TIMEOUT", "SHED_STATUS_CODE", "RETRY_AFTER")
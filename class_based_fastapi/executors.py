@@ -0,0 +1,346 @@
+"""Отдельные пулы потоков для синхронных методов API контроллеров (bulkheads).
+
+    books_pool = ThreadPool(max_workers=16, name='books', max_queue=64)
+
+    class BooksAPI(Routable):
+        EXECUTOR = books_pool
+
+        @get('')
+        def books(self) -> List[Book]:  # выполняется в books_pool, а не в общем пуле потоков AnyIO
+            ...
+
+Медленный контроллер занимает только свой пул и не блокирует синхронные методы API других контроллеров.
+Когда все потоки заняты и в очереди пула `max_queue` задач, новые запросы сразу получают `503 Service Unavailable`
+с `Retry-After`.
+Состояние пулов (`ThreadPool.metrics()`, `executor_metrics()`) можно отдавать системе мониторинга.
+
+Методы с вычислениями на CPU (`@post('report', executor='process')`) выполняются в пуле процессов (`ProcessPool`):
+в другом процессе вызывается функция модуля `call_method`, которая получает класс контроллера и имя метода и вызывает
+метод у экземпляра без зависимостей (они относятся к запросу и не передаются между процессами). Аргументы и результат
+метода должны сериализоваться `pickle`. Пул запускается при старте приложения (lifespan маршрутизатора)
+и останавливается вместе с ним.
+"""
+import asyncio
+import contextvars
+import functools
+import inspect
+import os
+import pickle
+import sys
+import threading
+import weakref
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Union
+
+from fastapi import BackgroundTasks, Depends, HTTPException
+from starlette.concurrency import run_in_threadpool
+from starlette.requests import HTTPConnection
+from starlette.responses import Response
+
+from class_based_fastapi.defaults import EXECUTOR_KEY, SIGNATURE_KEY
+from class_based_fastapi.route_args import RouteArgs
+from class_based_fastapi.wrappers import is_async_endpoint, wrap_endpoint
+
+EXECUTOR_PROCESS = 'process'
+
+_pools: 'weakref.WeakSet[Union[ThreadPool, ProcessPool]]' = weakref.WeakSet()
+
+
+class ThreadPool:
+    """Пул потоков контроллера
+
+    Потоки создаются при первой задаче.
+
+    Args:
+        max_workers: Количество потоков
+        name: Название пула (префикс названий потоков и метка в метриках)
+        max_queue: Максимальное количество задач, ожидающих свободного потока, когда все потоки заняты
+            (None — без ограничения, 0 — без ожидания)
+        retry_after: Значение заголовка `Retry-After` (секунд) ответа при переполненной очереди
+    """
+
+    def __init__(
+        self, max_workers: int = 8, name: Optional[str] = None, max_queue: Optional[int] = None, retry_after: int = 1
+    ) -> None:
+        self.max_workers = max_workers
+        self.name = name or f'pool-{id(self):x}'
+        self.max_queue = max_queue
+        self.retry_after = retry_after
+        self.active = 0
+        self.queued = 0
+        self.completed = 0
+        self.rejected = 0
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        _pools.add(self)
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}(max_workers={self.max_workers}, name={self.name!r})'
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        """`ThreadPoolExecutor` пула (создаётся при первом обращении)."""
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(self.max_workers, thread_name_prefix=self.name)
+        return self._executor
+
+    def _call(self, func: Callable[..., Any]) -> Any:
+        with self._lock:
+            self.queued -= 1
+            self.active += 1
+        try:
+            return func()
+        finally:
+            with self._lock:
+                self.active -= 1
+                self.completed += 1
+
+    async def run(self, func: Callable[..., Any], /, *args: Any, **kwargs: Any) -> Any:
+        """Выполнение функции в пуле (с контекстными переменными вызывающей задачи)
+
+        Raises:
+            HTTPException: 503, если очередь пула заполнена
+        """
+        with self._lock:
+            if self.max_queue is not None and self.active + self.queued >= self.max_workers + self.max_queue:
+                self.rejected += 1
+                raise HTTPException(
+                    status_code=503,
+                    detail=f'Executor "{self.name}" is overloaded',
+                    headers={'Retry-After': str(self.retry_after)},
+                )
+            self.queued += 1
+        call = functools.partial(contextvars.copy_context().run, functools.partial(func, *args, **kwargs))
+        try:
+            future = self.executor.submit(self._call, call)
+        except BaseException:
+            with self._lock:
+                self.queued -= 1
+            raise
+        future.add_done_callback(self._forget_cancelled)
+        return await asyncio.wrap_future(future)
+
+    def _forget_cancelled(self, future: 'Future[Any]') -> None:
+        # Задача отменена до запуска (запрос отменён в очереди): `_call` не вызывается
+        if future.cancelled():
+            with self._lock:
+                self.queued -= 1
+
+    def metrics(self) -> Dict[str, Any]:
+        """Состояние пула: потоки, выполняемые и ожидающие задачи, завершённые и отклонённые задачи."""
+        with self._lock:
+            return {
+                'name': self.name,
+                'max_workers': self.max_workers,
+                'active': self.active,
+                'queued': self.queued,
+                'completed': self.completed,
+                'rejected': self.rejected,
+            }
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Остановка потоков пула (при следующей задаче пул создаётся заново)."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait)
+
+
+class ProcessPool:
+    """Пул процессов для методов API с вычислениями на CPU
+
+    Процессы запускаются при старте приложения (`lifespan`) или при первой задаче и останавливаются после остановки
+    последнего приложения, использующего пул.
+
+    Args:
+        max_workers: Количество процессов (None — по количеству CPU)
+        name: Название пула (метка в метриках)
+        mp_context: Контекст `multiprocessing` (например, `multiprocessing.get_context('spawn')`)
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, name: Optional[str] = None, mp_context: Any = None) -> None:
+        self.max_workers = max_workers
+        self.name = name or f'processes-{id(self):x}'
+        self.mp_context = mp_context
+        self.in_flight = 0
+        self.completed = 0
+        self._users = 0
+        self._lock = threading.Lock()
+        self._executor: Optional[ProcessPoolExecutor] = None
+        _pools.add(self)
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}(max_workers={self.max_workers}, name={self.name!r})'
+
+    @property
+    def executor(self) -> ProcessPoolExecutor:
+        """`ProcessPoolExecutor` пула (создаётся при первом обращении)."""
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ProcessPoolExecutor(self.max_workers, mp_context=self.mp_context)
+        return self._executor
+
+    async def run(self, func: Callable[..., Any], /, *args: Any, **kwargs: Any) -> Any:
+        """Выполнение функции модуля в процессе пула (функция, аргументы и результат сериализуются `pickle`)."""
+        executor = self.executor
+        future = asyncio.get_running_loop().run_in_executor(executor, functools.partial(func, *args, **kwargs))
+        self.in_flight += 1
+        try:
+            return await future
+        except BrokenProcessPool:
+            # Процесс завершился аварийно: следующая задача запускает новый пул
+            with self._lock:
+                if self._executor is executor:
+                    self._executor = None
+            executor.shutdown(wait=False)
+            raise
+        finally:
+            self.in_flight -= 1
+            self.completed += 1
+
+    def metrics(self) -> Dict[str, Any]:
+        """Состояние пула: выполняемые (и ожидающие процесса) и завершённые задачи."""
+        return {
+            'name': self.name,
+            'max_workers': self.max_workers or os.cpu_count(),
+            'in_flight': self.in_flight,
+            'completed': self.completed,
+        }
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Остановка процессов пула: ожидающие задачи отменяются, выполняемые — завершаются."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is None:
+            return
+        if sys.version_info >= (3, 9):
+            executor.shutdown(wait=wait, cancel_futures=True)
+        else:
+            executor.shutdown(wait=wait)
+
+    @asynccontextmanager
+    async def lifespan(self, app: Any) -> AsyncIterator[None]:
+        """Lifespan маршрутизатора: запуск пула при старте приложения и остановка после последнего приложения."""
+        self._users += 1
+        try:
+            self.executor
+            yield
+        finally:
+            self._users -= 1
+            if self._users == 0:
+                await run_in_threadpool(self.shutdown)
+
+
+_default_process_pool: Optional[ProcessPool] = None
+
+
+def get_default_process_pool() -> ProcessPool:
+    """Пул процессов методов API с `executor='process'` (создаётся при первом обращении)."""
+    global _default_process_pool
+    if _default_process_pool is None:
+        _default_process_pool = ProcessPool(name='process')
+    return _default_process_pool
+
+
+def set_default_process_pool(pool: ProcessPool) -> None:
+    """Замена пула процессов `executor='process'` (до сборки маршрутов контроллеров)."""
+    global _default_process_pool
+    _default_process_pool = pool
+
+
+def executor_metrics() -> List[Dict[str, Any]]:
+    """Состояние всех пулов потоков и процессов контроллеров."""
+    return [pool.metrics() for pool in sorted(_pools, key=lambda pool: pool.name)]
+
+
+def call_method(cls: type, name: str, kwargs: Dict[str, Any]) -> Any:
+    """Вызов метода API в процессе пула у экземпляра контроллера без зависимостей (`__init__` не вызывается)."""
+    try:
+        return getattr(cls, name)(cls.__new__(cls), **kwargs)
+    except HTTPException as error:
+        # `HTTPException(status_code=...)` не восстанавливается pickle: аргументы исключения передаются позиционно
+        raise HTTPException(error.status_code, error.detail, error.headers) from None
+
+
+def get_executor(cls: type, args: RouteArgs) -> Union[ThreadPool, ProcessPool, None]:
+    """Пул метода API: `executor=` маршрута или `EXECUTOR` контроллера
+
+    Args:
+        cls: Класс контроллера
+        args: Аргументы маршрута метода API
+
+    Returns: Пул потоков или процессов (None — вызов как в FastAPI)
+    """
+    executor = args.executor if args.executor is not None else getattr(cls, EXECUTOR_KEY, None)
+    if executor == EXECUTOR_PROCESS:
+        return get_default_process_pool()
+    if executor is not None and not isinstance(executor, (ThreadPool, ProcessPool)):
+        raise TypeError(f'{cls.__name__}: executor must be "process", a ThreadPool or a ProcessPool, got {executor!r}')
+    return executor
+
+
+def _no_controller() -> None:
+    return None
+
+
+def _process_endpoint(cls: type, endpoint: Callable[..., Any], pool: ProcessPool) -> Callable[..., Any]:
+    """Обёртка метода API, выполняющая его в пуле процессов через `call_method`."""
+    if not inspect.isfunction(endpoint) or is_async_endpoint(endpoint) or inspect.isgeneratorfunction(endpoint):
+        raise ValueError(f'{cls.__name__}.{endpoint.__name__}: a process executor requires a plain synchronous method')
+    try:
+        pickle.dumps(cls)
+    except (pickle.PicklingError, AttributeError, TypeError) as error:
+        raise ValueError(f'{cls.__qualname__} must be importable at module level to run in a process pool') from error
+
+    signature = getattr(endpoint, SIGNATURE_KEY)
+    controller, *parameters = signature.parameters.values()
+    for parameter in parameters:
+        annotation = parameter.annotation
+        if inspect.isclass(annotation) and issubclass(annotation, (HTTPConnection, Response, BackgroundTasks)):
+            raise ValueError(f'{cls.__name__}.{endpoint.__name__}: parameter "{parameter.name}" can not be sent to a process')
+
+    name = endpoint.__name__
+
+    async def in_process(**kwargs: Any) -> Any:
+        kwargs.pop(controller.name, None)
+        return await pool.run(call_method, cls, name, kwargs)
+
+    wrapper = wrap_endpoint(endpoint, in_process)
+    # Экземпляр контроллера с зависимостями запроса не создаётся: он не передаётся в процесс
+    wrapper.__signature__ = signature.replace(
+        parameters=[controller.replace(default=Depends(_no_controller)), *parameters]
+    )
+    return wrapper
+
+
+def executor_endpoint(cls: type, endpoint: Callable[..., Any], args: RouteArgs) -> Callable[..., Any]:
+    """Обёртка синхронного метода API, выполняющая его в пуле потоков или процессов (`executor=`, `EXECUTOR`)
+
+    Асинхронные методы API и генераторы не оборачиваются; `executor=` маршрута для них в пуле процессов — ошибка.
+
+    Args:
+        cls: Класс контроллера
+        endpoint: Метод API
+        args: Аргументы маршрута метода API
+
+    Returns: Метод API
+    """
+    pool = get_executor(cls, args)
+    if pool is None:
+        return endpoint
+    if is_async_endpoint(endpoint) or inspect.isgeneratorfunction(endpoint) or inspect.isasyncgenfunction(endpoint):
+        # Пул контроллера относится только к синхронным методам, пул маршрута — к самому методу
+        if args.executor is None or isinstance(pool, ThreadPool):
+            return endpoint
+    if isinstance(pool, ProcessPool):
+        return _process_endpoint(cls, endpoint, pool)
+
+    async def in_executor(**kwargs: Any) -> Any:
+        return await pool.run(endpoint, **kwargs)
+
+    return wrap_endpoint(endpoint, in_executor)
@@ -0,0 +1,116 @@
+import operator
+import types
+import typing
+from functools import lru_cache, reduce
+from typing import Any, Dict, Tuple, TypeVar, Union
+
+from typing_extensions import Annotated, Literal, get_origin
+
+# Максимальный размер кэша подстановок типов
+SUBSTITUTION_CACHE_SIZE = 4096
+
+_UNION_TYPE = getattr(types, 'UnionType', None)
+_GENERIC_ALIAS = getattr(types, 'GenericAlias', None)
+
+
+def _substitute_args(args: Tuple[Any, ...], generic_types: Dict[str, Any]) -> Tuple[Any, ...]:
+    return tuple(_substitute(arg, generic_types) for arg in args)
+
+
+def _pydantic_parameters(annotation: Any) -> Tuple[Any, ...]:
+    """Параметры обобщённой модели pydantic, ещё не заменённые конкретными типами."""
+    metadata = getattr(annotation, '__pydantic_generic_metadata__', None)
+    if metadata is not None:  # pydantic 2
+        return tuple(metadata['parameters'])
+    if getattr(annotation, '__concrete__', True) is False:  # pydantic 1, GenericModel
+        return tuple(getattr(annotation, '__parameters__', ()))
+    return ()
+
+
+def _substitute_annotated(annotation: Any, generic_types: Dict[str, Any]) -> Any:
+    """`Annotated[T, ...]`: подстановка в тип, метаданные сохраняются."""
+    inner = _substitute(annotation.__origin__, generic_types)
+    if inner is annotation.__origin__:
+        return annotation
+    return Annotated[(inner,) + tuple(annotation.__metadata__)]
+
+
+def _rebuild_generic(annotation: Any, origin: Any, args: Tuple[Any, ...]) -> Any:
+    """Аннотация того же вида, что `annotation` (`Union`, `X | Y`, `list[T]`, `List[T]`), с аргументами `args`."""
+    if origin is Union:
+        return Union[args]
+    if _UNION_TYPE is not None and isinstance(annotation, _UNION_TYPE):
+        try:
+            return reduce(operator.or_, args)
+        except TypeError:
+            return Union[args]
+    if _GENERIC_ALIAS is not None and isinstance(annotation, _GENERIC_ALIAS):
+        return _GENERIC_ALIAS(origin, args)
+    if isinstance(annotation, typing._GenericAlias):  # type: ignore[attr-defined]
+        return annotation.copy_with(args)
+    return origin[args]
+
+
+def _substitute_generic(annotation: Any, origin: Any, args: Tuple[Any, ...], generic_types: Dict[str, Any]) -> Any:
+    """Обобщённый тип с аргументами (`List[T]`, `Optional[T]`, `T | None`): подстановка в аргументы."""
+    new_args = _substitute_args(args, generic_types)
+    if all(new is old for new, old in zip(new_args, args)):
+        return annotation
+    return _rebuild_generic(annotation, origin, new_args)
+
+
+def _substitute_pydantic(annotation: type, generic_types: Dict[str, Any]) -> Any:
+    """Обобщённая модель pydantic (`Page[T]`): подстановка в ещё не заменённые параметры."""
+    parameters = _pydantic_parameters(annotation)
+    if not parameters:
+        return annotation
+    new_parameters = _substitute_args(parameters, generic_types)
+    if all(new is old for new, old in zip(new_parameters, parameters)):
+        return annotation
+    return annotation[new_parameters if len(new_parameters) > 1 else new_parameters[0]]
+
+
+def _substitute(annotation: Any, generic_types: Dict[str, Any]) -> Any:
+    if isinstance(annotation, TypeVar):
+        generic_type = generic_types.get(annotation.__name__)
+        return annotation if generic_type is None else generic_type
+
+    origin = get_origin(annotation)
+    if origin is Annotated:
+        return _substitute_annotated(annotation, generic_types)
+    if origin is Literal:
+        return annotation
+
+    args = getattr(annotation, '__args__', None)
+    if origin is not None and args:
+        return _substitute_generic(annotation, origin, args, generic_types)
+    if isinstance(annotation, type):
+        return _substitute_pydantic(annotation, generic_types)
+    return annotation
+
+
+@lru_cache(maxsize=SUBSTITUTION_CACHE_SIZE)
+def _substitute_cached(annotation: Any, generic_types: Tuple[Tuple[str, Any], ...]) -> Any:
+    return _substitute(annotation, dict(generic_types))
+
+
+def substitute_type(annotation: Any, generic_types: Dict[str, Any]) -> Any:
+    """Рекурсивная подстановка типов параметров обобщённого класса в аннотацию
+
+    Поддерживаются вложенные обобщённые типы (`Dict[str, List[T]]`, `list[T]`), `Optional` и `Union`,
+    объединения PEP 604 (`T | None`), `Annotated` (метаданные сохраняются) и обобщённые модели pydantic
+    (`Page[T]`). Параметры, для которых тип не задан, остаются без изменений.
+    Результат кэшируется по паре (аннотация, типы параметров).
+
+    Args:
+        annotation: Аннотация
+        generic_types: Типы параметров: название параметра -> тип (None, если тип не задан)
+
+    Returns: Аннотация с подставленными типами
+    """
+    key = tuple(generic_types.items())
+    try:
+        hash((annotation, key))
+    except TypeError:  # нехэшируемые метаданные, например `Annotated[T, {...}]`
+        return _substitute(annotation, generic_types)
+    return _substitute_cached(annotation, key)
@@ -0,0 +1,104 @@
+from typing import Any, Callable, Optional, Tuple
+
+from fastapi.datastructures import DefaultPlaceholder
+from starlette.routing import Match, compile_path, get_name
+from starlette.types import Scope
+
+from class_based_fastapi.route_args import RouteArgs
+from class_based_fastapi.streaming import StreamingAPIRoute
+
+
+class DeferredEndpoint:
+    """Метод API, сборка которого (копирование функции, подстановка обобщённых типов, подпись для FastAPI)
+    откладывается до первого обращения.
+
+    Объект переходит из маршрутизатора контроллера в приложение через `include_router`, поэтому метод собирается
+    один раз для всех приложений.
+    """
+
+    def __init__(self, func: Callable[..., Any], build: Callable[[], Tuple[Callable[..., Any], RouteArgs]]) -> None:
+        self.__name__ = func.__name__
+        self.__qualname__ = func.__qualname__
+        self.__module__ = func.__module__
+        self.__doc__ = func.__doc__
+        self._build = build
+        self._result: Optional[Tuple[Callable[..., Any], RouteArgs]] = None
+
+    def materialize(self) -> Tuple[Callable[..., Any], RouteArgs]:
+        """Сборка метода API
+
+        Returns: Метод API и аргументы его маршрута
+        """
+        if self._result is None:
+            self._result = self._build()
+        return self._result
+
+    def __call__(self, *args: Any, **kwargs: Any) -> Any:
+        return self.materialize()[0](*args, **kwargs)
+
+
+class LazyAPIRoute(StreamingAPIRoute):
+    """APIRoute, который при создании регистрирует только путь и методы HTTP.
+
+    Сборка метода API (`DeferredEndpoint`), анализ зависимостей FastAPI и создание моделей ответа выполняются
+    при первом подходящем запросе или при первом обращении к атрибутам, которые ещё не вычислены
+    (например, при построении схемы OpenAPI). Потоковые методы API обрабатываются как в `StreamingAPIRoute`.
+    """
+
+    def __init__(self, path: str, endpoint: Callable[..., Any], **kwargs: Any) -> None:
+        self._lazy_kwargs = kwargs
+        self._lazy_compiling = False
+        self.path = path
+        self.endpoint = endpoint
+        # Атрибуты, которые читают Starlette при сопоставлении и FastAPI в `include_router`
+        for name, value in kwargs.items():
+            setattr(self, name, value)
+        self.tags = kwargs.get("tags") or []
+        self.responses = kwargs.get("responses") or {}
+        self.dependencies = list(kwargs.get("dependencies") or [])
+        self.name = get_name(endpoint) if kwargs.get("name") is None else kwargs["name"]
+        self.methods = {method.upper() for method in kwargs.get("methods") or ["GET"]}
+        self.path_regex, self.path_format, self.param_convertors = compile_path(path)
+        response_model = kwargs.get("response_model")
+        if isinstance(response_model, DefaultPlaceholder):
+            response_model = response_model.value
+        self.response_model = response_model
+
+    @property
+    def is_compiled(self) -> bool:
+        """Собран ли маршрут."""
+        return "_lazy_kwargs" not in self.__dict__
+
+    def compile(self) -> None:
+        """Сборка маршрута: метод API, зависимости и модели ответа."""
+        if self.is_compiled or self._lazy_compiling:
+            return
+        self._lazy_compiling = True
+        try:
+            kwargs = dict(self._lazy_kwargs)
+            endpoint = self.endpoint
+            if isinstance(endpoint, DeferredEndpoint):
+                endpoint, args = endpoint.materialize()
+                if self.response_model is None:
+                    kwargs["response_model"] = args.response_model
+                # Класс ответа может определяться при сборке метода (например, потоковый ответ `Stream[T]`)
+                if not isinstance(args.response_class, DefaultPlaceholder):
+                    kwargs["response_class"] = args.response_class
+            super().__init__(self.path, endpoint, **kwargs)
+            del self._lazy_kwargs
+        finally:
+            self._lazy_compiling = False
+
+    def matches(self, scope: Scope) -> Tuple[Match, Scope]:
+        match, child_scope = super().matches(scope)
+        if match != Match.NONE and not self.is_compiled:
+            self.compile()
+            match, child_scope = super().matches(scope)
+        return match, child_scope
+
+    def __getattr__(self, name: str) -> Any:
+        # Вызывается только для ещё не вычисленных атрибутов (dependant, body_field, response_field, app, ...)
+        if name.startswith("__") or name.startswith("_lazy") or self.__dict__.get("_lazy_compiling", True):
+            raise AttributeError(name)
+        self.compile()
+        return object.__getattribute__(self, name)
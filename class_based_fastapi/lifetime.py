@@ -0,0 +1,263 @@
+import asyncio
+import inspect
+import weakref
+from contextlib import AsyncExitStack, asynccontextmanager, contextmanager
+from typing import Any, AsyncContextManager, AsyncIterator, Callable, Dict, Optional, Sequence, Tuple, Type
+
+from fastapi import params
+from fastapi.dependencies.utils import is_async_gen_callable, is_coroutine_callable, is_gen_callable
+from starlette.requests import Request
+from starlette.concurrency import run_in_threadpool
+from typing_extensions import Annotated, get_args, get_origin
+
+from class_based_fastapi.defaults import INIT_ORIGINAL, LIFETIME_APP, LIFETIME_SCOPED
+
+
+def _get_depends(parameter: inspect.Parameter) -> Optional[params.Depends]:
+    """Получение `Depends` параметра: из значения по умолчанию или из `Annotated[..., Depends(...)]`."""
+    if isinstance(parameter.default, params.Depends):
+        return parameter.default
+    if get_origin(parameter.annotation) is Annotated:
+        for meta in get_args(parameter.annotation)[1:]:
+            if isinstance(meta, params.Depends):
+                return meta
+    return None
+
+
+async def _solve_parameter(
+    call: Callable[..., Any], name: str, parameter: inspect.Parameter, stack: AsyncExitStack, cache: Dict[Any, Any]
+) -> Any:
+    """Значение параметра `call` вне запроса: результат зависимости `Depends` или значение по умолчанию."""
+    depends = _get_depends(parameter)
+    if depends is not None:
+        dependency = depends.dependency or parameter.annotation
+        if depends.use_cache and dependency in cache:
+            return cache[dependency]
+        value = await solve_dependencies(dependency, stack, cache)
+        if depends.use_cache:
+            cache[dependency] = value
+        return value
+    if parameter.default is not inspect.Parameter.empty and not isinstance(parameter.default, params.Param):
+        return parameter.default
+    raise RuntimeError(
+        f'Parameter "{name}" of {call!r} cannot be resolved outside of a request, '
+        f'use LIFETIME = "request" for this controller'
+    )
+
+
+async def _call_dependency(call: Callable[..., Any], kwargs: Dict[str, Any], stack: AsyncExitStack) -> Any:
+    """Вызов `call`; зависимости с `yield` входят в `stack`."""
+    if is_gen_callable(call):
+        return stack.enter_context(contextmanager(call)(**kwargs))
+    if is_async_gen_callable(call):
+        return await stack.enter_async_context(asynccontextmanager(call)(**kwargs))
+    if is_coroutine_callable(call):
+        return await call(**kwargs)
+    return call(**kwargs)
+
+
+async def solve_dependencies(call: Callable[..., Any], stack: AsyncExitStack, cache: Dict[Any, Any]) -> Any:
+    """Вызов `call` с разрешением его зависимостей вне запроса
+
+    Поддерживаются только зависимости, объявленные через `Depends`, и параметры со значениями по умолчанию:
+    параметры запроса (query, body, Request, ...) вне запроса недоступны.
+    Зависимости с `yield` закрываются при закрытии `stack`.
+
+    Args:
+        call: Вызываемый объект (функция или класс)
+        stack: Стек завершения зависимостей с `yield`
+        cache: Кэш уже разрешённых зависимостей (`use_cache=True`)
+
+    Returns: Результат вызова `call`
+    """
+    kwargs = {}
+    for name, parameter in inspect.signature(call).parameters.items():
+        if parameter.kind in (inspect.Parameter.VAR_POSITIONAL, inspect.Parameter.VAR_KEYWORD):
+            continue
+        kwargs[name] = await _solve_parameter(call, name, parameter, stack, cache)
+    return await _call_dependency(call, kwargs, stack)
+
+
+class ControllerProvider:
+    """Хранение экземпляров контроллера со временем жизни `app` или `scoped`.
+
+    * `app` — один экземпляр на процесс. Создаётся при запуске первого приложения (или при первом запросе, если
+      lifespan не запускался) и освобождается после остановки последнего приложения.
+    * `scoped` — один экземпляр на приложение FastAPI, создаётся при его запуске и освобождается при остановке.
+
+    Зависимости, объявленные атрибутами класса и в `__init__`, разрешаются один раз при создании экземпляра;
+    зависимости методов API по-прежнему разрешаются в каждом запросе. `__ainit__` и `__aenter__` экземпляра
+    вызываются при его создании, `__aexit__` — при освобождении.
+    """
+
+    def __init__(self, cls: Type[Any], lifetime: str) -> None:
+        self.cls = cls
+        self.lifetime = lifetime
+        self._instances: Any = weakref.WeakKeyDictionary() if lifetime == LIFETIME_SCOPED else {}
+        # Создаваемые экземпляры: одновременные первые запросы ожидают одну задачу создания
+        self._pending: Dict[Any, 'asyncio.Future[Tuple[Any, AsyncExitStack]]'] = {}
+        self._users = 0
+
+    def _key(self, app: Any) -> Any:
+        return app if self.lifetime == LIFETIME_SCOPED else LIFETIME_APP
+
+    async def _create(self) -> Tuple[Any, AsyncExitStack]:
+        stack = AsyncExitStack()
+        try:
+            instance = await solve_dependencies(self.cls, stack, {})
+            await enter_controller(instance, stack)
+        except BaseException:
+            await stack.aclose()
+            raise
+        return instance, stack
+
+    async def get(self, app: Any) -> Any:
+        """Получение экземпляра контроллера (создаётся при первом обращении)
+
+        Args:
+            app: Приложение, обрабатывающее запрос
+
+        Returns: Экземпляр контроллера
+        """
+        key = self._key(app)
+        entry = self._instances.get(key)
+        if entry is not None:
+            return entry[0]
+
+        pending = self._pending.get(key)
+        # Задача другого цикла событий (например, другого тестового клиента) не ожидается
+        if pending is None or pending.get_loop() is not asyncio.get_running_loop():
+            pending = asyncio.ensure_future(self._store(key))
+            self._pending[key] = pending
+            pending.add_done_callback(lambda done: self._forget(key, done))
+        return (await asyncio.shield(pending))[0]
+
+    async def _store(self, key: Any) -> Tuple[Any, AsyncExitStack]:
+        created = await self._create()
+        # Экземпляр мог создать параллельный запрос в другом цикле событий
+        entry = self._instances.setdefault(key, created)
+        if entry is not created:
+            await created[1].aclose()
+        return entry
+
+    def _forget(self, key: Any, task: 'asyncio.Future[Tuple[Any, AsyncExitStack]]') -> None:
+        if self._pending.get(key) is task:
+            del self._pending[key]
+        # Исключение помечается полученным, даже если все запросы были отменены
+        if not task.cancelled():
+            task.exception()
+
+    async def release(self, app: Any) -> None:
+        """Освобождение экземпляра контроллера и закрытие его зависимостей с `yield`
+
+        Args:
+            app: Останавливаемое приложение
+        """
+        entry = self._instances.pop(self._key(app), None)
+        if entry is not None:
+            await entry[1].aclose()
+
+    @asynccontextmanager
+    async def lifespan(self, app: Any) -> AsyncIterator[None]:
+        """Lifespan маршрутизатора: создание экземпляра при запуске приложения и освобождение при остановке."""
+        self._users += 1
+        try:
+            await self.get(app)
+            yield
+        finally:
+            self._users -= 1
+            if self.lifetime == LIFETIME_SCOPED or self._users == 0:
+                await self.release(app)
+
+    async def dependency(self, request: Request) -> Any:
+        """Зависимость FastAPI, возвращающая экземпляр контроллера."""
+        return await self.get(request.app)
+
+
+def has_custom_init(cls: Type[Any]) -> bool:
+    """У контроллера (или его родителя) есть собственный `__init__`, а не только присваивание зависимостей."""
+    init = cls.__init__
+    return getattr(init, INIT_ORIGINAL, init) is not object.__init__
+
+
+def has_async_lifecycle(cls: Type[Any]) -> bool:
+    """У контроллера есть асинхронная инициализация (`__ainit__`) или асинхронный контекст (`__aenter__`)."""
+    return hasattr(cls, '__ainit__') or hasattr(cls, '__aenter__')
+
+
+async def enter_controller(instance: Any, stack: AsyncExitStack) -> None:
+    """Асинхронная инициализация экземпляра контроллера: `await __ainit__()`, затем вход в `__aenter__`
+
+    `__aexit__` вызывается при закрытии `stack`.
+    """
+    ainit = getattr(instance, '__ainit__', None)
+    if ainit is not None:
+        await ainit()
+    if hasattr(instance, '__aenter__'):
+        await stack.enter_async_context(instance)
+
+
+def async_controller_factory(cls: Type[Any], in_threadpool: bool = False) -> Callable[..., Any]:
+    """Асинхронная зависимость FastAPI, создающая экземпляр контроллера
+
+    FastAPI вызывает класс-зависимость (`Depends(cls)`) как обычную функцию в пуле потоков. Для контроллера без
+    блокирующей работы в `__init__` переход в пул потоков и обратно в каждом запросе лишний: фабрика с той же
+    сигнатурой, что и у класса, вызывается FastAPI напрямую.
+
+    Если у контроллера есть `__ainit__` или `__aenter__`/`__aexit__`, фабрика — зависимость с `yield`:
+    `__ainit__` и `__aenter__` ожидаются до вызова метода API, `__aexit__` — после его завершения (с исключением
+    метода API, если оно возникло; подавить его `__aexit__` не может).
+
+    Args:
+        cls: Класс контроллера
+        in_threadpool: Вызывать `__init__` в пуле потоков
+
+    Returns: Зависимость
+    """
+    async def construct(kwargs: Dict[str, Any]) -> Any:
+        if in_threadpool:
+            return await run_in_threadpool(cls, **kwargs)
+        return cls(**kwargs)
+
+    if has_async_lifecycle(cls):
+        async def create_controller(**kwargs: Any) -> AsyncIterator[Any]:
+            stack = AsyncExitStack()
+            try:
+                instance = await construct(kwargs)
+                await enter_controller(instance, stack)
+                yield instance
+            except BaseException as error:
+                # Исключение передаётся в `__aexit__`, но не подавляется: ответ уже не сформирован
+                await stack.__aexit__(type(error), error, error.__traceback__)
+                raise
+            await stack.aclose()
+    else:
+        async def create_controller(**kwargs: Any) -> Any:
+            return await construct(kwargs)
+
+    create_controller.__signature__ = inspect.signature(cls)
+    create_controller.__name__ = cls.__name__
+    create_controller.__qualname__ = f'{cls.__qualname__}.<async factory>'
+    create_controller.__module__ = cls.__module__
+    return create_controller
+
+
+def merge_lifespans(lifespans: Sequence[Callable[[Any], AsyncContextManager[None]]]) -> Optional[Callable[..., Any]]:
+    """Объединение lifespan маршрутизатора: запуск по порядку, остановка в обратном порядке
+
+    Args:
+        lifespans: Функции lifespan
+
+    Returns: Функция lifespan (None, если список пуст)
+    """
+    if len(lifespans) <= 1:
+        return lifespans[0] if lifespans else None
+
+    @asynccontextmanager
+    async def lifespan(app: Any) -> AsyncIterator[None]:
+        async with AsyncExitStack() as stack:
+            for item in lifespans:
+                await stack.enter_async_context(item(app))
+            yield
+
+    return lifespan
@@ -0,0 +1,197 @@
+"""Ограничение одновременных запросов к контроллеру и сброс нагрузки (load shedding).
+
+    class ReportsAPI(Routable):
+        MAX_CONCURRENCY = 8     # одновременно выполняемые методы API контроллера
+        MAX_QUEUE = 32          # запросы, ожидающие свободного места (None — без ограничения)
+        QUEUE_TIMEOUT = 2.0     # максимальное ожидание в очереди, секунд (None — без ограничения)
+
+Запрос сверх очереди или не дождавшийся места за `QUEUE_TIMEOUT` сразу получает `SHED_STATUS_CODE`
+(`503 Service Unavailable` или `429 Too Many Requests`) с `Retry-After`. Ограничение общее для всех методов API
+контроллера и действует на время вызова метода (зависимости к этому моменту уже получены, потоковый ответ
+передаётся уже без ограничения). Состояние (`ConcurrencyLimiter.metrics()`, `limiter_metrics()`) можно отдавать
+системе мониторинга.
+"""
+import asyncio
+import collections
+import weakref
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+from fastapi import HTTPException
+
+from class_based_fastapi.defaults import (
+    CONCURRENCY_LIMITER,
+    MAX_CONCURRENCY_KEY,
+    MAX_QUEUE_KEY,
+    QUEUE_TIMEOUT_KEY,
+    RETRY_AFTER_KEY,
+    SHED_STATUS_CODE_KEY,
+)
+from class_based_fastapi.route_args import RouteArgs
+from class_based_fastapi.wrappers import call_endpoint, wrap_endpoint
+
+_limiters: 'weakref.WeakSet[ConcurrencyLimiter]' = weakref.WeakSet()
+
+
+class ConcurrencyLimiter:
+    """Асинхронный семафор с ограниченной очередью ожидания
+
+    Args:
+        max_concurrency: Количество одновременно выполняемых запросов
+        max_queue: Количество запросов, ожидающих места (None — без ограничения, 0 — без ожидания)
+        queue_timeout: Максимальное ожидание места, секунд (None — без ограничения)
+        name: Название (метка в метриках)
+        status_code: Код ответа при превышении ограничений
+        retry_after: Значение заголовка `Retry-After`, секунд
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int,
+        max_queue: Optional[int] = None,
+        queue_timeout: Optional[float] = None,
+        name: str = '',
+        status_code: int = 503,
+        retry_after: int = 1,
+    ) -> None:
+        if max_concurrency < 1:
+            raise ValueError(f'max_concurrency must be positive, got {max_concurrency!r}')
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.name = name
+        self.status_code = status_code
+        self.retry_after = retry_after
+        self.in_flight = 0
+        self.rejected = 0
+        self.timed_out = 0
+        self._waiters: Deque['asyncio.Future[None]'] = collections.deque()
+        _limiters.add(self)
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}(max_concurrency={self.max_concurrency}, name={self.name!r})'
+
+    @property
+    def queued(self) -> int:
+        """Количество запросов, ожидающих места."""
+        return len(self._waiters)
+
+    def _overloaded(self) -> HTTPException:
+        return HTTPException(
+            status_code=self.status_code,
+            detail=f'Controller "{self.name}" is overloaded',
+            headers={'Retry-After': str(self.retry_after)},
+        )
+
+    async def acquire(self) -> None:
+        """Получение места: сразу, после ожидания в очереди или отказ
+
+        Raises:
+            HTTPException: Очередь заполнена или место не освободилось за `queue_timeout`
+        """
+        if self.in_flight < self.max_concurrency and not self._waiters:
+            self.in_flight += 1
+            return
+        if self.max_queue is not None and len(self._waiters) >= self.max_queue:
+            self.rejected += 1
+            raise self._overloaded()
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await asyncio.wait_for(waiter, self.queue_timeout)
+        except BaseException as error:
+            # Место уже передано отменённому запросу — передаётся следующему
+            if waiter.done() and not waiter.cancelled():
+                self.release()
+            if isinstance(error, asyncio.TimeoutError):
+                self.timed_out += 1
+                raise self._overloaded() from None
+            raise
+        finally:
+            if not waiter.done() or waiter.cancelled():
+                try:
+                    self._waiters.remove(waiter)
+                except ValueError:
+                    pass
+
+    def release(self) -> None:
+        """Освобождение места: оно передаётся первому ожидающему запросу."""
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self.in_flight -= 1
+
+    async def __aenter__(self) -> 'ConcurrencyLimiter':
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        self.release()
+
+    def metrics(self) -> Dict[str, Any]:
+        """Состояние ограничения: выполняемые и ожидающие запросы, отказы по очереди и по времени ожидания."""
+        return {
+            'name': self.name,
+            'max_concurrency': self.max_concurrency,
+            'max_queue': self.max_queue,
+            'in_flight': self.in_flight,
+            'queued': self.queued,
+            'rejected': self.rejected,
+            'timed_out': self.timed_out,
+        }
+
+
+def limiter_metrics() -> List[Dict[str, Any]]:
+    """Состояние ограничений всех контроллеров."""
+    return [limiter.metrics() for limiter in sorted(_limiters, key=lambda limiter: limiter.name)]
+
+
+def get_limiter(cls: type) -> Optional[ConcurrencyLimiter]:
+    """Ограничение одновременных запросов контроллера (`MAX_CONCURRENCY`), общее для его методов API
+
+    Ограничение хранится в классе контроллера (у наследника — своё) и создаётся заново при изменении настроек.
+
+    Args:
+        cls: Класс контроллера
+
+    Returns: Ограничение (None, если `MAX_CONCURRENCY` не задан)
+    """
+    max_concurrency = getattr(cls, MAX_CONCURRENCY_KEY, None)
+    if max_concurrency is None:
+        return None
+    options = dict(
+        max_concurrency=max_concurrency,
+        max_queue=getattr(cls, MAX_QUEUE_KEY, None),
+        queue_timeout=getattr(cls, QUEUE_TIMEOUT_KEY, None),
+        name=f'{cls.__module__}.{cls.__qualname__}',
+        status_code=getattr(cls, SHED_STATUS_CODE_KEY, 503),
+        retry_after=getattr(cls, RETRY_AFTER_KEY, 1),
+    )
+    limiter = cls.__dict__.get(CONCURRENCY_LIMITER)
+    if limiter is None or any(getattr(limiter, name) != value for name, value in options.items()):
+        limiter = ConcurrencyLimiter(**options)
+        type.__setattr__(cls, CONCURRENCY_LIMITER, limiter)
+    return limiter
+
+
+def limit_endpoint(cls: type, endpoint: Callable[..., Any], args: RouteArgs) -> Callable[..., Any]:
+    """Обёртка метода API, ограничивающая одновременные запросы к контроллеру (`MAX_CONCURRENCY`)
+
+    Args:
+        cls: Класс контроллера
+        endpoint: Метод API
+        args: Аргументы маршрута метода API
+
+    Returns: Метод API
+    """
+    limiter = get_limiter(cls)
+    if limiter is None:
+        return endpoint
+
+    async def limited(**kwargs: Any) -> Any:
+        async with limiter:
+            return await call_endpoint(endpoint, kwargs)
+
+    return wrap_endpoint(endpoint, limited)
@@ -0,0 +1,195 @@
+import copy
+from functools import partial
+from typing import Any, Dict, Hashable, List, Optional, Sequence, Tuple, Type
+
+from fastapi import FastAPI
+from fastapi.openapi.utils import get_openapi
+from fastapi.routing import APIRoute
+from starlette.routing import BaseRoute
+
+from class_based_fastapi.defaults import CBV_CLASS_KEY, OPENAPI_CACHE
+
+
+def get_route_controller(route: BaseRoute) -> Optional[Type[Any]]:
+    """Получение контроллера, которому принадлежит маршрут
+
+    Args:
+        route: Маршрут приложения
+
+    Returns: Тип контроллера или None, если маршрут объявлен не в контроллере
+    """
+    if not isinstance(route, APIRoute):
+        return None
+    return getattr(route.endpoint, CBV_CLASS_KEY, None)
+
+
+def _route_key(route: APIRoute) -> Tuple[Hashable, ...]:
+    """Значения маршрута, которые `include_router` может изменить и от которых зависит его описание в OpenAPI."""
+    return (
+        route.path_format,
+        tuple(sorted(route.methods or ())),
+        tuple(str(tag) for tag in route.tags or ()),
+        tuple(id(depends.dependency) for depends in route.dependencies),
+        tuple(str(code) for code in route.responses),
+        route.name,
+        route.operation_id,
+        route.deprecated,
+        route.include_in_schema,
+        tuple(_route_key(callback) for callback in route.callbacks or () if isinstance(callback, APIRoute)),
+        repr(route.openapi_extra),
+    )
+
+
+def get_openapi_fragment(
+    cls: Type[Any],
+    routes: Sequence[APIRoute],
+    openapi_version: str = "3.1.0",
+    separate_input_output_schemas: bool = True,
+) -> Dict[str, Any]:
+    """Фрагмент схемы OpenAPI (`paths` и `components`) маршрутов контроллера
+
+    Фрагмент строится один раз и хранится в классе. Он пересобирается, если маршруты подключены к приложению
+    с другими параметрами `include_router` (префикс, теги, зависимости, ...), и после `invalidate_routes`.
+
+    Args:
+        cls: Тип контроллера
+        routes: Маршруты контроллера в приложении
+        openapi_version: Версия OpenAPI
+        separate_input_output_schemas: Раздельные схемы моделей для запроса и ответа
+
+    Returns: Фрагмент схемы: `{"paths": ..., "components": ...}`
+    """
+    key = (openapi_version, separate_input_output_schemas, tuple(_route_key(route) for route in routes))
+    fragments = cls.__dict__.get(OPENAPI_CACHE)
+    if fragments is None:
+        fragments = {}
+        type.__setattr__(cls, OPENAPI_CACHE, fragments)
+
+    fragment = fragments.get(key)
+    if fragment is None:
+        schema = get_openapi(
+            title=cls.__name__,
+            version="",
+            openapi_version=openapi_version,
+            routes=routes,
+            separate_input_output_schemas=separate_input_output_schemas,
+        )
+        fragment = {"paths": schema.get("paths", {}), "components": schema.get("components", {})}
+        fragments[key] = fragment
+    return fragment
+
+
+def _merge_fragment(schema: Dict[str, Any], fragment: Dict[str, Any]) -> bool:
+    """Добавление фрагмента в схему
+
+    Returns: False, если одноимённые компоненты фрагментов различаются и схему нужно строить целиком
+    """
+    paths = schema.setdefault("paths", {})
+    for path, operations in fragment["paths"].items():
+        paths.setdefault(path, {}).update(copy.deepcopy(operations))
+
+    components = schema.setdefault("components", {})
+    for section, items in fragment["components"].items():
+        merged = components.setdefault(section, {})
+        for name, value in items.items():
+            if name in merged:
+                if merged[name] != value:
+                    return False
+                continue
+            merged[name] = copy.deepcopy(value)
+    return True
+
+
+def _get_full_openapi(app: FastAPI, routes: Sequence[BaseRoute]) -> Dict[str, Any]:
+    return get_openapi(
+        title=app.title,
+        version=app.version,
+        openapi_version=app.openapi_version,
+        summary=app.summary,
+        description=app.description,
+        terms_of_service=app.terms_of_service,
+        contact=app.contact,
+        license_info=app.license_info,
+        routes=routes,
+        webhooks=app.webhooks.routes,
+        tags=app.openapi_tags,
+        servers=app.servers,
+        separate_input_output_schemas=app.separate_input_output_schemas,
+    )
+
+
+def merge_openapi(app: FastAPI) -> Dict[str, Any]:
+    """Построение схемы OpenAPI приложения из фрагментов контроллеров
+
+    Маршруты контроллеров описываются кэшированными фрагментами (`get_openapi_fragment`), остальные маршруты
+    приложения — стандартным `get_openapi`. Пути объединяются в порядке маршрутов приложения.
+    Если разные модели получили одинаковое название компонента, схема строится стандартным способом, чтобы FastAPI
+    разрешил конфликт имён.
+
+    Args:
+        app: Приложение FastAPI
+
+    Returns: Схема OpenAPI
+    """
+    groups: Dict[Any, List[BaseRoute]] = {}
+    for route in app.routes:
+        groups.setdefault(get_route_controller(route), []).append(route)
+
+    if list(groups) == [None]:
+        return _get_full_openapi(app, app.routes)
+
+    base = _get_full_openapi(app, groups.get(None, []))
+    schema = {name: value for name, value in base.items() if name not in ("paths", "components", "webhooks")}
+    schema["paths"] = {}
+    for controller, routes in groups.items():
+        fragment = (
+            {"paths": base.get("paths", {}), "components": base.get("components", {})}
+            if controller is None
+            else get_openapi_fragment(
+                controller, routes, app.openapi_version, app.separate_input_output_schemas
+            )
+        )
+        if not _merge_fragment(schema, fragment):
+            return _get_full_openapi(app, app.routes)
+
+    components = schema.pop("components", {})
+    if "schemas" in components:
+        components["schemas"] = {name: components["schemas"][name] for name in sorted(components["schemas"])}
+    if components:
+        schema["components"] = components
+    if "webhooks" in base:
+        schema["webhooks"] = base["webhooks"]
+    return schema
+
+
+def _openapi(app: FastAPI) -> Dict[str, Any]:
+    if not app.openapi_schema:
+        app.openapi_schema = merge_openapi(app)
+    return app.openapi_schema
+
+
+def setup_openapi(app: FastAPI) -> FastAPI:
+    """Построение схемы OpenAPI приложения (`app.openapi()`, `/openapi.json`) из кэшированных фрагментов
+    контроллеров
+
+    Args:
+        app: Приложение FastAPI
+
+    Returns: То же приложение
+    """
+    app.openapi = partial(_openapi, app)  # type: ignore[method-assign]
+    return app
+
+
+def invalidate_openapi(app: Optional[FastAPI] = None, *controllers: Type[Any]) -> None:
+    """Сброс схемы OpenAPI приложения и кэшированных фрагментов контроллеров
+
+    Args:
+        app: Приложение FastAPI, схема которого будет построена заново
+        controllers: Контроллеры, фрагменты которых будут построены заново
+    """
+    if app is not None:
+        app.openapi_schema = None
+    for controller in controllers:
+        if OPENAPI_CACHE in controller.__dict__:
+            type.__delattr__(controller, OPENAPI_CACHE)
@@ -0,0 +1,234 @@
+"""Постраничный вывод списков по ключу (keyset / cursor pagination)."""
+import base64
+import datetime
+import decimal
+import json
+import uuid
+from typing import Any, Callable, Dict, Generic, List, Optional, Sequence, Tuple, TypeVar
+
+from fastapi import HTTPException, Query
+from fastapi.encoders import jsonable_encoder
+from pydantic import BaseModel
+
+T = TypeVar('T')
+
+# Типы значений ключа, которые JSON не сохраняет: тег -> (тип, кодирование в строку, декодирование).
+# Такое значение записывается в курсор как `{тег: строка}`; `datetime` проверяется раньше `date` (подкласс)
+_CURSOR_TYPES: Dict[str, Tuple[type, Callable[[Any], str], Callable[[str], Any]]] = {
+    'datetime': (datetime.datetime, datetime.datetime.isoformat, datetime.datetime.fromisoformat),
+    'date': (datetime.date, datetime.date.isoformat, datetime.date.fromisoformat),
+    'time': (datetime.time, datetime.time.isoformat, datetime.time.fromisoformat),
+    'decimal': (decimal.Decimal, str, decimal.Decimal),
+    'uuid': (uuid.UUID, str, uuid.UUID),
+    'bytes': (bytes, lambda value: base64.b64encode(value).decode(), base64.b64decode),
+}
+
+
+class Paginated(BaseModel, Generic[T]):
+    """Страница списка: элементы и курсор следующей страницы (None, если страница последняя)."""
+
+    items: List[T]
+    next_cursor: Optional[str] = None
+
+
+class PageParams:
+    """Параметры запроса страницы: `cursor` (курсор из `next_cursor` предыдущей страницы) и `limit`.
+
+    Подключается к методу API зависимостью: `page: PageParams = Depends()`.
+    """
+
+    def __init__(
+        self,
+        cursor: Optional[str] = Query(None, description='Cursor of the page (next_cursor of the previous page)'),
+        limit: Optional[int] = Query(None, ge=1, description='Page size'),
+    ) -> None:
+        self.cursor = cursor
+        self.limit = limit
+
+
+def _encode_value(value: Any) -> Any:
+    for tag, (value_type, encode, _) in _CURSOR_TYPES.items():
+        if isinstance(value, value_type):
+            return {tag: encode(value)}
+    return jsonable_encoder(value)
+
+
+def _decode_value(value: Any) -> Any:
+    if isinstance(value, dict) and len(value) == 1:
+        [(tag, text)] = value.items()
+        if tag in _CURSOR_TYPES and isinstance(text, str):
+            return _CURSOR_TYPES[tag][2](text)
+    if isinstance(value, (dict, list)):
+        raise ValueError(value)
+    return value
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """Кодирование значений ключа сортировки последней строки в непрозрачный курсор
+
+    Значения `Decimal`, даты и времени, `UUID` и `bytes` записываются вместе с типом и восстанавливаются
+    без потери точности.
+
+    Args:
+        values: Значения ключа сортировки
+
+    Returns: Курсор (base64url)
+    """
+    data = json.dumps([_encode_value(value) for value in values], separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(data).rstrip(b'=').decode()
+
+
+def decode_cursor(cursor: str, size: int) -> List[Any]:
+    """Декодирование курсора
+
+    Args:
+        cursor: Курсор (`encode_cursor`)
+        size: Количество значений ключа сортировки
+
+    Returns: Значения ключа сортировки
+    """
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+        if isinstance(values, list):
+            values = [_decode_value(value) for value in values]
+    except (decimal.InvalidOperation, TypeError, ValueError):  # в том числе binascii.Error, UnicodeDecodeError
+        values = None
+    if not isinstance(values, list) or len(values) != size:
+        raise HTTPException(status_code=400, detail='Invalid cursor')
+    return values
+
+
+def _coerce(value: Any, python_type: type) -> Any:
+    """Приведение значения из курсора к типу столбца."""
+    if value is None or isinstance(value, python_type):
+        return value
+    try:
+        if python_type in (datetime.datetime, datetime.date, datetime.time):
+            return python_type.fromisoformat(value)
+        return python_type(value)
+    except (decimal.InvalidOperation, TypeError, ValueError) as error:
+        raise HTTPException(status_code=400, detail='Invalid cursor') from error
+
+
+class KeysetPagination:
+    """Примесь для контроллеров (`Routable`) с постраничным выводом запросов SQLAlchemy по ключу.
+
+    Ключ сортировки задаётся атрибутами модели в `ORDER_BY` (`-` перед названием — по убыванию), по умолчанию
+    используется первичный ключ; первичный ключ также добавляется в конец ключа, чтобы порядок был однозначным.
+    Столбцы ключа должны быть `NOT NULL`: строки со значением NULL не попадают в условие `>`/`<`.
+    Следующая страница выбирается условием `WHERE (ключ) > (значения последней строки)` вместо `OFFSET`,
+    поэтому время запроса не зависит от номера страницы (при наличии индекса по ключу сортировки).
+
+    Пример:
+
+        class BooksAPI(KeysetPagination, Routable):
+            ORDER_BY = ('-created_at',)
+
+            @get('')
+            async def books(self, page: PageParams = Depends()) -> Paginated[Book]:
+                return await self.paginate(self.session, select(Book), page)
+    """
+
+    # Ключ сортировки: названия атрибутов модели, `-` — по убыванию (по умолчанию — первичный ключ)
+    ORDER_BY = ()
+    # Размер страницы по умолчанию и максимальный размер
+    PAGE_SIZE = 50
+    MAX_PAGE_SIZE = 1000
+
+    __slots__ = ()
+
+    @classmethod
+    def keyset_order(cls, entity: Any) -> List[Tuple[str, bool]]:
+        """Ключ сортировки модели
+
+        Args:
+            entity: Модель SQLAlchemy
+
+        Returns: Названия атрибутов и признак сортировки по убыванию
+
+        Raises:
+            ValueError: Столбец ключа сортировки допускает NULL
+        """
+        import sqlalchemy as sa
+
+        order = [(name.lstrip('-'), name.startswith('-')) for name in cls.ORDER_BY]
+        mapper = sa.inspect(entity)
+        for name, _ in order:
+            if any(getattr(column, 'nullable', False) for column in getattr(mapper.attrs.get(name), 'columns', ())):
+                raise ValueError(
+                    f'{cls.__name__}.ORDER_BY: column "{name}" of {mapper.class_.__name__} is nullable, '
+                    f'keyset pagination needs NOT NULL ordering columns'
+                )
+        for column in mapper.primary_key:
+            name = mapper.get_property_by_column(column).key
+            if name not in {key for key, _ in order}:
+                order.append((name, False))
+        return order
+
+    @staticmethod
+    def keyset_condition(columns: Sequence[Any], descending: Sequence[bool], values: Sequence[Any]) -> Any:
+        """Условие выборки строк после строки со значениями `values` ключа сортировки
+
+        Args:
+            columns: Столбцы ключа сортировки
+            descending: Признаки сортировки по убыванию
+            values: Значения ключа последней строки предыдущей страницы
+
+        Returns: Условие SQLAlchemy
+        """
+        import sqlalchemy as sa
+
+        if len(set(descending)) == 1:
+            row = sa.tuple_(*columns)
+            after = sa.tuple_(*[sa.literal(value, column.type) for column, value in zip(columns, values)])
+            return row < after if descending[0] else row > after
+
+        conditions = []
+        for i, (column, desc) in enumerate(zip(columns, descending)):
+            equal = [columns[j] == values[j] for j in range(i)]
+            conditions.append(sa.and_(*equal, column < values[i] if desc else column > values[i]))
+        return sa.or_(*conditions)
+
+    async def paginate(self, session: Any, statement: Any, page: PageParams) -> Paginated:
+        """Выполнение запроса `select(Model)` постранично
+
+        Args:
+            session: Асинхронная сессия SQLAlchemy
+            statement: Запрос (сортировка и ограничение добавляются к нему)
+            page: Параметры запроса страницы
+
+        Returns: Страница
+        """
+        entity = statement.column_descriptions[0]['entity']
+        order = self.keyset_order(entity)
+        columns = [getattr(entity, name) for name, _ in order]
+        descending = [desc for _, desc in order]
+        limit = min(page.limit or self.PAGE_SIZE, self.MAX_PAGE_SIZE)
+
+        if page.cursor is not None:
+            values = decode_cursor(page.cursor, len(order))
+            values = [_coerce(value, self._python_type(column)) for value, column in zip(values, columns)]
+            statement = statement.where(self.keyset_condition(columns, descending, values))
+        statement = statement.order_by(
+            *[column.desc() if desc else column.asc() for column, desc in zip(columns, descending)]
+        ).limit(limit + 1)
+
+        items = list((await session.scalars(statement)).all())
+        next_cursor = None
+        if len(items) > limit:
+            items = items[:limit]
+            next_cursor = encode_cursor([getattr(items[-1], name) for name, _ in order])
+        # Элементы проверяются моделью ответа метода API (`Paginated[Model]`)
+        return Paginated.model_construct(items=items, next_cursor=next_cursor)
+
+    @staticmethod
+    def _python_type(column: Any) -> type:
+        # Для TypeDecorator (например, UTCDateTime SQLModel) тип определяется по базовому типу `impl`
+        for column_type in (column.type, getattr(column.type, 'impl', None)):
+            try:
+                python_type = column_type.python_type
+            except (AttributeError, NotImplementedError):
+                continue
+            if python_type is not object:
+                return python_type
+        return object
@@ -0,0 +1,97 @@
+import weakref
+from typing import Dict, List, Optional, Tuple, Type
+
+
+class ClassRegistry:
+    """Реестр созданных контроллеров.
+
+    Хранит только слабые ссылки на типы, поэтому удалённые классы не удерживаются в памяти и сами исчезают из
+    индексов. Поиск выполняется по словарям без перебора всех зарегистрированных классов.
+    """
+
+    def __init__(self) -> None:
+        self._by_qualname: Dict[Tuple[str, str], List[weakref.ref]] = {}
+        self._by_name: Dict[str, List[weakref.ref]] = {}
+        self._inheritors: "weakref.WeakKeyDictionary[type, weakref.WeakSet]" = weakref.WeakKeyDictionary()
+
+    def register(self, cls: Type[type]) -> None:
+        """Регистрация типа и его родительских типов
+
+        Args:
+            cls: Регистрируемый тип
+        """
+        key = (cls.__module__, cls.__qualname__)
+        name = cls.__name__
+
+        def discard(ref: weakref.ref) -> None:
+            self._discard(self._by_qualname, key, ref)
+            self._discard(self._by_name, name, ref)
+
+        ref = weakref.ref(cls, discard)
+        self._by_qualname.setdefault(key, []).append(ref)
+        self._by_name.setdefault(name, []).append(ref)
+        for base in cls.mro()[1:-1]:
+            inheritors = self._inheritors.get(base)
+            if inheritors is None:
+                inheritors = self._inheritors[base] = weakref.WeakSet()
+            inheritors.add(cls)
+
+    @staticmethod
+    def _discard(index: Dict, key: object, ref: weakref.ref) -> None:
+        refs = index.get(key)
+        if refs is None:
+            return
+        try:
+            refs.remove(ref)
+        except ValueError:
+            pass
+        if not refs:
+            del index[key]
+
+    @staticmethod
+    def _last(refs: Optional[List[weakref.ref]]) -> Optional[Type[type]]:
+        for ref in reversed(refs or ()):
+            cls = ref()
+            if cls is not None:
+                return cls
+        return None
+
+    def get(self, module: str, qualname: str) -> Optional[Type[type]]:
+        """Получение последнего зарегистрированного типа по модулю и полному имени
+
+        Args:
+            module: Название модуля
+            qualname: Полное имя типа (`__qualname__`)
+
+        Returns: Тип или None
+        """
+        return self._last(self._by_qualname.get((module, qualname)))
+
+    def find(self, name: str) -> Optional[Type[type]]:
+        """Получение последнего зарегистрированного типа по имени
+
+        Args:
+            name: Название типа (`__name__`)
+
+        Returns: Тип или None
+        """
+        return self._last(self._by_name.get(name))
+
+    def inheritors(self, base: Type[type]) -> List[Type[type]]:
+        """Получение зарегистрированных типов, унаследованных от base
+
+        Args:
+            base: Родительский тип
+
+        Returns: Список унаследованных типов
+        """
+        return list(self._inheritors.get(base, ()))
+
+    def __len__(self) -> int:
+        return sum(len(refs) for refs in self._by_qualname.values())
+
+    def __contains__(self, cls: object) -> bool:
+        if not isinstance(cls, type):
+            return False
+        refs = self._by_qualname.get((cls.__module__, cls.__qualname__), ())
+        return any(ref() is cls for ref in refs)
@@ -0,0 +1,50 @@
+"""Быстрый JSON-ответ на основе orjson (при его отсутствии — стандартный `json`).
+
+Включается для всех контроллеров атрибутом базового класса или для отдельного контроллера:
+
+    Routable.RESPONSE_CLASS = FastJSONResponse
+
+    class BooksAPI(Routable):
+        RESPONSE_CLASS = FastJSONResponse
+
+Класс ответа, явно заданный в декораторе метода API (`response_class=...`), имеет приоритет.
+"""
+from typing import Any
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import BaseModel
+
+from class_based_fastapi.serialization import PreSerializedJSONResponse
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+# orjson установлен: FastJSONResponse сериализует им
+FAST_JSON_AVAILABLE = orjson is not None
+
+_ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY if orjson is not None else 0
+
+
+def _default(value: Any) -> Any:
+    """Типы, которые orjson не сериализует сам (модели pydantic, Decimal, множества и т.п.)."""
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode='json')
+    return jsonable_encoder(value)
+
+
+class FastJSONResponse(PreSerializedJSONResponse):
+    """JSON-ответ, сериализуемый orjson.
+
+    Модели pydantic, dataclasses, `UUID`, `datetime`, `date`, `time` и `Enum` сериализуются без предварительного
+    `jsonable_encoder`. Если orjson не установлен, содержимое сериализуется как в `JSONResponse`. Уже сериализованное
+    тело (`bytes`, см. `precompile=True`) отправляется без изменений.
+    """
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, bytes):
+            return content
+        if orjson is None:
+            return super().render(jsonable_encoder(content))
+        return orjson.dumps(content, default=_default, option=_ORJSON_OPTIONS)
@@ -2,13 +2,15 @@ import copy
 import dataclasses
 import inspect
 import typing
-from collections import defaultdict
+import weakref
+from functools import partial
 from typing import (
     Any,
     Callable,
     ClassVar,
     Dict,
     List,
+    Optional,
     Tuple,
     Type,
     TypeVar,
@@ -17,23 +19,59 @@ from typing import (
 )
 
 from fastapi import APIRouter, Depends
+from fastapi.datastructures import Default, DefaultPlaceholder
 
+from class_based_fastapi.cache import cache_endpoint
+from class_based_fastapi.conditional import conditional_endpoint
 from class_based_fastapi.decorators import CONTROLLER_METHOD_KEY
 from class_based_fastapi.defaults import (
     API_METHODS,
-    CLASS_TYPE,
+    CBV_CLASS_KEY,
+    CONTROLLER_FACTORY,
+    CONTROLLER_PROVIDER,
     GENERIC_ATTRIBUTES,
+    GENERIC_TYPES,
+    INIT_IN_THREADPOOL_KEY,
     INIT_MODIFIED,
+    INIT_ORIGINAL,
+    LAZY_ROUTES_KEY,
+    LIFETIME_KEY,
+    LIFETIME_REQUEST,
+    LIFETIMES,
+    OPENAPI_CACHE,
+    RESPONSE_CLASS_KEY,
+    ROUTER_CACHE,
+    ROUTER_CACHE_ATTRIBUTES,
     SIGNATURE_KEY,
+    SLOTS_DEFAULTS,
+    SLOTS_KEY,
     TAGGING_KEY,
 )
+from class_based_fastapi.executors import ProcessPool, executor_endpoint, get_executor
+from class_based_fastapi.lazy import DeferredEndpoint, LazyAPIRoute
+from class_based_fastapi.lifetime import (
+    ControllerProvider,
+    async_controller_factory,
+    has_async_lifecycle,
+    has_custom_init,
+    merge_lifespans,
+)
+from class_based_fastapi.limits import limit_endpoint
+from class_based_fastapi.registry import ClassRegistry
 from class_based_fastapi.route_args import RouteArgs
-from class_based_fastapi.templates_formatting import _rest_api_naming
+from class_based_fastapi.serialization import serializer_endpoint
+from class_based_fastapi.singleflight import singleflight_endpoint
+from class_based_fastapi.streaming import stream_endpoint
+from class_based_fastapi.templates_formatting import format_route_path
 from class_based_fastapi.utilities import deepcopy_func
 
 AnyCallable = TypeVar("AnyCallable", bound=Callable[..., Any])
 
 
+# Значение по умолчанию для зависимостей, не переданных в `__init__`
+_MISSING = object()
+
+
 def is_classvar(hint):
     return getattr(hint, "__origin__", None) is ClassVar
 
@@ -42,8 +80,9 @@ class RoutableMeta(type):
     """Это метакласс, который формирует методы API, которые были отмечены декоратором маршрута/пути, в значения
     для конструктора маршрутизации добавления конечных точек к своему маршрутизатору из библиотеки FastAPI."""
 
-    __inheritors__ = defaultdict(list)
-    __inheritors_set__ = set()
+    __registry__ = ClassRegistry()
+    # Конкретизации обобщённых контроллеров: origin -> {типы параметров: (GENERIC_ATTRIBUTES, GENERIC_TYPES)}
+    __specialisations__: "weakref.WeakKeyDictionary[type, Dict[Tuple[Any, ...], Any]]" = weakref.WeakKeyDictionary()
 
     @staticmethod
     def get_config_endpoints(
@@ -58,26 +97,21 @@ class RoutableMeta(type):
         Returns: Конфигурация всех методов API
 
         """
-        cls_ = attrs.get(CLASS_TYPE)
-        if cls_ is None:
-            return {}
-
         new_methods = list(
             filter(lambda x: hasattr(x[1], CONTROLLER_METHOD_KEY), attrs.items())
         )
-        old_methods = attrs.get(API_METHODS, dict())
+        # RouteArgs неизменяемы, поэтому унаследованные методы используют аргументы родителя без копирования
+        old_methods = dict(attrs.get(API_METHODS, dict()))
         if not len(old_methods) and len(bases):
-            old_methods = {}
             for base in bases:
                 if not hasattr(base, API_METHODS):
                     continue
-                for name_method, args in getattr(base, API_METHODS).items():
-                    old_methods[name_method] = copy.deepcopy(args)
+                old_methods.update(getattr(base, API_METHODS))
 
         for name_method, endpoint in new_methods:
-            old_methods[name_method] = copy.deepcopy(endpoint._endpoint.args)
+            old_methods[name_method] = endpoint._endpoint.args
 
-        return copy.deepcopy(old_methods)
+        return old_methods
 
     @staticmethod
     def _init_cbv(cls: Type[type]) -> None:
@@ -91,24 +125,31 @@ class RoutableMeta(type):
 
         Returns: None
         """
-        old_init: Callable[..., Any] = cls.__init__
-        if getattr(old_init, INIT_MODIFIED, False):
+        if getattr(cls.__dict__.get("__init__"), INIT_MODIFIED, False):
             return
-        old_signature = inspect.signature(old_init)
-        old_parameters = list(old_signature.parameters.values())[
-            1:
-        ]  # drop `self` parameter
-        new_parameters = [
-            x
-            for x in old_parameters
-            if x.kind
-            not in (inspect.Parameter.VAR_POSITIONAL, inspect.Parameter.VAR_KEYWORD)
-        ]
+        old_init: Callable[..., Any] = cls.__init__
+        # Унаследованный `__init__` уже изменён родительским классом: оборачиваем исходный
+        old_init = getattr(old_init, INIT_ORIGINAL, old_init)
+        if old_init is object.__init__:
+            old_signature = inspect.Signature()
+            new_parameters = []
+        else:
+            old_signature = inspect.signature(old_init)
+            old_parameters = list(old_signature.parameters.values())[
+                1:
+            ]  # drop `self` parameter
+            new_parameters = [
+                x
+                for x in old_parameters
+                if x.kind
+                not in (inspect.Parameter.VAR_POSITIONAL, inspect.Parameter.VAR_KEYWORD)
+            ]
+        slot_defaults = getattr(cls, SLOTS_DEFAULTS, {})
         dependency_names: List[str] = []
         for name, hint in get_type_hints(cls).items():
             if is_classvar(hint) or name == "_endpoints":
                 continue
-            parameter_kwargs = {"default": getattr(cls, name, Ellipsis)}
+            parameter_kwargs = {"default": slot_defaults.get(name, getattr(cls, name, Ellipsis))}
             dependency_names.append(name)
             new_parameters.append(
                 inspect.Parameter(
@@ -119,18 +160,10 @@ class RoutableMeta(type):
                 )
             )
         new_signature = old_signature.replace(parameters=new_parameters)
-
-        def new_init(self: Any, *args: Any, **kwargs: Any) -> None:
-            for dep_name in dependency_names:
-                try:
-                    dep_value = kwargs.pop(dep_name)
-                    setattr(self, dep_name, dep_value)
-                except Exception as ex:
-                    print(ex)
-                    pass
-            old_init(self, *args, **kwargs)
+        new_init = RoutableMeta._build_init(cls, dependency_names, old_init, slot_defaults)
 
         setattr(new_init, INIT_MODIFIED, True)
+        setattr(new_init, INIT_ORIGINAL, old_init)
         setattr(cls, "__signature__", new_signature)
         setattr(cls, "__init__", new_init)
 
@@ -139,25 +172,86 @@ class RoutableMeta(type):
         # attrs[CBV_CLASS_KEY] = True
 
     @staticmethod
-    def __new_instance__(
-        cls: Type[type], name: str, bases: Tuple[Type[Any]], attrs: Dict[str, Any]
-    ) -> "RoutableMeta":
-        """Создание нового типа и запоминание родительских типов
+    def _init_slots(bases: Tuple[Type[Any]], attrs: Dict[str, Any]) -> None:
+        """Добавление `__slots__` для атрибутов-зависимостей класса (`SLOTS = True`)
+
+        Значения атрибутов (например, `Depends(...)`) переносятся из класса в `SLOTS_DEFAULTS`, иначе они
+        конфликтуют со слотами. Собственные атрибуты экземпляра, которые устанавливаются в `__init__`,
+        должны быть перечислены в `__slots__` класса.
 
         Args:
-            cls: Исходный тип (родительский)
-            name: Название создаваемого типа
             bases: Родительские типы
             attrs: Атрибуты создаваемого типа
+        """
+        inherited_slots = {slot for base in bases for klass in base.__mro__ for slot in klass.__dict__.get("__slots__", ())}
+        slots = list(attrs.get("__slots__", ()))
+        defaults: Dict[str, Any] = {}
+        for base in reversed(bases):
+            defaults.update(getattr(base, SLOTS_DEFAULTS, {}))
+
+        for name, hint in attrs.get("__annotations__", {}).items():
+            if name == "_endpoints" or name in inherited_slots or name in slots:
+                continue
+            if is_classvar(hint) or (isinstance(hint, str) and "ClassVar" in hint.split("[", 1)[0]):
+                continue
+            slots.append(name)
+            if name in attrs:
+                defaults[name] = attrs.pop(name)
+
+        attrs["__slots__"] = tuple(slots)
+        attrs[SLOTS_DEFAULTS] = defaults
 
-        Returns: Созданный тип
+    @staticmethod
+    def _build_init(
+        cls: Type[type],
+        dependency_names: List[str],
+        old_init: Callable[..., Any],
+        defaults: Optional[Dict[str, Any]] = None,
+    ) -> Callable[..., Any]:
+        """Генерация `__init__`, который напрямую присваивает зависимости атрибутам экземпляра
+
+        Если у класса нет собственного `__init__`, исходный инициализатор не вызывается вовсе.
+        Зависимость, не переданная в конструктор (например, при ручном создании экземпляра), не присваивается,
+        и атрибут по-прежнему берётся из класса. Для слотов (`defaults`) вместо этого присваивается значение
+        атрибута, объявленное в классе.
+
+        Args:
+            cls: Тип модифицируемого класса
+            dependency_names: Названия атрибутов-зависимостей
+            old_init: Исходный `__init__`
+            defaults: Значения по умолчанию атрибутов-слотов
+
+        Returns: Сгенерированный `__init__`
         """
-        # Унаследованные классы
-        klass = cast(RoutableMeta, type.__new__(cls, name, bases, attrs))
-        for base in klass.mro()[1:-1]:
-            cls.__inheritors__[base].append(klass)
-            cls.__inheritors_set__.add(klass)
-        return klass
+        defaults = defaults or {}
+        call_old_init = old_init is not object.__init__
+        parameters = ["self"]
+        if call_old_init:
+            parameters.append("*args")
+        elif dependency_names:
+            parameters.append("*")
+        parameters += [
+            f"{name}=__defaults[{name!r}]" if name in defaults else f"{name}=__missing"
+            for name in dependency_names
+        ]
+        if call_old_init:
+            parameters.append("**kwargs")
+
+        body = [
+            f"    self.{name} = {name}" if name in defaults else f"    if {name} is not __missing: self.{name} = {name}"
+            for name in dependency_names
+        ]
+        if call_old_init:
+            body.append("    __old_init(self, *args, **kwargs)")
+
+        source = "def __init__({}):\n{}\n".format(", ".join(parameters), "\n".join(body or ["    pass"]))
+        namespace: Dict[str, Any] = {"__missing": _MISSING, "__old_init": old_init, "__defaults": defaults}
+        exec(source, namespace)
+
+        new_init = namespace["__init__"]
+        new_init.__qualname__ = f"{cls.__qualname__}.__init__"
+        new_init.__module__ = cls.__module__
+        return new_init
 
     @staticmethod
     def get_type_instance(cls: Type[type], name: str):
@@ -170,68 +264,103 @@ class RoutableMeta(type):
         Returns: Унаследованный тип, соответствующий названию name
 
         """
-        for class_ in cls.__inheritors_set__:
-            if class_.__name__ == name:
-                return class_
+        return cls.__registry__.find(name)
 
     @staticmethod
-    def _compute_path_new(cls: Type[type], func: Callable) -> Callable:
+    def _compute_path_new(cls: Type[type], func: Callable) -> RouteArgs:
         """Формирование шаблона URI
 
+        Конфигурация метода в классе не изменяется: путь записывается в новый экземпляр `RouteArgs`,
+        поэтому маршруты можно пересобрать после изменения атрибутов класса.
+
         Args:
             cls: Тип класса
             func: Метод API
 
-        Returns: Сформированный метод API
+        Returns: Аргументы маршрута метода API
         """
 
         config_methods = getattr(cls, API_METHODS)
-        args = (
-            config_methods[func.__name__]
-            if func.__name__ in config_methods
-            else copy.deepcopy(func._endpoint.args)
+        args = config_methods.get(func.__name__) or func._endpoint.args
+        path = format_route_path(
+            cls.BASE_TEMPLATE_PATH, args.path, cls.NAME_MODULE, cls.VERSION_API, cls.__name__
         )
-        func_ = deepcopy_func(func, args, cls)
-        user_path = args.path
-        base_template = cls.BASE_TEMPLATE_PATH
-        if not str.startswith(user_path, "/"):
-            user_path = base_template.replace("{user_path}", user_path)
-
-        name_module = cls.NAME_MODULE
-        if "{module}" in user_path and (name_module is None or name_module == ""):
-            user_path = user_path.replace("/{module}", "")
-
-        # Template
-        if str.endswith(user_path, "/"):
-            user_path = user_path[:-1]
-        args.template_path = user_path
-
-        # Name module
-        name_module = _rest_api_naming(name_module)
-        args.name_module = name_module
-
-        # Version
-        varsion_api = str.lower(cls.VERSION_API)
-        args.varsion_api = varsion_api
-
-        # Replacement
-        path = (
-            user_path.replace("{module}", name_module)
-            .replace("{version}", varsion_api)
-            .replace("{controller}", _rest_api_naming(cls.__name__))
+        return dataclasses.replace(args, path=path)
+
+    @staticmethod
+    def _build_endpoint(
+        cls: Type[type], func: Callable, args: RouteArgs, controller: Callable[..., Any]
+    ) -> Tuple[Callable, RouteArgs]:
+        """Формирование функции метода API для FastAPI
+
+        * Аннотации обобщённых типов заменяются конкретными типами класса.
+        * Первый параметр (`self`) заменяется зависимостью, создающей экземпляр контроллера.
+        * Метод API помечается классом контроллера (`CBV_CLASS_KEY`), по нему маршруты группируются в OpenAPI.
+        * Синхронный метод API контроллера с `EXECUTOR` (или `executor=`) выполняется в его пуле потоков
+          или процессов.
+        * Метод API, возвращающий `Stream[T]` (или отмеченный `stream=...`), оборачивается потоковым ответом.
+        * Метод API с `precompile=True` сериализует ответ заранее подготовленным `TypeAdapter`.
+        * Метод API с `singleflight=True` объединяет одновременные одинаковые запросы, с `cache=...` —
+          оборачивается кэшем сериализованных ответов (проверяется до объединения запросов).
+        * Для GET с `etag=...` (или `ETAG` контроллера) обрабатываются условные запросы (`304 Not Modified`).
+        * При `MAX_CONCURRENCY` контроллера одновременные вызовы ограничиваются, лишние запросы отклоняются.
+
+        Args:
+            cls: Тип класса
+            func: Метод API
+            args: Аргументы маршрута метода API
+            controller: Зависимость, создающая экземпляр контроллера
+
+        Returns: Сформированный метод API и аргументы его маршрута с моделью ответа
+        """
+        endpoint = deepcopy_func(func, cls)
+        setattr(endpoint, CBV_CLASS_KEY, cls)
+        # get the signature of the endpoint function
+        signature = getattr(endpoint, SIGNATURE_KEY)
+        if args.response_model is None:
+            args = dataclasses.replace(args, response_model=signature.return_annotation)
+        # get the parameters of the endpoint function
+        signature_parameters = list(signature.parameters.values())
+
+        # replace the class instance with the itself FastApi Dependecy
+        signature_parameters[0] = signature_parameters[0].replace(
+            default=Depends(controller)
         )
-        args.path = path
-        # print(f'{args.methods}: {path}')
-        return func_
+
+        # set self and after it the keyword args
+        new_parameters = [signature_parameters[0]] + [
+            parameter.replace(kind=inspect.Parameter.KEYWORD_ONLY)
+            for parameter in signature_parameters[1:]
+        ]
+
+        new_signature = signature.replace(parameters=new_parameters)
+        setattr(endpoint, SIGNATURE_KEY, new_signature)
+        endpoint = executor_endpoint(cls, endpoint, args)
+        endpoint, args = stream_endpoint(endpoint, args)
+        endpoint = serializer_endpoint(cls, endpoint, args)
+        endpoint = singleflight_endpoint(cls, endpoint, args)
+        endpoint = cache_endpoint(cls, endpoint, args)
+        endpoint = conditional_endpoint(cls, endpoint, args)
+        return limit_endpoint(cls, endpoint, args), args
 
     @staticmethod
-    def compute_tags_route(args: RouteArgs, cls: Type[type]):
-        if not getattr(cls, TAGGING_KEY, False):
-            return
+    def compute_tags_route(args: RouteArgs, cls: Type[type]) -> RouteArgs:
+        if not getattr(cls, TAGGING_KEY, False) or args.tags:
+            return args
+
+        return dataclasses.replace(args, tags=getattr(cls, "TAGS", None) or [cls.__name__])
+
+    @staticmethod
+    def compute_response_class(args: RouteArgs, cls: Type[type]) -> RouteArgs:
+        """Класс ответа по умолчанию из `RESPONSE_CLASS` контроллера (если он не задан в декораторе метода API)
 
-        args.tags = args.tags or []
-        if args.tags == []:
-            args.tags = getattr(cls, "TAGS", None) or [cls.__name__]
+        Класс остаётся значением по умолчанию (`Default`), поэтому `default_response_class`, явно заданный
+        в приложении или маршрутизаторе FastAPI, имеет приоритет, как и для обычных маршрутов.
+        """
+        response_class = getattr(cls, RESPONSE_CLASS_KEY, None)
+        if response_class is None or not isinstance(args.response_class, DefaultPlaceholder):
+            return args
+        return dataclasses.replace(args, response_class=Default(response_class))
 
     @staticmethod
     def get_router(cls: Type[type]) -> APIRouter:
@@ -244,116 +373,205 @@ class RoutableMeta(type):
         """
         config_methods = getattr(cls, API_METHODS)
         functions = [
-            RoutableMeta._compute_path_new(cls, func)
+            func
             for name, func in inspect.getmembers(cls, inspect.isfunction)
             if hasattr(func, CONTROLLER_METHOD_KEY) or name in config_methods
         ]
 
-        router = APIRouter()
+        controller, provider = RoutableMeta.get_controller_dependency(cls)
+        lifespans = [provider.lifespan] if provider is not None else []
+        routes = []
+        for func in functions:
+            args = RoutableMeta._compute_path_new(cls, func)
+            args = RoutableMeta.compute_tags_route(args, cls)
+            args = RoutableMeta.compute_response_class(args, cls)
+            # Пулы процессов запускаются и останавливаются вместе с приложением
+            pool = get_executor(cls, args)
+            if isinstance(pool, ProcessPool) and pool.lifespan not in lifespans:
+                lifespans.append(pool.lifespan)
+            routes.append((func, args))
+
+        router = APIRouter(lifespan=merge_lifespans(lifespans))
+        lazy = getattr(cls, LAZY_ROUTES_KEY, False)
+        for func, args in routes:
+            if lazy and args.route_class_override is None:
+                endpoint = DeferredEndpoint(
+                    func, partial(RoutableMeta._build_endpoint, cls, func, args, controller)
+                )
+                setattr(endpoint, CBV_CLASS_KEY, cls)
+                router.add_api_route(
+                    endpoint=endpoint, **{**args.as_kwargs(), "route_class_override": LazyAPIRoute}
+                )
+                continue
 
-        for endpoint in functions:
-            # get the signature of the endpoint function
-            signature = inspect.signature(endpoint)
-            # get the parameters of the endpoint function
-            signature_parameters = list(signature.parameters.values())
+            endpoint, args = RoutableMeta._build_endpoint(cls, func, args, controller)
+            router.add_api_route(endpoint=endpoint, **args.as_kwargs())
+        return router
 
-            # replace the class instance with the itself FastApi Dependecy
-            signature_parameters[0] = signature_parameters[0].replace(
-                default=Depends(cls)
-            )
+    @staticmethod
+    def get_controller_dependency(cls: Type[type]) -> Tuple[Callable[..., Any], Optional[ControllerProvider]]:
+        """Получение зависимости FastAPI, создающей экземпляр контроллера, в соответствии с `LIFETIME`
 
-            # set self and after it the keyword args
-            new_parameters = [signature_parameters[0]] + [
-                parameter.replace(kind=inspect.Parameter.KEYWORD_ONLY)
-                for parameter in signature_parameters[1:]
-            ]
+        * `request` — новый экземпляр в каждом запросе: асинхронной фабрикой в цикле событий или, если
+          `INIT_IN_THREADPOOL` (по умолчанию — при собственном `__init__` контроллера), классом в пуле потоков;
+          `__ainit__` и `__aenter__`/`__aexit__` контроллера вызываются в каждом запросе;
+        * `app` — один экземпляр на процесс;
+        * `scoped` — один экземпляр на приложение FastAPI.
 
-            new_signature = signature.replace(parameters=new_parameters)
-            setattr(endpoint, SIGNATURE_KEY, new_signature)
+        Args:
+            cls: Тип класса, содержащий методы API
 
-            args = (
-                config_methods[endpoint.__name__]
-                if endpoint.__name__ in config_methods
-                else endpoint._endpoint.args
-            )
-            RoutableMeta.compute_tags_route(args, cls)
-            router.add_api_route(endpoint=endpoint, **dataclasses.asdict(args))
-        return router
+        Returns: Зависимость и хранилище экземпляров (None для `request`)
+        """
+        lifetime = getattr(cls, LIFETIME_KEY, LIFETIME_REQUEST)
+        if lifetime not in LIFETIMES:
+            raise ValueError(f"{cls.__name__}.{LIFETIME_KEY} must be one of {LIFETIMES}, got {lifetime!r}")
+        if lifetime == LIFETIME_REQUEST:
+            in_threadpool = getattr(cls, INIT_IN_THREADPOOL_KEY, None)
+            in_threadpool = bool(in_threadpool or (in_threadpool is None and has_custom_init(cls)))
+            if in_threadpool and not has_async_lifecycle(cls):
+                return cls, None
+            factories = cls.__dict__.get(CONTROLLER_FACTORY)
+            if factories is None:
+                factories = {}
+                type.__setattr__(cls, CONTROLLER_FACTORY, factories)
+            if in_threadpool not in factories:
+                factories[in_threadpool] = async_controller_factory(cls, in_threadpool)
+            return factories[in_threadpool], None
+
+        provider = cls.__dict__.get(CONTROLLER_PROVIDER)
+        if provider is None or provider.lifetime != lifetime:
+            provider = ControllerProvider(cls, lifetime)
+            type.__setattr__(cls, CONTROLLER_PROVIDER, provider)
+        return provider.dependency, provider
 
     @staticmethod
-    def init_generic_params(cls):
-        if not hasattr(cls, "__orig_bases__"):
-            return
-        bases = cls.__orig_bases__
-        generics = list(
-            filter(
-                lambda x: isinstance(x, typing._GenericAlias)
-                and getattr(x, "__origin__", None) in {typing.Generic},
-                bases,
-            )
-        )
-        if len(generics) != 0:
-            generic = generics[0]
+    def _router_cache_key(cls: Type[type]) -> Tuple[Any, ...]:
+        """Ключ кэша маршрутов: значения атрибутов класса, влияющих на пути и теги
 
-            generic_attrs = list(
-                map(
-                    lambda x: {"name": x.__name__, "type": None, "class": cls},
-                    generic.__args__,
-                )
-            )
-            setattr(cls, GENERIC_ATTRIBUTES, generic_attrs)
+        Args:
+            cls: Тип класса, содержащий методы API
 
-        generics = list(
-            filter(
-                lambda x: isinstance(x, typing._GenericAlias)
-                and getattr(x, "__origin__", None) not in {typing.Generic},
-                bases,
-            )
+        Returns: Кортеж значений атрибутов
+        """
+        return tuple(
+            tuple(value) if isinstance(value, list) else value
+            for value in (getattr(cls, attr, None) for attr in ROUTER_CACHE_ATTRIBUTES)
         )
-        for generic in generics:
-            generic_attrs = copy.deepcopy(
-                getattr(
-                    RoutableMeta.get_type_instance(
-                        cls,
-                        generic.__name__
-                        if hasattr(generic, "__name__")
-                        else generic.__origin__.__name__,
-                    ),
-                    GENERIC_ATTRIBUTES,
-                )
-            )
-            for i in range(len(generic_attrs)):
-                generic_attrs[i]["type"] = generic.__args__[i]
+
+    @staticmethod
+    def get_routes(cls: Type[type]) -> APIRouter:
+        """Получение маршрутов API из кэша класса
+
+        Маршрутизатор собирается один раз и пересобирается только при изменении атрибутов из
+        `ROUTER_CACHE_ATTRIBUTES` или после вызова `invalidate_routes`. Возвращается копия со своим
+        списком маршрутов, поэтому её изменение не затрагивает кэш.
+
+        Args:
+            cls: Тип класса, содержащий методы API
+
+        Returns: APIRouter
+        """
+        key = RoutableMeta._router_cache_key(cls)
+        cached = cls.__dict__.get(ROUTER_CACHE)
+        if cached is None or cached[0] != key:
+            cached = (key, RoutableMeta.get_router(cls))
+            type.__setattr__(cls, ROUTER_CACHE, cached)
+
+        router = copy.copy(cached[1])
+        router.routes = list(router.routes)
+        router.on_startup = list(router.on_startup)
+        router.on_shutdown = list(router.on_shutdown)
+        return router
+
+    @staticmethod
+    def invalidate_routes(cls: Type[type]) -> None:
+        """Сброс кэша маршрутов и фрагментов OpenAPI класса и всех унаследованных от него классов
+
+        Args:
+            cls: Тип класса, содержащий методы API
+        """
+        classes = [cls]
+        while classes:
+            class_ = classes.pop()
+            classes.extend(type.__subclasses__(class_))
+            for attr in (ROUTER_CACHE, OPENAPI_CACHE):
+                if attr in class_.__dict__:
+                    type.__delattr__(class_, attr)
+
+    @staticmethod
+    def _specialise_generic(origin: Type[Any], args: Tuple[Any, ...]) -> Optional[Tuple[List[dict], Dict[str, Any]]]:
+        """Параметры обобщённого контроллера `origin`, конкретизированного типами `args`
+
+        Результат кэшируется по `(origin, args)`: все классы, наследующие одну и ту же конкретизацию
+        (например, `BaseAPI[Category, CategoryPUT]`), используют одни и те же параметры.
+
+        Args:
+            origin: Обобщённый контроллер
+            args: Типы, подставляемые вместо его параметров
+
+        Returns: Параметры в формате `GENERIC_ATTRIBUTES` и словарь "название параметра -> тип"
+        (None, если `origin` не объявляет параметров)
+        """
+        specialisations = RoutableMeta.__specialisations__.get(origin)
+        if specialisations is None:
+            specialisations = RoutableMeta.__specialisations__.setdefault(origin, {})
+        if args in specialisations:
+            return specialisations[args]
+
+        origin_attrs = getattr(origin, GENERIC_ATTRIBUTES, None)
+        if origin_attrs is None:
+            return None
+        # Без ссылки на класс ("class"): значение словаря не должно удерживать свой слабый ключ
+        generic_attrs = [
+            {**{key: value for key, value in attr.items() if key != "class"}, "type": arg}
+            for attr, arg in zip(origin_attrs, args)
+        ]
+        specialisation = (generic_attrs, {attr["name"]: attr["type"] for attr in generic_attrs})
+        specialisations[args] = specialisation
+        return specialisation
+
+    @staticmethod
+    def init_generic_params(cls):
+        """Заполнение параметров обобщённого типа класса (`GENERIC_ATTRIBUTES` и `GENERIC_TYPES`)
+
+        Args:
+            cls: Тип класса
+        """
+        bases = cls.__dict__.get("__orig_bases__")
+        if not bases:
+            return
+        for generic in bases:
+            if getattr(generic, "__origin__", None) is not typing.Generic:
+                continue
+            generic_attrs = [{"name": x.__name__, "type": None, "class": cls} for x in generic.__args__]
             setattr(cls, GENERIC_ATTRIBUTES, generic_attrs)
+            setattr(cls, GENERIC_TYPES, dict.fromkeys(x.__name__ for x in generic.__args__))
+            break
 
-        print(bases)
+        for generic in bases:
+            origin = getattr(generic, "__origin__", None)
+            if origin is None or origin is typing.Generic or not isinstance(origin, type):
+                continue
+            specialisation = RoutableMeta._specialise_generic(origin, generic.__args__)
+            if specialisation is None:
+                continue
+            setattr(cls, GENERIC_ATTRIBUTES, [{**attr, "class": origin} for attr in specialisation[0]])
+            setattr(cls, GENERIC_TYPES, specialisation[1])
 
     def __new__(
         cls: Type[type], name: str, bases: Tuple[Type[Any]], attrs: Dict[str, Any]
     ) -> "RoutableMeta":
-        RoutableMeta.__new_instance__(cls, name, bases, attrs)
-        cls_ = RoutableMeta.get_type_instance(cls, name)
-        attrs[CLASS_TYPE] = cls_
-
-        if cls_ is not None:
-            methods = RoutableMeta.get_config_endpoints(bases, attrs)
-            setattr(cls_, API_METHODS, methods)
-            attrs[API_METHODS] = methods
-
-        attrs["routes"] = lambda: RoutableMeta.get_router(
-            RoutableMeta.get_type_instance(cls, name)
-        )
+        attrs[API_METHODS] = RoutableMeta.get_config_endpoints(bases, attrs)
+        if attrs.get(SLOTS_KEY, any(getattr(base, SLOTS_KEY, False) for base in bases)):
+            RoutableMeta._init_slots(bases, attrs)
 
-        # RoutableMeta.signature(cls, name, bases, attrs)
-        if cls_ is not None:
-            try:
-                prm = cls_.__parameters__[0]
-            except Exception:
-                pass
-            RoutableMeta.init_generic_params(cls_)
-            RoutableMeta._init_cbv(cls_)
+        klass = cast(RoutableMeta, type.__new__(cls, name, bases, attrs))
+        cls.__registry__.register(klass)
 
-        return cast(RoutableMeta, type.__new__(cls, name, bases, attrs))
+        RoutableMeta.init_generic_params(klass)
+        RoutableMeta._init_cbv(klass)
+        return klass
 
 
 class Routable(metaclass=RoutableMeta):
@@ -374,3 +592,55 @@ class Routable(metaclass=RoutableMeta):
     # Тегирование маршрутов API
     TAGS = None
     TAGGING = True
+
+    # Экземпляры без `__dict__`: атрибуты-зависимости хранятся в `__slots__`
+    SLOTS = False
+
+    # Время жизни экземпляра: "request" (на каждый запрос), "app" (один на процесс), "scoped" (один на приложение)
+    LIFETIME = "request"
+
+    # Создание экземпляра в пуле потоков (для блокирующего `__init__`). По умолчанию (None) — только если
+    # у контроллера есть собственный `__init__`; иначе экземпляр создаётся асинхронной фабрикой в цикле событий
+    INIT_IN_THREADPOOL = None
+
+    # Отложенная сборка маршрутов: метод API анализируется при первом подходящем запросе или построении OpenAPI
+    LAZY_ROUTES = False
+
+    # Хранилище кэша ответов методов с `cache=` (по умолчанию — `cache.get_default_backend()`)
+    CACHE_BACKEND = None
+
+    # Условные запросы GET: ETag по телу ответа и `304 Not Modified` (можно переопределить `etag=` метода API)
+    ETAG = False
+
+    # Сериализация ответов `TypeAdapter` модели ответа, подготовленным при сборке маршрутов, вместо
+    # `jsonable_encoder`; без проверки ответов (`VALIDATE_RESPONSES = False`) результат должен уже иметь тип модели
+    PRECOMPILE_SERIALIZERS = False
+    VALIDATE_RESPONSES = True
+
+    # Класс ответа по умолчанию для методов API (например, `responses.FastJSONResponse`); None — `JSONResponse`
+    RESPONSE_CLASS = None
+
+    # Отдельный пул синхронных методов API контроллера (`executors.ThreadPool` или `executors.ProcessPool`);
+    # None — общий пул потоков AnyIO. Метод API может задать свой пул (`executor=`)
+    EXECUTOR = None
+
+    # Ограничение одновременных вызовов методов API контроллера (None — без ограничения), очереди ожидания
+    # (None — без ограничения) и времени ожидания в ней (секунд). Лишние запросы получают `SHED_STATUS_CODE`
+    # (503 или 429) с `Retry-After`
+    MAX_CONCURRENCY = None
+    MAX_QUEUE = None
+    QUEUE_TIMEOUT = None
+    SHED_STATUS_CODE = 503
+    RETRY_AFTER = 1
+
+    __slots__ = ()
+
+    @classmethod
+    def routes(cls) -> APIRouter:
+        """Маршруты API контроллера (собираются один раз и кэшируются)."""
+        return RoutableMeta.get_routes(cls)
+
+    @classmethod
+    def invalidate_routes(cls) -> None:
+        """Сброс кэша маршрутов и фрагментов OpenAPI контроллера и его наследников."""
+        RoutableMeta.invalidate_routes(cls)
@@ -1,4 +1,5 @@
-from dataclasses import dataclass, field
+import sys
+from dataclasses import dataclass, field, fields
 from typing import (Any, Callable, Dict, List, Optional, Sequence, Set, Type,
                     Union)
 
@@ -11,13 +12,31 @@ from starlette.routing import Route
 SetIntStr = Set[Union[int, str]]
 DictIntStrAny = Dict[Union[int, str], Any]
 
+# `slots` is only supported by dataclasses on Python 3.10+
+_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
 
-@dataclass
+# Metadata key of the fields handled by class_based_fastapi itself rather than by FastAPI
+CONTROLLER_OPTION = 'controller_option'
+
+
+def controller_option(default: Any) -> Any:
+    """A RouteArgs field that is not passed to `APIRouter.add_api_route`."""
+    return field(default=default, metadata={CONTROLLER_OPTION: True})
+
+
+@dataclass(frozen=True, **_SLOTS)
 class RouteArgs:
     """The arguments APIRouter.add_api_route takes.
 
     Just a convenience for type safety and so we can pass all the args needed by the underlying FastAPI route args via
-    `**dataclasses.asdict(some_args)`.
+    `**some_args.as_kwargs()`.
+
+    Instances are immutable: derive a changed copy with `dataclasses.replace`, which shares every unchanged field
+    (response models, dependencies, responses, ...) with the original instead of copying it. This lets inherited
+    endpoints reuse the RouteArgs of their base class as is.
+
+    Fields declared with `controller_option` configure how the controller wraps the endpoint and are left out of
+    `as_kwargs`.
     """
     path: str
     response_model: Optional[Type[Any]] = None
@@ -45,10 +64,34 @@ class RouteArgs:
     route_class_override: Optional[Type[APIRoute]] = None
     callbacks: Optional[List[Route]] = None
     openapi_extra: Optional[Dict[str, Any]] = None
+    # Streaming response: True or "ndjson" for NDJSON, "json" for a chunked JSON array (see `streaming.Stream`)
+    stream: Union[bool, str] = controller_option(False)
+    # Response cache: True, TTL in seconds or `cache.CacheOptions`
+    cache: Any = controller_option(None)
+    # Coalesce concurrent identical requests: True or `singleflight.SingleFlightOptions`
+    singleflight: Any = controller_option(False)
+    # Conditional GET (ETag / 304): True, False or `conditional.ETag`; None uses the controller's `ETAG`
+    etag: Any = controller_option(None)
+    # Serialize with a TypeAdapter built at router build time; None uses the controller's `PRECOMPILE_SERIALIZERS`
+    precompile: Optional[bool] = controller_option(None)
+    # False skips validating the return value against the response model (implies `precompile`);
+    # None uses the controller's `VALIDATE_RESPONSES`
+    validate_response: Optional[bool] = controller_option(None)
+    # Run the method in a pool: "process", `executors.ThreadPool` or `executors.ProcessPool`;
+    # None uses the controller's `EXECUTOR`
+    executor: Any = controller_option(None)
 
     class Config:
         arbitrary_types_allowed = True
 
+    def as_kwargs(self) -> Dict[str, Any]:
+        """Shallow mapping of the fields, unlike `dataclasses.asdict` values are not copied."""
+        return {name: getattr(self, name) for name in _ROUTE_KWARGS}
+
+
+# Fields of RouteArgs passed to `APIRouter.add_api_route`
+_ROUTE_KWARGS = tuple(item.name for item in fields(RouteArgs) if not item.metadata.get(CONTROLLER_OPTION))
+
 
 @dataclass
 class EndpointDefinition:
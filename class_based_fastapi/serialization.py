@@ -0,0 +1,130 @@
+"""Сериализация результата метода API в ответ, как это делает FastAPI, но вне обработчика маршрута.
+
+Нужна обёрткам, которым требуется тело ответа до его отправки (кэш ответов, ETag), и методам API
+с заранее подготовленным сериализатором (`precompile=True`).
+"""
+import inspect
+from typing import Any, Callable, Dict, Optional
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.exceptions import ResponseValidationError
+from pydantic import TypeAdapter, ValidationError
+from pydantic.errors import PydanticSchemaGenerationError
+from starlette.responses import JSONResponse, Response
+
+from class_based_fastapi.defaults import PRECOMPILE_SERIALIZERS_KEY, RESPONSE_PARAMETER, VALIDATE_RESPONSES_KEY
+from class_based_fastapi.route_args import RouteArgs
+from class_based_fastapi.wrappers import (
+    call_endpoint, is_streaming_route, merge_sub_response, response_class_of, special_parameter, wrap_endpoint
+)
+
+
+def _response_adapter(response_model: Any) -> Optional[TypeAdapter]:
+    if response_model is None or response_model is inspect.Signature.empty or response_model is Any:
+        return None
+    if inspect.isclass(response_model) and issubclass(response_model, Response):
+        return None
+    try:
+        return TypeAdapter(response_model)
+    except PydanticSchemaGenerationError:
+        return None
+
+
+def _dump_args(args: RouteArgs) -> Dict[str, Any]:
+    """Аргументы сериализации (`dump_python`, `dump_json`) по параметрам `response_model_*` маршрута."""
+    return dict(
+        include=args.response_model_include,
+        exclude=args.response_model_exclude,
+        by_alias=args.response_model_by_alias,
+        exclude_unset=args.response_model_exclude_unset,
+        exclude_defaults=args.response_model_exclude_defaults,
+        exclude_none=args.response_model_exclude_none,
+    )
+
+
+def _validate_result(adapter: TypeAdapter, result: Any) -> Any:
+    """Проверка результата метода API моделью ответа; ошибка — как у FastAPI (`ResponseValidationError`)."""
+    try:
+        return adapter.validate_python(result, from_attributes=True)
+    except ValidationError as error:
+        raise ResponseValidationError(errors=error.errors(include_url=False), body=result) from error
+
+
+class PreSerializedJSONResponse(JSONResponse):
+    """JSON-ответ, тело которого может быть уже сериализовано в байты (`TypeAdapter.dump_json`)."""
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, bytes):
+            return content
+        return super().render(content)
+
+
+def response_renderer(args: RouteArgs, validate: bool = True) -> Callable[[Any], Response]:
+    """Функция, формирующая ответ из результата метода API по аргументам его маршрута
+
+    Результат проверяется моделью ответа (`TypeAdapter`) и сериализуется с учётом `response_model_include`,
+    `response_model_exclude`, `response_model_by_alias` и `response_model_exclude_*`; ответ создаётся классом
+    `response_class` с кодом `status_code`. Для `JSONResponse` результат сериализуется сразу в байты
+    (`dump_json`), минуя `jsonable_encoder` и `json.dumps`. Объекты `Response` возвращаются без изменений.
+
+    Args:
+        args: Аргументы маршрута метода API
+        validate: Проверять результат моделью ответа. Без проверки результат должен уже иметь тип модели ответа
+            (например, быть экземпляром модели pydantic), иначе pydantic сериализует его с предупреждением
+
+    Returns: Функция `render(result) -> Response`
+    """
+    response_class = response_class_of(args)
+    status_args = {'status_code': args.status_code} if args.status_code else {}
+    adapter = _response_adapter(args.response_model)
+    dump_args = _dump_args(args)
+    if response_class is JSONResponse and adapter is not None:
+        response_class = PreSerializedJSONResponse
+    # Класс ответа принимает тело в байтах (в том числе `responses.FastJSONResponse`)
+    json_bytes = adapter is not None and issubclass(response_class, PreSerializedJSONResponse)
+
+    def render(result: Any) -> Response:
+        if isinstance(result, Response):
+            return result
+        if adapter is None:
+            return response_class(jsonable_encoder(result), **status_args)
+        if validate:
+            result = _validate_result(adapter, result)
+        if json_bytes:
+            return response_class(adapter.dump_json(result, **dump_args), **status_args)
+        return response_class(adapter.dump_python(result, mode='json', **dump_args), **status_args)
+
+    return render
+
+
+def serializer_endpoint(cls: type, endpoint: Callable[..., Any], args: RouteArgs) -> Callable[..., Any]:
+    """Обёртка метода API, сериализующая результат заранее подготовленным `TypeAdapter` модели ответа
+    (если задан `precompile=True`, `validate_response=False` или `PRECOMPILE_SERIALIZERS` контроллера)
+
+    Сериализатор создаётся один раз при сборке маршрутов. Заголовки, cookie и код ответа, заданные через параметр
+    `response: Response` метода API, переносятся в сформированный ответ, как это делает FastAPI.
+
+    Args:
+        cls: Класс контроллера
+        endpoint: Метод API
+        args: Аргументы маршрута метода API
+
+    Returns: Метод API
+    """
+    validate = getattr(cls, VALIDATE_RESPONSES_KEY, True) if args.validate_response is None else args.validate_response
+    precompile = getattr(cls, PRECOMPILE_SERIALIZERS_KEY, False) if args.precompile is None else args.precompile
+    if (validate and not precompile) or _response_adapter(args.response_model) is None:
+        return endpoint
+    if is_streaming_route(args):
+        return endpoint
+    render = response_renderer(args, validate=validate)
+    response_parameter, hidden_response = special_parameter(endpoint, Response, RESPONSE_PARAMETER)
+
+    async def serialized(**kwargs: Any) -> Response:
+        sub_response = kwargs.pop(response_parameter) if hidden_response else kwargs[response_parameter]
+        result = await call_endpoint(endpoint, kwargs)
+        if isinstance(result, Response):
+            return result
+        return merge_sub_response(render(result), sub_response)
+
+    return wrap_endpoint(endpoint, serialized, with_response=True)
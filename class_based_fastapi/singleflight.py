@@ -0,0 +1,106 @@
+"""Объединение одновременных одинаковых запросов (single-flight).
+
+    class CatalogueAPI(Routable):
+        @get('items', singleflight=True, cache=60)
+        async def items(self, category: str) -> List[Item]:
+            ...
+
+Пока метод API выполняется для запроса с некоторым ключом (класс контроллера, метод HTTP, путь и параметры
+запроса), остальные запросы с тем же ключом не вызывают метод API, а ожидают и получают его результат
+(или исключение). Результат должен зависеть только от ключа: параметры и зависимости ожидающих запросов
+не используются. Поэтому объединяются только GET и HEAD (тело запроса в ключ не входит) и только ответы, сформированные
+целиком (не потоковые). Подходит, например, в паре с `cache=` при истечении записи кэша.
+"""
+import asyncio
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional, Tuple, Union
+
+from starlette.requests import Request
+from starlette.responses import Response
+
+from class_based_fastapi.defaults import REQUEST_PARAMETER
+from class_based_fastapi.route_args import RouteArgs
+from class_based_fastapi.wrappers import (
+    call_endpoint,
+    is_streaming_route,
+    request_key,
+    require_safe_methods,
+    special_parameter,
+    wrap_endpoint,
+)
+
+
+@dataclass(frozen=True)
+class SingleFlightOptions:
+    """Параметры объединения запросов
+
+    Args:
+        key: Функция `key(request) -> str`, заменяющая путь и параметры запроса в ключе
+        headers: Заголовки запроса, значения которых входят в ключ
+    """
+    key: Optional[Callable[[Request], str]] = None
+    headers: Tuple[str, ...] = ()
+
+    @classmethod
+    def create(cls, value: Union[bool, 'SingleFlightOptions', None]) -> Optional['SingleFlightOptions']:
+        """Параметры из значения `singleflight=` декоратора метода API: True или `SingleFlightOptions`."""
+        if not value:
+            return None
+        if isinstance(value, SingleFlightOptions):
+            return value
+        return cls()
+
+
+def _share(result: Any) -> Any:
+    """Результат для ожидающего запроса: объект ответа нельзя отправить дважды, поэтому он копируется."""
+    if not isinstance(result, Response):
+        return result
+    if getattr(result, 'body', None) is None:
+        raise RuntimeError('singleflight endpoints cannot return streaming responses')
+    response = Response(result.body, status_code=result.status_code)
+    response.raw_headers = list(result.raw_headers)
+    return response
+
+
+def singleflight_endpoint(cls: type, endpoint: Callable[..., Any], args: RouteArgs) -> Callable[..., Any]:
+    """Обёртка метода API, объединяющая одновременные запросы с одинаковым ключом (если задан `singleflight=`)
+
+    Метод API выполняется отдельной задачей: отмена запроса, который её запустил (например, разрыв соединения),
+    не прерывает ожидающие запросы. Обычная функция выполняется в пуле потоков, как и без обёртки.
+
+    Args:
+        cls: Класс контроллера
+        endpoint: Метод API
+        args: Аргументы маршрута метода API
+
+    Returns: Метод API
+    """
+    options = SingleFlightOptions.create(args.singleflight)
+    if options is None:
+        return endpoint
+    require_safe_methods(cls, endpoint, args, 'singleflight')
+    if is_streaming_route(args):
+        raise ValueError(f'{cls.__name__}.{endpoint.__name__}: singleflight cannot be combined with a streamed response')
+    request_parameter, hidden_request = special_parameter(endpoint, Request, REQUEST_PARAMETER)
+    flights: Dict[str, 'asyncio.Future[Any]'] = {}
+
+    def forget(key: str, task: 'asyncio.Future[Any]') -> None:
+        if flights.get(key) is task:
+            del flights[key]
+        # Исключение помечается полученным, даже если все запросы были отменены
+        if not task.cancelled():
+            task.exception()
+
+    async def singleflight(**kwargs: Any) -> Any:
+        request = kwargs.pop(request_parameter) if hidden_request else kwargs[request_parameter]
+        key = request_key(cls, request, options.key, options.headers)
+        task = flights.get(key)
+        if task is not None and task.get_loop() is asyncio.get_running_loop():
+            return _share(await asyncio.shield(task))
+
+        task = asyncio.ensure_future(call_endpoint(endpoint, kwargs))
+        flights[key] = task
+        task.add_done_callback(lambda done: forget(key, done))
+        return await asyncio.shield(task)
+
+    return wrap_endpoint(endpoint, singleflight, with_request=True)
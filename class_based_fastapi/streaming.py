@@ -0,0 +1,319 @@
+"""Потоковые ответы методов API: элементы сериализуются и отправляются по мере получения от генератора."""
+import collections.abc
+import dataclasses
+import functools
+import inspect
+import json
+import time
+from contextlib import AsyncExitStack, asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from typing import Any, AsyncIterator, Callable, Dict, Generic, Iterator, List, Optional, Tuple, TypeVar
+
+from fastapi.concurrency import contextmanager_in_threadpool
+from fastapi.dependencies.utils import get_typed_signature, is_async_gen_callable, is_gen_callable
+from fastapi.encoders import jsonable_encoder
+from fastapi.routing import APIRoute
+from pydantic import TypeAdapter
+from starlette.concurrency import run_in_threadpool
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response, StreamingResponse
+from starlette.types import Receive, Scope, Send
+from typing_extensions import get_args, get_origin
+
+from class_based_fastapi.defaults import SIGNATURE_KEY
+from class_based_fastapi.route_args import RouteArgs
+
+T = TypeVar('T')
+
+STREAM_NDJSON = 'ndjson'
+STREAM_JSON = 'json'
+STREAM_FORMATS = (STREAM_NDJSON, STREAM_JSON)
+
+# Размер буфера (байт), после заполнения которого сериализованные элементы отправляются клиенту
+STREAM_CHUNK_SIZE = 64 * 1024
+# Элементы обычного генератора получаются в пуле потоков пачками: не более STREAM_BATCH_SIZE элементов
+# и не дольше STREAM_BATCH_TIMEOUT секунд на пачку
+STREAM_BATCH_SIZE = 256
+STREAM_BATCH_TIMEOUT = 0.05
+
+# Аннотации, из которых извлекается тип элемента потока при `stream=True`
+_ITERABLE_ORIGINS = {
+    list,
+    collections.abc.AsyncIterator,
+    collections.abc.AsyncIterable,
+    collections.abc.AsyncGenerator,
+    collections.abc.Iterator,
+    collections.abc.Iterable,
+    collections.abc.Generator,
+}
+
+
+class Stream(Generic[T]):
+    """Аннотация возвращаемого значения потокового метода API.
+
+    Метод API — асинхронный или обычный генератор (либо функция, возвращающая итерируемый объект) элементов `T`:
+
+        @get('export')
+        async def export(self) -> Stream[Item]:
+            async for item in self.repository.iterate():
+                yield item
+
+    В схеме OpenAPI ответ описывается как `List[T]`.
+    """
+
+
+class ItemsStreamingResponse(StreamingResponse, JSONResponse):
+    """Потоковый ответ метода API, возвращающего `Stream[T]`.
+
+    Наследование от `JSONResponse` нужно только для OpenAPI: FastAPI описывает схему модели ответа лишь для
+    JSON-ответов. Ответ формируется `StreamingResponse`. Зависимости с `yield` маршрута (`StreamingAPIRoute`)
+    закрываются после отправки тела.
+    """
+
+    exit_stack: Optional[AsyncExitStack] = None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if self.exit_stack is None:
+            await super().__call__(scope, receive, send)
+            return
+        async with self.exit_stack:
+            await super().__call__(scope, receive, send)
+
+
+class NDJSONStreamingResponse(ItemsStreamingResponse):
+    """Поток JSON-объектов, по одному в строке (NDJSON)."""
+
+    media_type = 'application/x-ndjson'
+
+
+class JSONArrayStreamingResponse(ItemsStreamingResponse):
+    """Массив JSON, отправляемый по частям (см. `NDJSONStreamingResponse`)."""
+
+    media_type = 'application/json'
+
+
+# Стек зависимостей с `yield` текущего запроса потокового маршрута
+_dependency_stack: ContextVar[AsyncExitStack] = ContextVar('class_based_fastapi_stream_dependencies')
+
+
+def _stream_scoped(call: Callable[..., Any]) -> Callable[..., Any]:
+    """Зависимость с `yield`, которая входит в стек потокового ответа, а не в стек обработчика FastAPI."""
+
+    async def enter(**kwargs: Any) -> Any:
+        if is_gen_callable(call):
+            manager = contextmanager_in_threadpool(contextmanager(call)(**kwargs))
+        else:
+            manager = asynccontextmanager(call)(**kwargs)
+        return await _dependency_stack.get().enter_async_context(manager)
+
+    enter.__signature__ = get_typed_signature(call)  # type: ignore[attr-defined]
+    return enter
+
+
+class _StreamScopedDependencies:
+    """`dependency_overrides_provider` потокового маршрута
+
+    FastAPI ищет каждую зависимость в `dependency_overrides`: подмены приложения применяются как обычно,
+    а зависимости с `yield` заменяются обёртками `_stream_scoped`.
+    """
+
+    def __init__(self, provider: Any) -> None:
+        self.provider = provider
+        self._scoped: Dict[Any, Callable[..., Any]] = {}
+
+    @property
+    def dependency_overrides(self) -> '_StreamScopedDependencies':
+        return self
+
+    def get(self, call: Any, default: Any = None) -> Any:
+        call = (getattr(self.provider, 'dependency_overrides', None) or {}).get(call, call)
+        if not (is_gen_callable(call) or is_async_gen_callable(call)):
+            return call
+        if call not in self._scoped:
+            self._scoped[call] = _stream_scoped(call)
+        return self._scoped[call]
+
+
+async def _handle_in_stream_scope(handler: Callable[[Request], Any], request: Request) -> Response:
+    """Обработка запроса потокового маршрута: стек зависимостей с `yield` передаётся потоковому ответу."""
+    stack = AsyncExitStack()
+    token = _dependency_stack.set(stack)
+    try:
+        response = await handler(request)
+    except BaseException as error:
+        await stack.__aexit__(type(error), error, error.__traceback__)
+        raise
+    finally:
+        _dependency_stack.reset(token)
+    if isinstance(response, ItemsStreamingResponse) and response.exit_stack is None:
+        response.exit_stack = stack
+    else:
+        await stack.aclose()
+    return response
+
+
+class StreamingAPIRoute(APIRoute):
+    """Маршрут потокового метода API (`ItemsStreamingResponse`).
+
+    FastAPI закрывает зависимости с `yield` (в том числе `__aexit__` контроллера) до отправки тела потокового
+    ответа. В этом маршруте они входят в стек, который закрывает сам ответ после отправки последнего элемента,
+    поэтому генератор метода API может читать из сессии контроллера.
+    """
+
+    def get_route_handler(self) -> Callable[[Request], Any]:
+        response_class = self.response_class
+        if not (inspect.isclass(response_class) and issubclass(response_class, ItemsStreamingResponse)):
+            return super().get_route_handler()
+        provider = self.dependency_overrides_provider
+        self.dependency_overrides_provider = _StreamScopedDependencies(provider)
+        try:
+            return functools.partial(_handle_in_stream_scope, super().get_route_handler())
+        finally:
+            self.dependency_overrides_provider = provider
+
+
+def get_stream_item_type(annotation: Any, stream: Any) -> Tuple[Optional[str], Any]:
+    """Формат потока и тип элемента метода API
+
+    Args:
+        annotation: Аннотация возвращаемого значения (после подстановки обобщённых типов)
+        stream: Значение `stream` декоратора метода
+
+    Returns: Формат (None, если ответ не потоковый) и тип элемента
+    """
+    origin = get_origin(annotation)
+    if stream is False and origin is not Stream:
+        return None, None
+    fmt = STREAM_NDJSON if stream in (True, False) else stream
+    if fmt not in STREAM_FORMATS:
+        raise ValueError(f'stream must be True or one of {STREAM_FORMATS}, got {stream!r}')
+
+    item_type = Any
+    if origin is Stream or origin in _ITERABLE_ORIGINS:
+        item_type = (get_args(annotation) or (Any,))[0]
+    return fmt, item_type
+
+
+def _item_serializer(item_type: Any) -> Callable[[Any], bytes]:
+    if item_type is Any or item_type is inspect.Signature.empty:
+        return lambda item: json.dumps(jsonable_encoder(item), separators=(',', ':')).encode()
+    adapter = TypeAdapter(item_type)
+    return lambda item: adapter.dump_json(adapter.validate_python(item, from_attributes=True))
+
+
+def _next_batch(iterator: Iterator[Any]) -> Tuple[List[Any], Optional[Exception]]:
+    """Очередная пачка элементов обычного итератора (вызывается в пуле потоков)
+
+    Пачка завершается после `STREAM_BATCH_SIZE` элементов или `STREAM_BATCH_TIMEOUT` секунд, чтобы медленный
+    генератор не задерживал отправку уже полученных элементов. Исключение генератора возвращается вместе
+    с элементами, полученными до него.
+    """
+    batch: List[Any] = []
+    deadline = time.monotonic() + STREAM_BATCH_TIMEOUT
+    try:
+        for item in iterator:
+            batch.append(item)
+            if len(batch) >= STREAM_BATCH_SIZE or time.monotonic() >= deadline:
+                break
+    except Exception as error:
+        return batch, error
+    return batch, None
+
+
+async def _iterate_sync(iterator: Iterator[Any]) -> AsyncIterator[Any]:
+    """Элементы обычного итератора, получаемые в пуле потоков пачками (`_next_batch`)."""
+    while True:
+        batch, error = await run_in_threadpool(_next_batch, iterator)
+        for item in batch:
+            yield item
+        if error is not None:
+            raise error
+        if not batch:
+            break
+
+
+async def _iterate(result: Any) -> AsyncIterator[Any]:
+    if inspect.isawaitable(result):
+        result = await result
+    if hasattr(result, '__aiter__'):
+        items = result
+    elif isinstance(result, (list, tuple)):
+        # Элементы уже в памяти: переход в пул потоков не нужен
+        for item in result:
+            yield item
+        return
+    else:
+        # Обычный генератор может блокировать: элементы получаются в пуле потоков
+        items = _iterate_sync(iter(result))
+    async for item in items:
+        yield item
+
+
+async def _encode(items: AsyncIterator[Any], serialize: Callable[[Any], bytes], fmt: str) -> AsyncIterator[bytes]:
+    array = fmt == STREAM_JSON
+    separator = b',' if array else b'\n'
+    buffer = bytearray(b'[' if array else b'')
+    first = True
+    async for item in items:
+        if array and not first:
+            buffer += separator
+        buffer += serialize(item)
+        if not array:
+            buffer += separator
+        first = False
+        if len(buffer) >= STREAM_CHUNK_SIZE:
+            yield bytes(buffer)
+            buffer.clear()
+    if array:
+        buffer += b']'
+    if buffer:
+        yield bytes(buffer)
+
+
+def stream_endpoint(endpoint: Callable[..., Any], args: RouteArgs) -> Tuple[Callable[..., Any], RouteArgs]:
+    """Преобразование метода API, возвращающего `Stream[T]` (или отмеченного `stream=...`), в потоковый
+
+    Метод API оборачивается функцией, возвращающей `StreamingResponse`; элементы проверяются и сериализуются
+    моделью `T` по одному и отправляются частями по `STREAM_CHUNK_SIZE` байт. Модель ответа для OpenAPI —
+    `List[T]`, класс ответа — `NDJSONStreamingResponse` или `JSONArrayStreamingResponse`, класс маршрута —
+    `StreamingAPIRoute` (если не задан `route_class_override`).
+
+    Args:
+        endpoint: Метод API (с сигнатурой для FastAPI)
+        args: Аргументы маршрута метода API
+
+    Returns: Метод API и аргументы его маршрута (без изменений, если ответ не потоковый)
+    """
+    signature = getattr(endpoint, SIGNATURE_KEY)
+    fmt, item_type = get_stream_item_type(signature.return_annotation, args.stream)
+    if fmt is None:
+        return endpoint, args
+
+    response_class = NDJSONStreamingResponse if fmt == STREAM_NDJSON else JSONArrayStreamingResponse
+    serialize = _item_serializer(item_type)
+    status_code = args.status_code or 200
+    # Обычная функция, возвращающая список или итератор, может блокировать и вызывается в пуле потоков
+    call_in_threadpool = not any(
+        check(endpoint) for check in (inspect.isgeneratorfunction, inspect.isasyncgenfunction, inspect.iscoroutinefunction)
+    )
+
+    @functools.wraps(endpoint)
+    async def streaming_endpoint(*positional: Any, **kwargs: Any) -> StreamingResponse:
+        if call_in_threadpool:
+            result = await run_in_threadpool(endpoint, *positional, **kwargs)
+        else:
+            result = endpoint(*positional, **kwargs)
+        return response_class(_encode(_iterate(result), serialize, fmt), status_code=status_code)
+
+    del streaming_endpoint.__wrapped__
+    streaming_endpoint.__signature__ = signature.replace(return_annotation=List[item_type])
+
+    response_model = args.response_model
+    if response_model is None or get_origin(response_model) is Stream or response_model is signature.return_annotation:
+        response_model = List[item_type]
+    return streaming_endpoint, dataclasses.replace(
+        args,
+        response_model=response_model,
+        response_class=response_class,
+        route_class_override=args.route_class_override or StreamingAPIRoute,
+    )
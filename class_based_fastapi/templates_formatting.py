@@ -1,8 +1,16 @@
-from typing import Dict, Any, Type, Tuple
+import re
+from functools import lru_cache
+from typing import Dict, Tuple
 
 from class_based_fastapi.utilities import snake_case
 
+# Максимальный размер кэшей наименований и скомпилированных шаблонов
+TEMPLATE_CACHE_SIZE = 4096
 
+_PATH_PARAMETER = re.compile(r'\{(module|controller|version|user_path)\}')
+
+
+@lru_cache(maxsize=TEMPLATE_CACHE_SIZE)
 def _rest_api_naming(name: str) -> str:
     """Преобразование наименования API
 
@@ -14,88 +22,75 @@ def _rest_api_naming(name: str) -> str:
     return snake_case(name).replace('_', '-')
 
 
-def replace_parameter_template(endpoint: Dict[str, Any], mask_parameter: str, old_value: str, new_value: str) -> None:
-
-    template_path = endpoint.args.template_path
-    indx_mask = template_path.find(mask_parameter)
-    if indx_mask == -1:
-        return
-
-    if indx_mask + len(mask_parameter) < len(template_path):
-        mask = f'{template_path[indx_mask - 1]}{old_value}{template_path[indx_mask + len(mask_parameter)]}'
-        new_mask = f'{template_path[indx_mask - 1]}{new_value}{template_path[indx_mask + len(mask_parameter)]}'
-    else:
-        mask = f'{template_path[indx_mask - 1]}{old_value}'
-        new_mask = f'{template_path[indx_mask - 1]}{new_value}'
-
-    endpoint.args.path = endpoint.args.path.replace(mask, new_mask)
-
-
-def _replace_child_name_controller(endpoint: Dict[str, Any],
-                                   name: str,
-                                   base: Type[Any],
-                                   attrs: Dict[str, Any]) -> None:
-    """Замена унаследованного названия контроллера
+@lru_cache(maxsize=TEMPLATE_CACHE_SIZE)
+def compile_path_template(template: str) -> Tuple[str, ...]:
+    """Разбор шаблона пути на сегменты
 
     Args:
-        endpoint: Информация о методе
-        name: Название текущего класса (контроллера)
-        base: Тип унаследованного класса
-    """
-    old_name = _rest_api_naming(base.__name__)
-    new_name = _rest_api_naming(name)
+        template: Шаблон пути, например `/{module}/{controller}/v{version}/{user_path}`
 
-    replace_parameter_template(endpoint, '{controller}', old_name, new_name)
+    Returns: Сегменты шаблона: на чётных позициях текст, на нечётных названия параметров
+    (`module`, `controller`, `version`, `user_path`)
+    """
+    return tuple(_PATH_PARAMETER.split(template))
 
 
-def _replace_child_name_module(endpoint: Dict[str, Any],
-                               name: str,
-                               base: Type[Any],
-                               attrs: Dict[str, Any]) -> None:
-    """Замена унаследованного названия контроллера
+def render_path_template(segments: Tuple[str, ...], values: Dict[str, str]) -> str:
+    """Подстановка значений в скомпилированный шаблон
 
     Args:
-        endpoint: Информация о методе
-        name: Название текущего класса (контроллера)
-        base: Тип унаследованного класса
-    """
-    new_name = attrs.get('NAME_MODULE')
-    if new_name is None:
-        return
-    old_name = endpoint.args.name_module
+        segments: Сегменты шаблона (`compile_path_template`)
+        values: Значения параметров; параметры без значения остаются в пути без изменений
 
-    replace_parameter_template(endpoint, '{module}', old_name, _rest_api_naming(new_name))
+    Returns: Путь
+    """
+    parts = list(segments)
+    for i in range(1, len(parts), 2):
+        name = parts[i]
+        parts[i] = values[name] if name in values else f'{{{name}}}'
+    return ''.join(parts)
 
 
-def _replace_child_varsion_api(endpoint: Dict[str, Any],
-                               name: str,
-                               base: Type[Any],
-                               attrs: Dict[str, Any]) -> None:
-    """Замена унаследованного названия контроллера
+@lru_cache(maxsize=TEMPLATE_CACHE_SIZE)
+def compile_route_template(base_template: str, user_path: str, with_module: bool) -> Tuple[str, ...]:
+    """Компиляция шаблона пути метода API
 
     Args:
-        endpoint: Информация о методе
-        name: Название текущего класса (контроллера)
-        base: Тип унаследованного класса
+        base_template: Базовый шаблон контроллера (`BASE_TEMPLATE_PATH`)
+        user_path: Путь, указанный в декораторе метода (абсолютный путь заменяет базовый шаблон)
+        with_module: Задано ли название модуля; если нет, сегмент `/{module}` удаляется
 
+    Returns: Сегменты шаблона
     """
-    new_name = attrs.get('VERSION_API')
-    if new_name is None:
-        return
-    old_name = endpoint.args.varsion_api
-
-    replace_parameter_template(endpoint, '{version}', old_name, _rest_api_naming(new_name))
+    if user_path.startswith('/'):
+        template = user_path
+    else:
+        template = render_path_template(compile_path_template(base_template), {'user_path': user_path})
+    if not with_module:
+        template = template.replace('/{module}', '')
+    if template.endswith('/'):
+        template = template[:-1]
+    return compile_path_template(template)
 
 
-def _processing_child_paths(endpoints: Dict[str, Any],
-                            name: str,
-                            bases: Tuple[Type[Any]],
-                            attrs: Dict[str, Any]) -> Dict[str, Any]:
-    for base in bases:
-        for endpoint in endpoints.values():
+def format_route_path(base_template: str, user_path: str, name_module: str, version_api: str, controller: str) -> str:
+    """Формирование пути метода API
 
-            _replace_child_name_controller(endpoint, name, base, attrs)
-            _replace_child_name_module(endpoint, name, base, attrs)
-            _replace_child_varsion_api(endpoint, name, base, attrs)
+    Args:
+        base_template: Базовый шаблон контроллера (`BASE_TEMPLATE_PATH`)
+        user_path: Путь, указанный в декораторе метода
+        name_module: Название модуля (`NAME_MODULE`)
+        version_api: Версия API (`VERSION_API`)
+        controller: Название контроллера (класса)
 
-    return endpoints
+    Returns: Путь метода API
+    """
+    segments = compile_route_template(base_template, user_path, bool(name_module))
+    return render_path_template(
+        segments,
+        {
+            'module': _rest_api_naming(name_module or ''),
+            'version': version_api.lower(),
+            'controller': _rest_api_naming(controller),
+        },
+    )
@@ -1,12 +1,12 @@
-import copy
 import inspect
 import re
 import types
+import weakref
 from functools import partial
-from typing import List, TypeVar, Union
+from typing import Any, Callable, Dict, List, Tuple, TypeVar, Union
 
-from class_based_fastapi.defaults import GENERIC_ATTRIBUTES
-from class_based_fastapi.route_args import RouteArgs
+from class_based_fastapi.defaults import GENERIC_ATTRIBUTES, GENERIC_TYPES
+from class_based_fastapi.generics import substitute_type
 
 _snake_1 = partial(re.compile(r'(.)((?<![^A-Za-z])[A-Z][a-z]+)').sub, r'\1$*-$%\2')
 _snake_2 = partial(re.compile(r'([a-z0-9])([A-Z])').sub, r'\1$*-$%\2')
@@ -29,58 +29,82 @@ def find_type_from_getneric(name_param: str, generics: List[dict], raise_excepti
     return type_from_generic[0]
 
 
-def _get_response_type(annotation: type, attrs: List[dict]) -> type:
-    if isinstance(annotation, TypeVar):
-        # type_from_generic = list(filter(lambda x: x['name'] == annotation.__name__, attrs))
-        # if len(type_from_generic) > 1 or len(type_from_generic) == 0:
-        #     raise Exception
-        type_from_generic = find_type_from_getneric(annotation.__name__, attrs)
-        if type_from_generic['type'] is not None:
-            annotation = type_from_generic['type']
-    elif hasattr(annotation, '__origin__'):
-        params = []
-        for arg in annotation.__args__:
-            type_from_generic = find_type_from_getneric(arg.__name__, attrs, raise_exception=False)
-            if type_from_generic is not None and type_from_generic['type'] is not None:
-                params.append(type_from_generic['type'])
-            else:
-                params.append(arg)
+def _get_response_type(annotation: type, generic_types: Dict[str, Any]) -> type:
+    """Подстановка типов параметров обобщённого класса в аннотацию (`substitute_type`)
 
-        annotation = annotation.__origin__[tuple(params)]
+    Args:
+        annotation: Аннотация параметра или возвращаемого значения
+        generic_types: Типы параметров обобщённого класса (`GENERIC_TYPES`)
 
-    return annotation
+    Returns: Аннотация с подставленными типами
+    """
+    if isinstance(annotation, TypeVar) and annotation.__name__ not in generic_types:
+        raise Exception('Found -> 0 <- generic params')
+    return substitute_type(annotation, generic_types)
 
 
-def deepcopy_func(f, args: RouteArgs, cls, name=None):
+# Сигнатуры методов API с подставленными типами: метод -> {типы параметров класса: сигнатура}
+_SIGNATURES: 'weakref.WeakKeyDictionary[Callable[..., Any], Dict[Tuple[Any, ...], inspect.Signature]]' = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def get_generic_types(cls) -> Dict[str, Any]:
+    """Типы параметров обобщённого класса: название параметра -> тип (None, если тип не задан)."""
+    generic_types = getattr(cls, GENERIC_TYPES, None)
+    if generic_types is None:
+        generic_types = {attr['name']: attr['type'] for attr in getattr(cls, GENERIC_ATTRIBUTES, [])}
+    return generic_types
+
+
+def get_route_generic_types(cls) -> Dict[str, Any]:
+    """Типы для подстановки в сигнатуры методов API: типы параметров обобщённого класса и типы, которые класс
+    выводит из них сам (`route_generic_types()`, например тип первичного ключа модели в `CrudRoutable`)."""
+    generic_types = get_generic_types(cls)
+    derived = getattr(cls, 'route_generic_types', None)
+    return generic_types if derived is None else {**generic_types, **derived()}
+
+
+def resolve_signature(f: Callable[..., Any], generic_types: Dict[str, Any]) -> inspect.Signature:
+    """Сигнатура функции с подставленными типами параметров обобщённого класса
+
+    Результат кэшируется для каждой пары (функция, типы параметров), поэтому одна и та же конкретизация
+    обобщённого контроллера не анализируется повторно.
+
+    Args:
+        f: Функция
+        generic_types: Типы параметров обобщённого класса (`GENERIC_TYPES`)
+
+    Returns: Сигнатура
+    """
+    signatures = _SIGNATURES.get(f)
+    if signatures is None:
+        signatures = _SIGNATURES.setdefault(f, {})
+    key = tuple(generic_types.items())
+    try:
+        signature = signatures.get(key)
+    except TypeError:  # нехэшируемые аннотации, например `Annotated[T, {...}]`
+        signatures, key, signature = {}, None, None
+    if signature is None:
+        signature = inspect.signature(f)
+        signature = signature.replace(
+            parameters=[
+                parameter.replace(annotation=_get_response_type(parameter.annotation, generic_types))
+                for parameter in signature.parameters.values()
+            ],
+            return_annotation=_get_response_type(signature.return_annotation, generic_types),
+        )
+        signatures[key] = signature
+    return signature
+
+
+def deepcopy_func(f, cls, name=None):
     clone_func = types.FunctionType(
         f.__code__, f.__globals__, name or f.__name__,
         f.__defaults__, f.__closure__
     )
-    new_signature = inspect.signature(clone_func)
-    old_signature = inspect.signature(f)
-    generics = getattr(cls, GENERIC_ATTRIBUTES, [])
-    params = dict(old_signature.parameters.items())
-    for name_param, param in new_signature.parameters.items():
-        if name_param in params:
-            annotation = _get_response_type(params[name_param].annotation, generics)
-            # if isinstance(annotation, TypeVar):
-            #     type_from_generic = list(filter(lambda x: x['name'] == annotation.__name__, generics))
-            #     if len(type_from_generic) > 1 or len(type_from_generic) == 0:
-            #         raise Exception
-            #     annotation = type_from_generic[0]['type']
-
-            params[name_param] = new_signature.parameters[name_param].replace(annotation=annotation)
-
-    new_signature = new_signature.replace(
-        parameters=params.values(),
-        return_annotation=_get_response_type(old_signature.return_annotation, generics)
-    )
-    setattr(clone_func, '__signature__', new_signature)
-
-    if args.response_model is None:
-        args.response_model = new_signature.return_annotation
-    # inspect.signature(f).parameters['model'].annotation = 123
-    attrs_names = [k for k in dir(f) if k not in dir(types.FunctionType)]
-    for attr in attrs_names:
-        setattr(clone_func, attr, copy.deepcopy(getattr(f, attr)))
+    clone_func.__kwdefaults__ = f.__kwdefaults__
+    # Атрибуты метода (`_endpoint`, маркеры декораторов) неизменяемы, копировать их не нужно
+    clone_func.__dict__.update(f.__dict__)
+    setattr(clone_func, '__signature__', resolve_signature(f, get_route_generic_types(cls)))
     return clone_func
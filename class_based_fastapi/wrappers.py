@@ -0,0 +1,163 @@
+"""Общие функции обёрток методов API (кэш, условные запросы и т.п.)."""
+import functools
+import inspect
+from typing import Any, Callable, Dict, Optional, Sequence, Tuple
+
+from fastapi.datastructures import DefaultPlaceholder
+from starlette.concurrency import run_in_threadpool
+from starlette.requests import Request
+from starlette.responses import Response, StreamingResponse
+
+from class_based_fastapi.defaults import REQUEST_PARAMETER, RESPONSE_PARAMETER, SIGNATURE_KEY
+from class_based_fastapi.route_args import RouteArgs
+
+# Методы HTTP, ответ на которые определяется ключом запроса (`request_key`), а не телом запроса
+SAFE_METHODS = ('GET', 'HEAD')
+
+
+def is_async_endpoint(endpoint: Callable[..., Any]) -> bool:
+    """Метод API вызывается в цикле событий (иначе FastAPI вызывает его в пуле потоков)."""
+    return inspect.iscoroutinefunction(endpoint)
+
+
+async def call_endpoint(endpoint: Callable[..., Any], kwargs: Dict[str, Any]) -> Any:
+    """Вызов метода API так же, как его вызывает FastAPI: обычная функция — в пуле потоков
+
+    Args:
+        endpoint: Метод API
+        kwargs: Значения параметров
+
+    Returns: Результат метода API
+    """
+    if is_async_endpoint(endpoint):
+        return await endpoint(**kwargs)
+    return await run_in_threadpool(endpoint, **kwargs)
+
+
+def request_key(
+    cls: type, request: Request, key: Optional[Callable[[Request], str]] = None, headers: Sequence[str] = ()
+) -> str:
+    """Ключ запроса: класс контроллера, метод HTTP, путь с отсортированными параметрами запроса и значения заголовков
+
+    Args:
+        cls: Класс контроллера
+        request: Запрос
+        key: Функция `key(request) -> str`, заменяющая путь и параметры запроса
+        headers: Заголовки запроса, значения которых входят в ключ
+
+    Returns: Ключ
+    """
+    if key is not None:
+        target = key(request)
+    else:
+        target = request.url.path
+        if request.query_params:
+            target += '?' + '&'.join(f'{name}={value}' for name, value in sorted(request.query_params.multi_items()))
+    parts = [f'{cls.__module__}.{cls.__qualname__}', request.method, target]
+    parts.extend(request.headers.get(name, '') for name in headers)
+    return '\x1f'.join(parts)
+
+
+def merge_sub_response(response: Response, sub_response: Response, status: bool = True) -> Response:
+    """Перенос заголовков, cookie и кода ответа, заданных методом API через параметр `response: Response`,
+    в сформированный обёрткой ответ (как это делает FastAPI)
+
+    Args:
+        response: Сформированный ответ
+        sub_response: Промежуточный ответ FastAPI
+        status: Переносить код ответа
+
+    Returns: Сформированный ответ
+    """
+    if status and sub_response.status_code:
+        response.status_code = sub_response.status_code
+    response.headers.raw.extend(sub_response.headers.raw)
+    return response
+
+
+def require_safe_methods(cls: type, endpoint: Callable[..., Any], args: RouteArgs, option: str) -> None:
+    """Проверка, что маршрут обрабатывает только GET и HEAD
+
+    Ключ запроса не учитывает тело, поэтому для других методов HTTP ответ на один запрос получили бы
+    запросы с другими данными.
+
+    Args:
+        cls: Класс контроллера
+        endpoint: Метод API
+        args: Аргументы маршрута метода API
+        option: Название параметра декоратора (для сообщения об ошибке)
+
+    Raises:
+        ValueError: Маршрут обрабатывает другие методы HTTP
+    """
+    methods = {method.upper() for method in args.methods or ()}
+    if not methods or not methods <= set(SAFE_METHODS):
+        raise ValueError(
+            f'{cls.__name__}.{endpoint.__name__}: {option} is only supported for GET and HEAD, got {sorted(methods)}'
+        )
+
+
+def response_class_of(args: RouteArgs) -> Any:
+    """Класс ответа маршрута, в том числе заданный по умолчанию (`Default(JSONResponse)`)."""
+    response_class = args.response_class
+    if isinstance(response_class, DefaultPlaceholder):
+        return response_class.value
+    return response_class
+
+
+def is_streaming_route(args: RouteArgs) -> bool:
+    """Маршрут отдаёт потоковый ответ (`stream=` или `-> Stream[T]`, см. `streaming.stream_endpoint`)."""
+    response_class = response_class_of(args)
+    return inspect.isclass(response_class) and issubclass(response_class, StreamingResponse)
+
+
+def special_parameter(endpoint: Callable[..., Any], annotation: type, hidden_name: str) -> Tuple[str, bool]:
+    """Параметр метода API, в который FastAPI передаёт запрос (`Request`) или промежуточный ответ (`Response`)
+
+    FastAPI передаёт такой объект только в один параметр, поэтому скрытый параметр добавляется обёрткой, лишь если
+    у метода API (или внутренней обёртки) его нет.
+
+    Args:
+        endpoint: Метод API
+        annotation: `Request` или `Response`
+        hidden_name: Название скрытого параметра (`REQUEST_PARAMETER` или `RESPONSE_PARAMETER`)
+
+    Returns: Название параметра и признак скрытого параметра (обёртка извлекает его из `kwargs`)
+    """
+    signature = getattr(endpoint, SIGNATURE_KEY, None) or inspect.signature(endpoint)
+    for name, parameter in signature.parameters.items():
+        if inspect.isclass(parameter.annotation) and issubclass(parameter.annotation, annotation):
+            return name, False
+    return hidden_name, True
+
+
+def wrap_endpoint(
+    endpoint: Callable[..., Any], wrapper: Callable[..., Any], with_request: bool = False, with_response: bool = False
+) -> Callable[..., Any]:
+    """Оформление обёртки метода API для FastAPI
+
+    Обёртка получает атрибуты метода API (`functools.wraps`) и его сигнатуру. С `with_request=True` в сигнатуру
+    добавляется скрытый параметр `REQUEST_PARAMETER` с запросом Starlette, с `with_response=True` — параметр
+    `RESPONSE_PARAMETER` с промежуточным ответом FastAPI (заголовки, cookie и код ответа, заданные методом API
+    через параметр `response: Response`). Параметр не добавляется, если он уже есть у метода API
+    (см. `special_parameter`).
+
+    Args:
+        endpoint: Метод API
+        wrapper: Асинхронная обёртка (`async def wrapper(**kwargs)`)
+        with_request: Передавать обёртке запрос
+        with_response: Передавать обёртке промежуточный ответ
+
+    Returns: Обёртка
+    """
+    signature = getattr(endpoint, SIGNATURE_KEY, None) or inspect.signature(endpoint)
+    functools.update_wrapper(wrapper, endpoint)
+    del wrapper.__wrapped__
+    hidden = [(with_request, REQUEST_PARAMETER, Request), (with_response, RESPONSE_PARAMETER, Response)]
+    for enabled, name, annotation in hidden:
+        if enabled and special_parameter(endpoint, annotation, name)[1]:
+            parameters = list(signature.parameters.values())
+            parameters.append(inspect.Parameter(name, inspect.Parameter.KEYWORD_ONLY, annotation=annotation))
+            signature = signature.replace(parameters=parameters)
+    wrapper.__signature__ = signature
+    return wrapper
@@ -0,0 +1,111 @@
+from typing import List
+
+import pytest
+from fastapi import Depends, FastAPI, HTTPException
+from fastapi.testclient import TestClient
+
+from class_based_fastapi import Routable, get
+
+events: List[str] = []
+
+
+class Pool:
+    def __init__(self) -> None:
+        self.free = 2
+
+    async def acquire(self) -> str:
+        self.free -= 1
+        return 'connection'
+
+    async def release(self) -> None:
+        self.free += 1
+
+
+pool = Pool()
+
+
+def get_pool() -> Pool:
+    return pool
+
+
+class CAsyncLifecycle_Tenants(Routable):
+    pool: Pool = Depends(get_pool)
+
+    async def __ainit__(self) -> None:
+        events.append('ainit')
+        self.tenant = 'acme'
+
+    async def __aenter__(self) -> 'CAsyncLifecycle_Tenants':
+        events.append('enter')
+        self.connection = await self.pool.acquire()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> bool:
+        events.append(f'exit {exc_type.__name__ if exc_type else None}')
+        await self.pool.release()
+        # Подавить исключение метода API нельзя
+        return True
+
+    @get('tenant')
+    async def tenant(self) -> dict:
+        events.append('endpoint')
+        return {'tenant': self.tenant, 'connection': self.connection, 'free': self.pool.free}
+
+    @get('fail')
+    def fail(self) -> int:
+        raise HTTPException(status_code=418)
+
+
+class CAsyncLifecycle_BlockingInit(CAsyncLifecycle_Tenants):
+    INIT_IN_THREADPOOL = True
+
+
+class CAsyncLifecycle_App(Routable):
+    LIFETIME = 'app'
+
+    async def __ainit__(self) -> None:
+        events.append('app ainit')
+
+    async def __aexit__(self, *exc_info) -> None:
+        events.append('app exit')
+
+    async def __aenter__(self) -> 'CAsyncLifecycle_App':
+        events.append('app enter')
+        return self
+
+    @get('ping')
+    async def ping(self) -> str:
+        return 'pong'
+
+
+@pytest.fixture
+def app() -> FastAPI:
+    events.clear()
+    app = FastAPI()
+    app.include_router(CAsyncLifecycle_Tenants.routes())
+    app.include_router(CAsyncLifecycle_BlockingInit.routes())
+    app.include_router(CAsyncLifecycle_App.routes())
+    return app
+
+
+@pytest.mark.parametrize('path', ['c-async-lifecycle-tenants', 'c-async-lifecycle-blocking-init'])
+def test_per_request_lifecycle(app: FastAPI, path: str) -> None:
+    client = TestClient(app)
+    assert client.get(f'/{path}/v1.0/tenant').json() == {'tenant': 'acme', 'connection': 'connection', 'free': 1}
+    assert events == ['ainit', 'enter', 'endpoint', 'exit None']
+    assert pool.free == 2
+
+
+def test_exception_reaches_aexit(app: FastAPI) -> None:
+    client = TestClient(app)
+    assert client.get('/c-async-lifecycle-tenants/v1.0/fail').status_code == 418
+    assert events == ['ainit', 'enter', 'exit HTTPException']
+    assert pool.free == 2
+
+
+def test_app_lifetime_lifecycle(app: FastAPI) -> None:
+    with TestClient(app) as client:
+        assert client.get('/c-async-lifecycle-app/v1.0/ping').json() == 'pong'
+        assert client.get('/c-async-lifecycle-app/v1.0/ping').json() == 'pong'
+        assert events == ['app ainit', 'app enter']
+    assert events == ['app ainit', 'app enter', 'app exit']
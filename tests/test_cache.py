@@ -0,0 +1,199 @@
+import asyncio
+import time
+from typing import Dict, List, Optional
+
+import pytest
+from fastapi import FastAPI, HTTPException, Response
+from fastapi.testclient import TestClient
+from starlette.requests import Request
+from pydantic import BaseModel
+
+from class_based_fastapi import Routable, get, post
+from class_based_fastapi.cache import CacheBackend, CacheOptions, MemoryCache, cached
+
+calls: Dict[str, int] = {}
+
+
+class Item(BaseModel):
+    id: int
+    name: str
+
+
+class DictBackend(CacheBackend):
+    """Внешнее хранилище (например, Redis): значения и время жизни в словаре."""
+
+    def __init__(self) -> None:
+        self.values: Dict[str, bytes] = {}
+        self.ttls: Dict[str, float] = {}
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return self.values.get(key)
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        self.values[key] = value
+        self.ttls[key] = ttl
+
+    async def delete(self, key: str) -> None:
+        self.values.pop(key, None)
+
+    async def clear(self) -> None:
+        self.values.clear()
+
+
+backend = MemoryCache()
+external = DictBackend()
+
+
+class CCache_Catalogue(Routable):
+    CACHE_BACKEND = backend
+
+    @get('items', cache=60)
+    def items(self, category: str = 'all') -> List[Item]:
+        calls['items'] = calls.get('items', 0) + 1
+        return [{'id': calls['items'], 'name': category}]
+
+    @cached(ttl=30, headers=('Accept-Language',))
+    @get('items/{key}')
+    async def item(self, key: int) -> Item:
+        calls['item'] = calls.get('item', 0) + 1
+        return Item(id=key, name=str(calls['item']))
+
+    @get('missing/{key}', cache=True)
+    async def missing(self, key: int) -> Item:
+        calls['missing'] = calls.get('missing', 0) + 1
+        raise HTTPException(status_code=404)
+
+    @get('external', cache=CacheOptions(ttl=5, key=lambda request: 'external', backend=external))
+    async def external(self, page: int = 0) -> int:
+        calls['external'] = calls.get('external', 0) + 1
+        return calls['external']
+
+    @get('language', cache=60)
+    async def language(self, request: Request) -> str:
+        calls['language'] = calls.get('language', 0) + 1
+        return request.url.path
+
+    @get('session', cache=60)
+    async def session(self, response: Response) -> int:
+        calls['session'] = calls.get('session', 0) + 1
+        response.headers['x-custom'] = 'yes'
+        response.set_cookie('session', str(calls['session']))
+        return calls['session']
+
+    @get('session/precompiled', cache=60, precompile=True)
+    async def precompiled_session(self, response: Response) -> int:
+        response.headers['x-custom'] = 'yes'
+        response.set_cookie('session', 'secret')
+        return 1
+
+
+class CCache_Other(CCache_Catalogue):
+    pass
+
+
+@pytest.fixture
+def client() -> TestClient:
+    calls.clear()
+    asyncio.run(backend.clear())
+    asyncio.run(external.clear())
+    app = FastAPI()
+    app.include_router(CCache_Catalogue.routes())
+    app.include_router(CCache_Other.routes())
+    return TestClient(app)
+
+
+def test_cached_response(client: TestClient) -> None:
+    url = '/c-cache-catalogue/v1.0/items'
+    first = client.get(url, params={'category': 'books'})
+    second = client.get(url, params={'category': 'books'})
+    assert first.json() == second.json() == [{'id': 1, 'name': 'books'}]
+    assert second.headers['content-type'] == 'application/json'
+    assert calls['items'] == 1
+
+    assert client.get(url, params={'category': 'games'}).json() == [{'id': 2, 'name': 'games'}]
+    # Ключ включает класс контроллера
+    assert client.get('/c-cache-other/v1.0/items', params={'category': 'books'}).json()[0]['id'] == 3
+    assert calls['items'] == 3
+
+
+def test_vary_headers(client: TestClient) -> None:
+    url = '/c-cache-catalogue/v1.0/items/7'
+    en = client.get(url, headers={'Accept-Language': 'en'}).json()
+    assert client.get(url, headers={'Accept-Language': 'en'}).json() == en
+    assert client.get(url, headers={'Accept-Language': 'ru'}).json() != en
+    assert calls['item'] == 2
+
+
+def test_errors_not_cached(client: TestClient) -> None:
+    assert client.get('/c-cache-catalogue/v1.0/missing/1').status_code == 404
+    assert client.get('/c-cache-catalogue/v1.0/missing/1').status_code == 404
+    assert calls['missing'] == 2
+
+
+def test_custom_key_and_backend(client: TestClient) -> None:
+    assert client.get('/c-cache-catalogue/v1.0/external', params={'page': 1}).json() == 1
+    assert client.get('/c-cache-catalogue/v1.0/external', params={'page': 2}).json() == 1
+    assert client.get('/c-cache-other/v1.0/external').json() == 2
+    assert len(external.values) == 2
+    assert set(external.ttls.values()) == {5}
+
+
+def test_hidden_request_parameter(client: TestClient) -> None:
+    operation = client.get('/openapi.json').json()['paths']['/c-cache-catalogue/v1.0/items/{key}']['get']
+    assert [parameter['name'] for parameter in operation['parameters']] == ['key']
+
+
+def test_endpoint_request_parameter(client: TestClient) -> None:
+    # Обёртка использует параметр запроса метода API вместо скрытого
+    assert client.get('/c-cache-catalogue/v1.0/language').json() == '/c-cache-catalogue/v1.0/language'
+    assert client.get('/c-cache-catalogue/v1.0/language').json() == '/c-cache-catalogue/v1.0/language'
+    assert calls['language'] == 1
+
+
+@pytest.mark.parametrize('path', ['session', 'session/precompiled'])
+def test_sub_response_merged(client: TestClient, path: str) -> None:
+    url = f'/c-cache-catalogue/v1.0/{path}'
+    first = client.get(url)
+    assert first.headers['x-custom'] == 'yes'
+    assert first.headers['content-type'] == 'application/json'
+    assert 'session' in first.cookies
+    client.cookies.clear()
+    second = client.get(url)
+    assert second.json() == first.json() == 1
+    assert second.headers['x-custom'] == 'yes'
+    # Cookie одного клиента не попадает в общий кэш
+    assert 'set-cookie' not in second.headers
+
+
+def test_unsafe_methods_rejected() -> None:
+    class CCache_Post(Routable):
+        @post('echo', cache=60)
+        async def echo(self, value: dict) -> dict:
+            return value
+
+    with pytest.raises(ValueError):
+        CCache_Post.routes()
+
+
+def test_memory_cache_eviction() -> None:
+    async def scenario() -> None:
+        cache = MemoryCache(max_entries=2, max_bytes=10)
+        await cache.set('a', b'aaaa', 60)
+        await cache.set('b', b'bbbb', 60)
+        assert await cache.get('a') == b'aaaa'
+        await cache.set('c', b'cccc', 60)
+        # Вытесняется давно не использованная запись
+        assert await cache.get('b') is None
+        assert len(cache) == 2
+
+        await cache.set('d', b'dddddddd', 60)
+        assert cache.size <= 10
+        assert await cache.get('d') == b'dddddddd'
+        await cache.set('big', b'x' * 11, 60)
+        assert await cache.get('big') is None
+
+        await cache.set('short', b's', 0.01)
+        time.sleep(0.02)
+        assert await cache.get('short') is None
+
+    asyncio.run(scenario())
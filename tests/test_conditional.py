@@ -0,0 +1,133 @@
+import datetime
+from email.utils import format_datetime
+from typing import Dict, List
+
+import pytest
+from fastapi import FastAPI, Response
+from fastapi.testclient import TestClient
+from starlette.requests import Request
+
+from class_based_fastapi import Routable, get, post
+from class_based_fastapi.conditional import ETag, etag_matches, make_etag
+from class_based_fastapi.streaming import Stream
+
+calls: Dict[str, int] = {}
+state = {'version': 1}
+MODIFIED = datetime.datetime(2024, 5, 1, 10, 0, 0, 123456, tzinfo=datetime.timezone.utc)
+
+
+def count(name: str) -> None:
+    calls[name] = calls.get(name, 0) + 1
+
+
+class CConditional_Catalogue(Routable):
+    ETAG = True
+
+    async def catalogue_version(self, request: Request) -> int:
+        count('version')
+        return state['version']
+
+    def modified(self, request: Request) -> datetime.datetime:
+        return MODIFIED
+
+    @get('items')
+    def items(self) -> List[int]:
+        count('items')
+        return [1, 2, 3]
+
+    @get('versioned', etag=ETag(version=catalogue_version, last_modified=modified))
+    async def versioned(self) -> List[int]:
+        count('versioned')
+        return [state['version']]
+
+    @get('untracked', etag=False)
+    def untracked(self) -> int:
+        return 1
+
+    @get('stream')
+    async def stream(self) -> Stream[int]:
+        yield 1
+
+    @post('items')
+    def create(self) -> int:
+        return 1
+
+    @get('headers')
+    def headers(self, response: Response) -> int:
+        response.headers['cache-control'] = 'max-age=60'
+        response.headers['x-custom'] = 'yes'
+        return 1
+
+
+@pytest.fixture
+def client() -> TestClient:
+    calls.clear()
+    state['version'] = 1
+    app = FastAPI()
+    app.include_router(CConditional_Catalogue.routes())
+    return TestClient(app)
+
+
+URL = '/c-conditional-catalogue/v1.0/'
+
+
+def test_etag_from_body(client: TestClient) -> None:
+    response = client.get(URL + 'items')
+    etag = response.headers['etag']
+    assert etag == make_etag(response.content)
+
+    not_modified = client.get(URL + 'items', headers={'If-None-Match': etag})
+    assert not_modified.status_code == 304
+    assert not_modified.content == b''
+    assert not_modified.headers['etag'] == etag
+
+    assert client.get(URL + 'items', headers={'If-None-Match': '"other"'}).status_code == 200
+
+
+def test_version_skips_endpoint(client: TestClient) -> None:
+    response = client.get(URL + 'versioned')
+    etag = response.headers['etag']
+    assert response.headers['last-modified'] == format_datetime(MODIFIED, usegmt=True)
+    assert calls == {'version': 1, 'versioned': 1}
+
+    assert client.get(URL + 'versioned', headers={'If-None-Match': etag}).status_code == 304
+    assert calls == {'version': 2, 'versioned': 1}
+
+    state['version'] = 2
+    changed = client.get(URL + 'versioned', headers={'If-None-Match': etag})
+    assert changed.status_code == 200
+    assert changed.json() == [2]
+    assert changed.headers['etag'] != etag
+
+
+def test_if_modified_since(client: TestClient) -> None:
+    since = format_datetime(MODIFIED, usegmt=True)
+    assert client.get(URL + 'versioned', headers={'If-Modified-Since': since}).status_code == 304
+    earlier = format_datetime(MODIFIED - datetime.timedelta(seconds=1), usegmt=True)
+    assert client.get(URL + 'versioned', headers={'If-Modified-Since': earlier}).status_code == 200
+    # If-None-Match важнее If-Modified-Since
+    headers = {'If-Modified-Since': since, 'If-None-Match': '"other"'}
+    assert client.get(URL + 'versioned', headers=headers).status_code == 200
+
+
+def test_opt_out_and_other_methods(client: TestClient) -> None:
+    assert 'etag' not in client.get(URL + 'untracked').headers
+    assert 'etag' not in client.get(URL + 'stream').headers
+    assert 'etag' not in client.post(URL + 'items').headers
+
+
+def test_sub_response_merged(client: TestClient) -> None:
+    url = '/c-conditional-catalogue/v1.0/headers'
+    response = client.get(url)
+    assert response.headers['x-custom'] == 'yes'
+    assert response.headers['cache-control'] == 'max-age=60'
+    not_modified = client.get(url, headers={'If-None-Match': response.headers['etag']})
+    assert not_modified.status_code == 304
+    assert not_modified.headers['cache-control'] == 'max-age=60'
+    assert not_modified.headers['x-custom'] == 'yes'
+
+
+def test_etag_matches() -> None:
+    assert etag_matches('"a"', '"b", W/"a"')
+    assert etag_matches('"a"', '*')
+    assert not etag_matches('"a"', '"b"')
@@ -0,0 +1,72 @@
+import threading
+from typing import Dict
+
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+
+from class_based_fastapi import Routable, get
+from class_based_fastapi.routable import RoutableMeta
+
+threads: Dict[str, int] = {}
+
+
+def get_db() -> str:
+    return 'db'
+
+
+class CFactory_Plain(Routable):
+    db: str = Depends(get_db)
+
+    def __new__(cls, *args, **kwargs):
+        threads['init'] = threading.get_ident()
+        return super().__new__(cls)
+
+    @get('thread')
+    async def thread(self) -> bool:
+        return threads['init'] == threading.get_ident() and self.db == 'db'
+
+
+class CFactory_Blocking(CFactory_Plain):
+    INIT_IN_THREADPOOL = True
+
+
+class CFactory_CustomInit(Routable):
+    db: str = Depends(get_db)
+
+    def __init__(self, scale: int = 2) -> None:
+        threads['init'] = threading.get_ident()
+        self.scale = scale
+
+    @get('thread')
+    async def thread(self) -> bool:
+        return threads['init'] == threading.get_ident() and self.db == 'db'
+
+
+class CFactory_CustomInitOnLoop(CFactory_CustomInit):
+    INIT_IN_THREADPOOL = False
+
+
+@pytest.fixture
+def client() -> TestClient:
+    app = FastAPI()
+    for controller in (CFactory_Plain, CFactory_Blocking, CFactory_CustomInit, CFactory_CustomInitOnLoop):
+        app.include_router(controller.routes())
+    return TestClient(app)
+
+
+@pytest.mark.parametrize('path, on_loop', [
+    ('c-factory-plain', True),
+    ('c-factory-blocking', False),
+    ('c-factory-custom-init', False),
+    ('c-factory-custom-init-on-loop', True),
+])
+def test_controller_construction_thread(client: TestClient, path: str, on_loop: bool) -> None:
+    assert client.get(f'/{path}/v1.0/thread').json() is on_loop
+
+
+def test_factory_signature() -> None:
+    dependency, _ = RoutableMeta.get_controller_dependency(CFactory_CustomInitOnLoop)
+    assert list(dependency.__signature__.parameters) == ['scale', 'db']
+    assert RoutableMeta.get_controller_dependency(CFactory_CustomInitOnLoop)[0] is dependency
+    assert RoutableMeta.get_controller_dependency(CFactory_Blocking)[0] is CFactory_Blocking
@@ -0,0 +1,59 @@
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+
+from class_based_fastapi import Routable, get
+from class_based_fastapi.defaults import INIT_MODIFIED, INIT_ORIGINAL
+
+
+def get_db() -> int:
+    return 7
+
+
+class CInit_NoInit(Routable):
+    db: int = Depends(get_db)
+
+    @get(path='db')
+    def get_db(self) -> int:
+        return self.db
+
+
+class CInit_CustomInit(Routable):
+    db: int = Depends(get_db)
+
+    def __init__(self, value: int = Depends(get_db)) -> None:
+        self.value = value * 2
+
+    @get(path='db')
+    def get_db(self) -> int:
+        return self.db + self.value
+
+
+def test_no_custom_init_skips_original_init() -> None:
+    init = CInit_NoInit.__dict__['__init__']
+    assert getattr(init, INIT_MODIFIED)
+    assert getattr(init, INIT_ORIGINAL) is object.__init__
+    assert 'object' not in init.__code__.co_names
+
+    controller = CInit_NoInit(db=1)
+    assert controller.db == 1
+
+
+def test_missing_dependency_falls_back_to_class_attribute() -> None:
+    controller = CInit_NoInit()
+    assert controller.db is CInit_NoInit.db
+
+
+def test_custom_init_is_called() -> None:
+    controller = CInit_CustomInit(db=1, value=2)
+    assert controller.db == 1
+    assert controller.value == 4
+
+
+def test_generated_init_serves_requests() -> None:
+    app = FastAPI()
+    app.include_router(CInit_NoInit.routes())
+    app.include_router(CInit_CustomInit.routes())
+    client = TestClient(app)
+
+    assert client.get('/c-init-no-init/v1.0/db').json() == 7
+    assert client.get('/c-init-custom-init/v1.0/db').json() == 21
@@ -0,0 +1,146 @@
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, List, Optional
+
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+from sqlmodel import Field, SQLModel
+
+from class_based_fastapi.crud import CrudRoutable
+
+
+class Book_Crud(SQLModel, table=True):
+    id: Optional[int] = Field(default=None, primary_key=True)
+    title: str
+    pages: int = 0
+
+
+class BookCreate_Crud(SQLModel):
+    title: str
+    pages: int = 0
+
+
+class BookUpdate_Crud(SQLModel):
+    title: Optional[str] = None
+    pages: Optional[int] = None
+
+
+engine = create_async_engine('sqlite+aiosqlite://', poolclass=StaticPool)
+session_factory = async_sessionmaker(engine)
+STATEMENTS: List[str] = []
+
+
+@event.listens_for(engine.sync_engine, 'before_cursor_execute')
+def log_statement(conn, cursor, statement, parameters, context, executemany) -> None:
+    STATEMENTS.append(statement.split(None, 1)[0].upper())
+
+
+async def get_session() -> AsyncIterator[AsyncSession]:
+    async with session_factory() as session:
+        yield session
+
+
+class CCrud_Books(CrudRoutable[Book_Crud, BookCreate_Crud, BookUpdate_Crud]):
+    session: AsyncSession = Depends(get_session)
+    PAGE_SIZE = 2
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    async with engine.begin() as conn:
+        await conn.run_sync(Book_Crud.metadata.create_all, tables=[Book_Crud.__table__])
+    yield
+    async with engine.begin() as conn:
+        await conn.run_sync(Book_Crud.metadata.drop_all, tables=[Book_Crud.__table__])
+
+
+@pytest.fixture
+def client() -> TestClient:
+    app = FastAPI(lifespan=lifespan)
+    app.include_router(CCrud_Books.routes())
+    with TestClient(app) as client:
+        STATEMENTS.clear()
+        yield client
+
+
+URL = '/c-crud-books/v1.0'
+
+
+def create_books(client: TestClient, count: int) -> list:
+    return client.post(f'{URL}/bulk', json=[{'title': f'Book {i}', 'pages': i} for i in range(count)]).json()
+
+
+def test_bulk_create_is_a_single_insert(client: TestClient) -> None:
+    books = create_books(client, 5)
+    assert [book['id'] for book in books] == [1, 2, 3, 4, 5]
+    assert books[2] == {'id': 3, 'title': 'Book 2', 'pages': 2}
+    assert STATEMENTS.count('INSERT') == 1
+    assert 'SELECT' not in STATEMENTS
+
+
+def test_create_and_get(client: TestClient) -> None:
+    book = client.post(URL, json={'title': 'Single'}).json()
+    assert book == {'id': 1, 'title': 'Single', 'pages': 0}
+    assert client.get(f'{URL}/1').json() == book
+    assert client.get(f'{URL}/2').status_code == 404
+    assert client.get(f'{URL}/abc').status_code == 422
+
+
+def test_keyset_pagination(client: TestClient) -> None:
+    create_books(client, 5)
+
+    first = client.get(URL).json()
+    assert [book['id'] for book in first['items']] == [1, 2]
+    second = client.get(URL, params={'cursor': first['next_cursor']}).json()
+    assert [book['id'] for book in second['items']] == [3, 4]
+    rest = client.get(URL, params={'cursor': second['next_cursor'], 'limit': 10}).json()
+    assert [book['id'] for book in rest['items']] == [5]
+    assert rest['next_cursor'] is None
+
+
+def test_bulk_update_is_a_single_statement(client: TestClient) -> None:
+    create_books(client, 4)
+    STATEMENTS.clear()
+
+    books = client.patch(URL, json={'ids': [1, 3, 9], 'values': {'pages': 100}}).json()
+    assert sorted((book['id'], book['title'], book['pages']) for book in books) == [
+        (1, 'Book 0', 100), (3, 'Book 2', 100)
+    ]
+    assert STATEMENTS == ['UPDATE']
+    assert client.get(f'{URL}/2').json()['pages'] == 1
+
+
+def test_update_single_item(client: TestClient) -> None:
+    create_books(client, 1)
+    assert client.patch(f'{URL}/1', json={'title': 'Renamed'}).json() == {'id': 1, 'title': 'Renamed', 'pages': 0}
+    assert client.patch(f'{URL}/2', json={'title': 'Missing'}).status_code == 404
+
+
+def test_bulk_delete(client: TestClient) -> None:
+    create_books(client, 4)
+    STATEMENTS.clear()
+
+    assert client.delete(URL, params={'ids': [1, 2, 7]}).json() == 2
+    assert STATEMENTS == ['DELETE']
+    assert [book['id'] for book in client.get(URL, params={'limit': 10}).json()['items']] == [3, 4]
+
+    assert client.delete(f'{URL}/3').json() is True
+    assert client.delete(f'{URL}/3').status_code == 404
+
+
+def test_openapi_uses_concrete_models(client: TestClient) -> None:
+    schema = client.get('/openapi.json').json()
+    operation = schema['paths'][f'{URL}/bulk']['post']
+    request_schema = operation['requestBody']['content']['application/json']['schema']
+    response_schema = operation['responses']['200']['content']['application/json']['schema']
+    assert request_schema['items'] == {'$ref': '#/components/schemas/BookCreate_Crud'}
+    assert response_schema['items'] == {'$ref': '#/components/schemas/Book_Crud'}
+
+    # Первичный ключ описывается типом столбца
+    key = schema['paths'][f'{URL}/{{key}}']['get']['parameters'][0]
+    assert (key['name'], key['schema']['type']) == ('key', 'integer')
+    ids = schema['paths'][URL]['delete']['parameters'][0]
+    assert ids['schema']['items']['type'] == 'integer'
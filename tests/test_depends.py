@@ -1,6 +1,10 @@
-from fastapi import FastAPI
+import inspect
+
+from fastapi import Depends, FastAPI
 from fastapi.testclient import TestClient
 
+from class_based_fastapi import get
+
 from tests.controllers import ExampleRoutableChildren, ExampleRoutableParent
 from tests.utilities import check_api_methods, create_app
 
@@ -38,3 +42,28 @@ def test_method_depends() -> None:
     response = client.get('/children/example-routable-children/v1.0/method-depends')
     assert response.status_code == 200
     assert response.text == '99'
+
+
+def get_cache():
+    return 'cache'
+
+
+class CDepends_Child(ExampleRoutableChildren):
+    cache: str = Depends(get_cache)
+
+    @get(path='child-depends')
+    async def get_child_depends(self) -> str:
+        return f'{self.db} {self.cache} {self.db_from_init}'
+
+
+def test_child_class_depends() -> None:
+    app = FastAPI()
+    app.include_router(CDepends_Child.routes())
+    client = TestClient(app)
+
+    response = client.get('/children/c-depends-child/v1.0/child-depends')
+    assert response.status_code == 200
+    assert response.json() == '99 cache 99'
+
+    parameters = inspect.signature(app.routes[-1].endpoint).parameters
+    assert parameters['self'].default.dependency is CDepends_Child
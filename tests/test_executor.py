@@ -0,0 +1,136 @@
+import asyncio
+import contextvars
+import threading
+from typing import List
+
+import httpx
+import pytest
+from fastapi import FastAPI, HTTPException
+from fastapi.testclient import TestClient
+
+from class_based_fastapi import Routable, get
+from class_based_fastapi.executors import ThreadPool, executor_metrics
+
+books_pool = ThreadPool(max_workers=1, name='c-executor-books', max_queue=1, retry_after=3)
+release = threading.Event()
+tenant: contextvars.ContextVar[str] = contextvars.ContextVar('tenant', default='')
+
+
+class CExecutor_Books(Routable):
+    EXECUTOR = books_pool
+
+    @get('thread')
+    def thread(self) -> str:
+        return threading.current_thread().name
+
+    @get('async-thread')
+    async def async_thread(self) -> str:
+        return threading.current_thread().name
+
+    @get('tenant')
+    def tenant(self) -> str:
+        return tenant.get()
+
+    @get('slow')
+    def slow(self) -> int:
+        release.wait(5)
+        return 1
+
+    @get('items', stream=True)
+    def items(self) -> List[int]:
+        return [1, 2]
+
+
+class CExecutor_Shared(Routable):
+    @get('thread')
+    def thread(self) -> str:
+        return threading.current_thread().name
+
+
+app = FastAPI()
+app.include_router(CExecutor_Books.routes())
+app.include_router(CExecutor_Shared.routes())
+
+
+@app.middleware('http')
+async def set_tenant(request, call_next):
+    tenant.set(request.headers.get('x-tenant', ''))
+    return await call_next(request)
+
+
+def test_sync_methods_run_in_controller_pool() -> None:
+    client = TestClient(app)
+    assert client.get('/c-executor-books/v1.0/thread').json().startswith('c-executor-books')
+    assert not client.get('/c-executor-books/v1.0/async-thread').json().startswith('c-executor-books')
+    assert not client.get('/c-executor-shared/v1.0/thread').json().startswith('c-executor-books')
+    assert client.get('/c-executor-books/v1.0/tenant', headers={'x-tenant': 'acme'}).json() == 'acme'
+    assert client.get('/c-executor-books/v1.0/items').text == '1\n2\n'
+
+
+def test_back_pressure() -> None:
+    async def scenario() -> List[httpx.Response]:
+        release.clear()
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url='http://test') as client:
+            requests = []
+            for metric in ('active', 'queued', 'rejected'):
+                requests.append(asyncio.ensure_future(client.get('/c-executor-books/v1.0/slow')))
+                for _ in range(500):
+                    if books_pool.metrics()[metric]:
+                        break
+                    await asyncio.sleep(0.01)
+            assert books_pool.metrics()['active'] == 1
+            assert books_pool.metrics()['queued'] == 1
+            release.set()
+            return await asyncio.gather(*requests)
+
+    before = books_pool.metrics()['completed']
+    responses = asyncio.run(scenario())
+    assert sorted(response.status_code for response in responses) == [200, 200, 503]
+    rejected = next(response for response in responses if response.status_code == 503)
+    assert rejected.headers['retry-after'] == '3'
+    metrics = next(metrics for metrics in executor_metrics() if metrics['name'] == 'c-executor-books')
+    assert metrics['active'] == metrics['queued'] == 0
+    assert metrics['completed'] == before + 2
+
+
+def test_cancelled_queued_tasks() -> None:
+    pool = ThreadPool(max_workers=1, name='c-executor-cancelled', max_queue=0)
+
+    async def scenario() -> None:
+        release.clear()
+        running = asyncio.ensure_future(pool.run(release.wait, 5))
+        while not pool.active:
+            await asyncio.sleep(0.01)
+        # Все потоки заняты, очереди нет
+        with pytest.raises(HTTPException):
+            await pool.run(int)
+        pool.max_queue = 2
+        queued = [asyncio.ensure_future(pool.run(int)) for _ in range(2)]
+        await asyncio.sleep(0.01)
+        assert pool.queued == 2
+        for task in queued:
+            task.cancel()
+        await asyncio.gather(*queued, return_exceptions=True)
+        assert pool.queued == 0
+        release.set()
+        assert await running is True
+
+    asyncio.run(scenario())
+    # Свободный пул без очереди принимает задачи
+    pool.max_queue = 0
+    assert asyncio.run(pool.run(int, '7')) == 7
+    assert pool.metrics()['queued'] == pool.metrics()['active'] == 0
+    pool.shutdown()
+
+
+def test_invalid_executor() -> None:
+    class CExecutor_Invalid(Routable):
+        EXECUTOR = 'books'
+
+        @get('')
+        def index(self) -> int:
+            return 1
+
+    with pytest.raises(TypeError):
+        CExecutor_Invalid.routes()
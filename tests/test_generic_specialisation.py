@@ -0,0 +1,101 @@
+import gc
+import typing
+import weakref
+from typing import Generic, List, TypeVar
+
+from sqlmodel import SQLModel
+
+from class_based_fastapi import Routable, get, post
+from class_based_fastapi import utilities
+from class_based_fastapi.defaults import GENERIC_TYPES
+
+TModel = TypeVar('TModel')
+TBody = TypeVar('TBody')
+
+
+class Model_Specialisation(SQLModel):
+    value: int
+
+
+class Body_Specialisation(SQLModel):
+    value: int
+
+
+class CSpecialisation_Base(Routable, Generic[TModel, TBody]):
+    @post(path='items')
+    def add(self, body: TBody) -> TModel:
+        return body
+
+    @get(path='items')
+    def items(self) -> List[TModel]:
+        return []
+
+
+class CSpecialisation_First(CSpecialisation_Base[Model_Specialisation, Body_Specialisation]):
+    pass
+
+
+class CSpecialisation_Second(CSpecialisation_Base[Model_Specialisation, Body_Specialisation]):
+    NAME_MODULE = 'Second'
+
+
+def test_same_specialisation_is_resolved_once() -> None:
+    first = getattr(CSpecialisation_First, GENERIC_TYPES)
+    assert first == {'TModel': Model_Specialisation, 'TBody': Body_Specialisation}
+    assert getattr(CSpecialisation_Second, GENERIC_TYPES) is first
+    assert CSpecialisation_First.__generic_attribute__ == [
+        {'name': 'TModel', 'type': Model_Specialisation, 'class': CSpecialisation_Base},
+        {'name': 'TBody', 'type': Body_Specialisation, 'class': CSpecialisation_Base},
+    ]
+
+
+def test_signatures_are_shared_between_specialisations() -> None:
+    CSpecialisation_First.routes()
+    CSpecialisation_Second.routes()
+
+    signatures = utilities._SIGNATURES[CSpecialisation_Base.__dict__['add']]
+    assert len(signatures) == 1
+    signature = next(iter(signatures.values()))
+    assert signature.parameters['body'].annotation is Body_Specialisation
+    assert signature.return_annotation is Model_Specialisation
+
+
+def test_specialisation_uses_origin_class_not_name() -> None:
+    module_base = globals()['CSpecialisation_Base']
+
+    class CSpecialisation_Base(Routable, Generic[TModel]):
+        @get(path='item')
+        def item(self) -> TModel:
+            return None
+
+    class CSpecialisation_Local(CSpecialisation_Base[Model_Specialisation]):
+        pass
+
+    class CSpecialisation_Third(module_base[Body_Specialisation, Model_Specialisation]):
+        pass
+
+    assert getattr(CSpecialisation_Local, GENERIC_TYPES) == {'TModel': Model_Specialisation}
+    assert getattr(CSpecialisation_Third, GENERIC_TYPES) == {
+        'TModel': Body_Specialisation, 'TBody': Model_Specialisation
+    }
+
+
+def test_dropped_generic_controllers_are_released() -> None:
+    def create() -> list:
+        class CSpecialisation_Dropped(Routable, Generic[TModel]):
+            @get(path='items')
+            def items(self) -> List[TModel]:
+                return []
+
+        class CSpecialisation_DroppedRows(CSpecialisation_Dropped[Model_Specialisation]):
+            pass
+
+        CSpecialisation_DroppedRows.routes()
+        return [weakref.ref(CSpecialisation_Dropped), weakref.ref(CSpecialisation_DroppedRows)]
+
+    refs = [ref for _ in range(5) for ref in create()]
+    # `Generic[...]` кэшируется typing (`CSpecialisation_Dropped[Model_Specialisation]` ссылается на класс)
+    for cleanup in typing._cleanups:
+        cleanup()
+    gc.collect()
+    assert all(ref() is None for ref in refs)
@@ -0,0 +1,96 @@
+import sys
+from typing import Callable, Dict, Generic, List, Optional, TypeVar, Union
+
+import pytest
+from fastapi import FastAPI, Query
+from fastapi.testclient import TestClient
+from pydantic import BaseModel
+from typing_extensions import Annotated, Literal
+
+from class_based_fastapi import Routable, get, post
+from class_based_fastapi.generics import substitute_type
+
+T = TypeVar('T')
+TKey = TypeVar('TKey')
+
+
+class Item_Substitution(BaseModel):
+    id: int
+
+
+class Page_Substitution(BaseModel, Generic[T]):
+    items: List[T]
+    total: int
+
+
+TYPES = {'T': Item_Substitution, 'TKey': int}
+
+
+def test_nested_typing_aliases() -> None:
+    assert substitute_type(Dict[str, List[T]], TYPES) == Dict[str, List[Item_Substitution]]
+    assert substitute_type(Dict[TKey, Optional[T]], TYPES) == Dict[int, Optional[Item_Substitution]]
+    assert substitute_type(Callable[[TKey], T], TYPES) == Callable[[int], Item_Substitution]
+
+
+def test_unions() -> None:
+    assert substitute_type(Union[T, None], TYPES) == Optional[Item_Substitution]
+    assert substitute_type(Union[T, TKey, str], TYPES) == Union[Item_Substitution, int, str]
+
+
+@pytest.mark.skipif(sys.version_info < (3, 10), reason='PEP 585 and PEP 604 annotations')
+def test_builtin_generics_and_pep604_unions() -> None:
+    assert substitute_type(list[T], TYPES) == list[Item_Substitution]
+    assert substitute_type(dict[str, list[T]], TYPES) == dict[str, list[Item_Substitution]]
+    assert substitute_type(T | None, TYPES) == Optional[Item_Substitution]
+    assert substitute_type(list[T] | TKey, TYPES) == Union[list[Item_Substitution], int]
+
+
+def test_annotated_keeps_metadata() -> None:
+    query = Query(default=None)
+    result = substitute_type(Annotated[Optional[TKey], query], TYPES)
+    assert result == Annotated[Optional[int], query]
+    assert result.__metadata__ == (query,)
+
+
+def test_pydantic_generic_models() -> None:
+    assert substitute_type(Page_Substitution[T], TYPES) is Page_Substitution[Item_Substitution]
+    assert substitute_type(Optional[Page_Substitution[T]], TYPES) == Optional[Page_Substitution[Item_Substitution]]
+    assert substitute_type(Page_Substitution[List[T]], TYPES) is Page_Substitution[List[Item_Substitution]]
+
+
+def test_untouched_annotations_are_returned_as_is() -> None:
+    annotation = Dict[str, List[int]]
+    assert substitute_type(annotation, TYPES) is annotation
+    assert substitute_type(Literal['T'], TYPES) == Literal['T']
+    assert substitute_type(List[T], {'T': None}) == List[T]
+    assert substitute_type(Annotated[T, {'unhashable': []}], TYPES) == Annotated[Item_Substitution, {'unhashable': []}]
+
+
+class CSubstitution_Base(Routable, Generic[T, TKey]):
+    @get(path='page')
+    def page(self, size: Annotated[Optional[TKey], Query()] = None) -> Optional[Page_Substitution[T]]:
+        return {'items': [{'id': size or 0}], 'total': 1}
+
+    @post(path='index')
+    def index(self, items: List[T]) -> Dict[str, List[T]]:
+        return {'all': items}
+
+
+class CSubstitution_Items(CSubstitution_Base[Item_Substitution, int]):
+    pass
+
+
+def test_controller_with_nested_generics() -> None:
+    app = FastAPI()
+    app.include_router(CSubstitution_Items.routes())
+    client = TestClient(app)
+
+    assert client.get('/c-substitution-items/v1.0/page', params={'size': 2}).json() == {
+        'items': [{'id': 2}], 'total': 1
+    }
+    assert client.get('/c-substitution-items/v1.0/page', params={'size': 'x'}).status_code == 422
+    assert client.post('/c-substitution-items/v1.0/index', json=[{'id': 1}]).json() == {'all': [{'id': 1}]}
+    assert client.post('/c-substitution-items/v1.0/index', json=[{'id': 'x'}]).status_code == 422
+
+    schemas = app.openapi()['components']['schemas']
+    assert 'Page_Substitution_Item_Substitution_' in schemas
@@ -0,0 +1,100 @@
+from typing import Generic, List, TypeVar
+
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+from sqlmodel import SQLModel
+
+from class_based_fastapi import Routable, get, post
+from class_based_fastapi.lazy import DeferredEndpoint, LazyAPIRoute
+
+T = TypeVar('T')
+
+
+class Model_Lazy(SQLModel):
+    value: int
+
+
+def get_db() -> int:
+    return 3
+
+
+class CLazy_Base(Routable, Generic[T]):
+    LAZY_ROUTES = True
+    db: int = Depends(get_db)
+
+    @get(path='items')
+    def items(self) -> List[T]:
+        return [{'value': self.db}]
+
+    @post(path='items')
+    def add(self, model: T) -> T:
+        return model
+
+    @get(path='count/{x}')
+    async def count(self, x: int) -> int:
+        return x + self.db
+
+
+class CLazy_Models(CLazy_Base[Model_Lazy]):
+    pass
+
+
+def lazy_routes(routes: list) -> list:
+    return [route for route in routes if isinstance(route, LazyAPIRoute)]
+
+
+def create_app() -> FastAPI:
+    app = FastAPI()
+    app.include_router(CLazy_Models.routes())
+    return app
+
+
+def test_routes_are_not_compiled_on_include() -> None:
+    CLazy_Models.invalidate_routes()
+    app = create_app()
+
+    routes = lazy_routes(app.routes)
+    assert len(routes) == 3
+    assert not any(route.is_compiled for route in routes)
+    assert all(isinstance(route.endpoint, DeferredEndpoint) for route in routes)
+    assert sorted(route.path for route in routes) == [
+        '/c-lazy-models/v1.0/count/{x}', '/c-lazy-models/v1.0/items', '/c-lazy-models/v1.0/items'
+    ]
+
+
+def test_first_matching_request_compiles_route() -> None:
+    app = create_app()
+    client = TestClient(app)
+
+    response = client.get('/c-lazy-models/v1.0/count/2')
+    assert response.status_code == 200
+    assert response.json() == 5
+
+    compiled = [route.path for route in lazy_routes(app.routes) if route.is_compiled]
+    assert compiled == ['/c-lazy-models/v1.0/count/{x}']
+
+    response = client.post('/c-lazy-models/v1.0/items', json={'value': 7})
+    assert response.status_code == 200
+    assert response.json() == {'value': 7}
+
+    response = client.get('/c-lazy-models/v1.0/items')
+    assert response.json() == [{'value': 3}]
+
+
+def test_openapi_forces_compilation() -> None:
+    app = create_app()
+    schema = app.openapi()
+
+    assert all(route.is_compiled for route in lazy_routes(app.routes))
+    operation = schema['paths']['/c-lazy-models/v1.0/items']['post']
+    assert operation['requestBody']['content']['application/json']['schema'] == {
+        '$ref': '#/components/schemas/Model_Lazy'
+    }
+
+
+def test_endpoint_is_built_once_for_all_apps() -> None:
+    first, second = create_app(), create_app()
+    TestClient(first).get('/c-lazy-models/v1.0/count/1')
+
+    endpoint = next(route.endpoint for route in lazy_routes(second.routes) if route.path.endswith('{x}'))
+    assert endpoint._result is not None
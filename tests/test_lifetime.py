@@ -0,0 +1,149 @@
+import asyncio
+from typing import Iterator, List
+
+import httpx
+import pytest
+from fastapi import Depends, FastAPI, Request
+from fastapi.testclient import TestClient
+
+from class_based_fastapi import Routable, get
+
+CALLS: List[str] = []
+
+
+def get_client() -> Iterator[str]:
+    CALLS.append('open')
+    yield 'client'
+    CALLS.append('close')
+
+
+def get_user() -> str:
+    CALLS.append('user')
+    return 'user'
+
+
+class CLifetime_App(Routable):
+    LIFETIME = 'app'
+    client: str = Depends(get_client)
+
+    @get(path='id')
+    async def get_id(self, user: str = Depends(get_user)) -> str:
+        return f'{id(self)} {self.client} {user}'
+
+
+class CLifetime_Scoped(CLifetime_App):
+    LIFETIME = 'scoped'
+
+
+class CLifetime_Request(CLifetime_App):
+    LIFETIME = 'request'
+
+
+def get_request(request: Request) -> str:
+    return request.url.path
+
+
+class CLifetime_RequestDepends(Routable):
+    LIFETIME = 'app'
+    path: str = Depends(get_request)
+
+    @get(path='path')
+    def get_path(self) -> str:
+        return self.path
+
+
+async def get_expensive() -> str:
+    CALLS.append('expensive')
+    await asyncio.sleep(0.05)
+    return 'expensive'
+
+
+class CLifetime_Expensive(Routable):
+    LIFETIME = 'app'
+    resource: str = Depends(get_expensive)
+
+    @get(path='id')
+    async def get_id(self) -> int:
+        return id(self)
+
+
+def create_client(controller: type) -> TestClient:
+    app = FastAPI()
+    app.include_router(controller.routes())
+    return TestClient(app)
+
+
+@pytest.fixture(autouse=True)
+def clear_calls() -> None:
+    CALLS.clear()
+
+
+def test_app_lifetime_builds_controller_once() -> None:
+    with create_client(CLifetime_App) as client:
+        responses = [client.get('/c-lifetime-app/v1.0/id').json() for _ in range(3)]
+        assert CALLS == ['open', 'user', 'user', 'user']
+
+    assert len(set(responses)) == 1
+    assert responses[0].endswith('client user')
+    assert CALLS[-1] == 'close'
+
+
+def test_app_lifetime_is_shared_between_apps() -> None:
+    with create_client(CLifetime_App) as first, create_client(CLifetime_App) as second:
+        assert first.get('/c-lifetime-app/v1.0/id').json() == second.get('/c-lifetime-app/v1.0/id').json()
+        assert CALLS.count('open') == 1
+    assert CALLS.count('close') == 1
+
+
+def test_scoped_lifetime_is_per_app() -> None:
+    with create_client(CLifetime_Scoped) as first, create_client(CLifetime_Scoped) as second:
+        first_ids = {first.get('/c-lifetime-scoped/v1.0/id').json() for _ in range(2)}
+        second_ids = {second.get('/c-lifetime-scoped/v1.0/id').json() for _ in range(2)}
+        assert len(first_ids) == 1
+        assert len(second_ids) == 1
+        assert first_ids != second_ids
+    assert CALLS.count('open') == CALLS.count('close') == 2
+
+
+def test_lifetime_without_lifespan_is_built_on_first_request() -> None:
+    client = create_client(CLifetime_Scoped)
+    assert client.get('/c-lifetime-scoped/v1.0/id').json() == client.get('/c-lifetime-scoped/v1.0/id').json()
+    assert CALLS.count('open') == 1
+
+
+def test_concurrent_first_requests_build_controller_once() -> None:
+    app = FastAPI()
+    app.include_router(CLifetime_Expensive.routes())
+
+    async def fetch() -> List[int]:
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url='http://test') as client:
+            responses = await asyncio.gather(*[client.get('/c-lifetime-expensive/v1.0/id') for _ in range(10)])
+        return [response.json() for response in responses]
+
+    assert len(set(asyncio.run(fetch()))) == 1
+    assert CALLS == ['expensive']
+
+
+def test_request_lifetime_builds_controller_per_request() -> None:
+    client = create_client(CLifetime_Request)
+    client.get('/c-lifetime-request/v1.0/id')
+    client.get('/c-lifetime-request/v1.0/id')
+    assert CALLS.count('open') == 2
+
+
+def test_request_dependencies_are_rejected() -> None:
+    with pytest.raises(RuntimeError, match='outside of a request'):
+        with create_client(CLifetime_RequestDepends):
+            pass
+
+
+def test_unknown_lifetime() -> None:
+    class CLifetime_Unknown(Routable):
+        LIFETIME = 'session'
+
+        @get(path='')
+        def index(self) -> int:
+            return 1
+
+    with pytest.raises(ValueError, match='LIFETIME'):
+        CLifetime_Unknown.routes()
@@ -0,0 +1,120 @@
+import asyncio
+from typing import Dict, List
+
+import httpx
+import pytest
+from fastapi import FastAPI
+
+from class_based_fastapi import Routable, get
+from class_based_fastapi.limits import ConcurrencyLimiter, get_limiter, limiter_metrics
+
+gates: Dict[str, asyncio.Event] = {}
+
+
+class CLimits_Reports(Routable):
+    MAX_CONCURRENCY = 1
+    MAX_QUEUE = 1
+    RETRY_AFTER = 5
+
+    @get('slow')
+    async def slow(self) -> int:
+        await gates['reports'].wait()
+        return 1
+
+    @get('sync')
+    def sync(self) -> int:
+        return 2
+
+
+class CLimits_Search(Routable):
+    MAX_CONCURRENCY = 1
+    QUEUE_TIMEOUT = 0.05
+    SHED_STATUS_CODE = 429
+
+    @get('slow')
+    async def slow(self) -> int:
+        await gates['search'].wait()
+        return 1
+
+
+app = FastAPI()
+app.include_router(CLimits_Reports.routes())
+app.include_router(CLimits_Search.routes())
+
+
+async def wait_for(condition) -> None:
+    for _ in range(500):
+        if condition():
+            return
+        await asyncio.sleep(0.01)
+
+
+def test_bounded_queue() -> None:
+    limiter = get_limiter(CLimits_Reports)
+
+    async def scenario() -> List[httpx.Response]:
+        gates['reports'] = asyncio.Event()
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url='http://test') as client:
+            first = asyncio.ensure_future(client.get('/c-limits-reports/v1.0/slow'))
+            await wait_for(lambda: limiter.in_flight == 1)
+            second = asyncio.ensure_future(client.get('/c-limits-reports/v1.0/sync'))
+            await wait_for(lambda: limiter.queued == 1)
+            rejected = await client.get('/c-limits-reports/v1.0/slow')
+            metrics = next(metrics for metrics in limiter_metrics() if metrics['name'].endswith('CLimits_Reports'))
+            assert (metrics['in_flight'], metrics['queued'], metrics['rejected']) == (1, 1, 1)
+            gates['reports'].set()
+            return [await first, await second, rejected]
+
+    first, second, rejected = asyncio.run(scenario())
+    assert (first.json(), second.json()) == (1, 2)
+    assert rejected.status_code == 503
+    assert rejected.headers['retry-after'] == '5'
+    assert (limiter.in_flight, limiter.queued) == (0, 0)
+
+
+def test_queue_timeout() -> None:
+    limiter = get_limiter(CLimits_Search)
+
+    async def scenario() -> List[httpx.Response]:
+        gates['search'] = asyncio.Event()
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url='http://test') as client:
+            first = asyncio.ensure_future(client.get('/c-limits-search/v1.0/slow'))
+            await wait_for(lambda: limiter.in_flight == 1)
+            timed_out = await client.get('/c-limits-search/v1.0/slow')
+            gates['search'].set()
+            return [await first, timed_out]
+
+    first, timed_out = asyncio.run(scenario())
+    assert first.json() == 1
+    assert timed_out.status_code == 429
+    assert limiter.timed_out == 1
+    assert (limiter.in_flight, limiter.queued) == (0, 0)
+
+
+def test_cancelled_waiter_releases_slot() -> None:
+    async def scenario() -> None:
+        limiter = ConcurrencyLimiter(1)
+        await limiter.acquire()
+        waiter = asyncio.ensure_future(limiter.acquire())
+        await asyncio.sleep(0)
+        assert limiter.queued == 1
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        assert limiter.queued == 0
+        limiter.release()
+        assert limiter.in_flight == 0
+
+    asyncio.run(scenario())
+
+
+def test_limiter_follows_settings() -> None:
+    limiter = get_limiter(CLimits_Reports)
+    assert get_limiter(CLimits_Reports) is limiter
+    assert get_limiter(Routable) is None
+
+    class CLimits_Child(CLimits_Reports):
+        MAX_QUEUE = 4
+
+    assert get_limiter(CLimits_Child) is not limiter
+    assert get_limiter(CLimits_Child).max_queue == 4
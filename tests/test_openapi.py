@@ -0,0 +1,121 @@
+from typing import Generic, List, TypeVar
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlmodel import SQLModel
+
+from class_based_fastapi import Routable, get, post
+from class_based_fastapi import openapi as cbv_openapi
+from class_based_fastapi.openapi import invalidate_openapi, merge_openapi, setup_openapi
+
+T = TypeVar('T')
+
+
+class Model_OpenAPIBook(SQLModel):
+    title: str
+
+
+class Model_OpenAPIAuthor(SQLModel):
+    name: str
+
+
+class COpenAPI_Base(Routable, Generic[T]):
+    @get(path='items')
+    def items(self) -> List[T]:
+        return []
+
+    @post(path='items')
+    def add(self, model: T) -> T:
+        return model
+
+
+class COpenAPI_Books(COpenAPI_Base[Model_OpenAPIBook]):
+    pass
+
+
+class COpenAPI_Authors(COpenAPI_Base[Model_OpenAPIAuthor]):
+    LAZY_ROUTES = True
+
+
+def create_app() -> FastAPI:
+    app = FastAPI(title='Library')
+
+    @app.get('/health')
+    def health() -> str:
+        return 'ok'
+
+    app.include_router(COpenAPI_Books.routes())
+    app.include_router(COpenAPI_Authors.routes(), prefix='/api', tags=['authors'])
+    return app
+
+
+def count_builds(monkeypatch) -> list:
+    calls = []
+    original = cbv_openapi.get_openapi
+    monkeypatch.setattr(cbv_openapi, 'get_openapi', lambda **kwargs: calls.append(kwargs['title']) or original(**kwargs))
+    return calls
+
+
+def test_merged_schema_matches_fastapi_schema() -> None:
+    app = create_app()
+    assert merge_openapi(app) == app.openapi()
+
+
+def test_fragments_are_reused_between_apps(monkeypatch) -> None:
+    COpenAPI_Books.invalidate_routes()
+    COpenAPI_Authors.invalidate_routes()
+    merge_openapi(create_app())
+
+    calls = count_builds(monkeypatch)
+    schema = merge_openapi(create_app())
+    assert calls == ['Library']
+    assert '/api/c-open-api-authors/v1.0/items' in schema['paths']
+    assert schema['paths']['/api/c-open-api-authors/v1.0/items']['get']['tags'] == ['authors', 'COpenAPI_Authors']
+
+
+def test_fragment_depends_on_include_router_arguments(monkeypatch) -> None:
+    merge_openapi(create_app())
+    calls = count_builds(monkeypatch)
+
+    app = FastAPI()
+    app.include_router(COpenAPI_Books.routes(), prefix='/v2')
+    schema = merge_openapi(app)
+    assert calls == ['FastAPI', 'COpenAPI_Books']
+    assert list(schema['paths']) == ['/v2/c-open-api-books/v1.0/items']
+
+
+def test_setup_openapi_and_invalidation(monkeypatch) -> None:
+    app = setup_openapi(create_app())
+    client = TestClient(app)
+    assert client.get('/openapi.json').json() == merge_openapi(create_app())
+
+    calls = count_builds(monkeypatch)
+    client.get('/openapi.json')
+    assert calls == []
+
+    invalidate_openapi(app, COpenAPI_Books)
+    client.get('/openapi.json')
+    assert calls == ['Library', 'COpenAPI_Books']
+
+
+def test_merged_schema_is_not_shared_with_cache() -> None:
+    app = create_app()
+    first = merge_openapi(app)
+    first['paths']['/c-open-api-books/v1.0/items']['get']['summary'] = 'changed'
+    first['components']['schemas']['Model_OpenAPIBook']['title'] = 'changed'
+
+    second = merge_openapi(app)
+    assert second['paths']['/c-open-api-books/v1.0/items']['get']['summary'] == 'Items'
+    assert second['components']['schemas']['Model_OpenAPIBook']['title'] == 'Model_OpenAPIBook'
+
+
+def test_conflicting_component_names_fall_back_to_fastapi() -> None:
+    class Model_OpenAPIBook(SQLModel):
+        isbn: int
+
+    class COpenAPI_OtherBooks(COpenAPI_Base[Model_OpenAPIBook]):
+        pass
+
+    app = create_app()
+    app.include_router(COpenAPI_OtherBooks.routes())
+    assert merge_openapi(app) == app.openapi()
@@ -0,0 +1,159 @@
+import datetime
+import uuid
+from contextlib import asynccontextmanager
+from decimal import Decimal
+from typing import AsyncIterator, Generic, Optional, TypeVar
+
+import pytest
+from fastapi import Depends, FastAPI, HTTPException
+from fastapi.testclient import TestClient
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+from sqlmodel import Field, SQLModel
+
+from class_based_fastapi import Routable, get
+from class_based_fastapi.pagination import KeysetPagination, PageParams, Paginated, decode_cursor, encode_cursor
+
+T = TypeVar('T')
+
+
+class Score_Pagination(SQLModel, table=True):
+    id: Optional[int] = Field(default=None, primary_key=True)
+    score: int
+    created: datetime.datetime
+
+
+class Price_Pagination(SQLModel, table=True):
+    id: Optional[int] = Field(default=None, primary_key=True)
+    price: Decimal = Field(max_digits=10, decimal_places=2)
+    discount: Optional[int] = None
+
+
+engine = create_async_engine('sqlite+aiosqlite://', poolclass=StaticPool)
+session_factory = async_sessionmaker(engine)
+START = datetime.datetime(2024, 1, 1, 12, 30, tzinfo=datetime.timezone.utc)
+
+
+async def get_session() -> AsyncIterator[AsyncSession]:
+    async with session_factory() as session:
+        yield session
+
+
+class CPagination_Base(KeysetPagination, Routable, Generic[T]):
+    session: AsyncSession = Depends(get_session)
+    PAGE_SIZE = 3
+
+    @get('')
+    async def items(self, page: PageParams = Depends()) -> Paginated[T]:
+        return await self.paginate(self.session, select(self.model()), page)
+
+    @classmethod
+    def model(cls) -> type:
+        return cls.__generic_types__['T']
+
+
+class CPagination_ByScore(CPagination_Base[Score_Pagination]):
+    ORDER_BY = ('-score',)
+
+
+class CPagination_ByCreated(CPagination_Base[Score_Pagination]):
+    ORDER_BY = ('created',)
+
+
+class CPagination_ByPrice(CPagination_Base[Price_Pagination]):
+    ORDER_BY = ('price',)
+
+
+class CPagination_ByDiscount(CPagination_Base[Price_Pagination]):
+    ORDER_BY = ('discount',)
+
+
+TABLES = [Score_Pagination.__table__, Price_Pagination.__table__]
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all, tables=TABLES)
+    async with session_factory() as session:
+        session.add_all(
+            Score_Pagination(score=i % 3, created=START - datetime.timedelta(minutes=i)) for i in range(8)
+        )
+        session.add_all(Price_Pagination(price=Decimal(price)) for price in ('1.10', '0.25', '1.10', '0.30', '2.00'))
+        await session.commit()
+    yield
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.drop_all, tables=TABLES)
+
+
+@pytest.fixture
+def client() -> TestClient:
+    app = FastAPI(lifespan=lifespan)
+    app.include_router(CPagination_ByScore.routes())
+    app.include_router(CPagination_ByCreated.routes())
+    app.include_router(CPagination_ByPrice.routes())
+    with TestClient(app) as client:
+        yield client
+
+
+def read_all(client: TestClient, url: str, **params) -> list:
+    pages, cursor = [], None
+    while True:
+        page = client.get(url, params={**params, **({'cursor': cursor} if cursor else {})}).json()
+        pages.append([item['id'] for item in page['items']])
+        cursor = page['next_cursor']
+        if cursor is None:
+            return pages
+
+
+def test_cursor_round_trip() -> None:
+    cursor = encode_cursor([START, 5])
+    assert '=' not in cursor
+    assert decode_cursor(cursor, 2) == [START, 5]
+
+    # Значения восстанавливаются с типом и без потери точности
+    values = [Decimal('1.000000000000000001'), START.date(), uuid.UUID(int=7), b'\x00\xff', 'text', 0.1]
+    decoded = decode_cursor(encode_cursor(values), len(values))
+    assert decoded == values
+    assert [type(value) for value in decoded] == [type(value) for value in values]
+    with pytest.raises(HTTPException):
+        decode_cursor(cursor, 3)
+    with pytest.raises(HTTPException):
+        decode_cursor('not a cursor', 1)
+
+
+def test_mixed_direction_ordering(client: TestClient) -> None:
+    # score по убыванию, при равенстве — id по возрастанию
+    assert read_all(client, '/c-pagination-by-score/v1.0') == [[3, 6, 2], [5, 8, 1], [4, 7]]
+
+
+def test_datetime_ordering_key(client: TestClient) -> None:
+    assert read_all(client, '/c-pagination-by-created/v1.0', limit=5) == [[8, 7, 6, 5, 4], [3, 2, 1]]
+
+
+def test_decimal_ordering_key(client: TestClient) -> None:
+    assert read_all(client, '/c-pagination-by-price/v1.0', limit=2) == [[2, 4], [1, 3], [5]]
+
+
+def test_nullable_ordering_key_rejected() -> None:
+    with pytest.raises(ValueError, match='discount'):
+        CPagination_ByDiscount.keyset_order(Price_Pagination)
+
+
+def test_invalid_cursor(client: TestClient) -> None:
+    assert client.get('/c-pagination-by-score/v1.0', params={'cursor': 'x'}).status_code == 400
+    assert client.get('/c-pagination-by-price/v1.0', params={'cursor': encode_cursor(['high', 1])}).status_code == 400
+    for values in (['high', 1], [{'decimal': 'high'}, 1], [[1], 1]):
+        cursor = encode_cursor(values)
+        assert client.get('/c-pagination-by-score/v1.0', params={'cursor': cursor}).status_code == 400
+
+
+def test_generic_response_model(client: TestClient) -> None:
+    schema = client.get('/openapi.json').json()
+    operation = schema['paths']['/c-pagination-by-score/v1.0']['get']
+    assert [parameter['name'] for parameter in operation['parameters']] == ['cursor', 'limit']
+    response = operation['responses']['200']['content']['application/json']['schema']
+    assert response == {'$ref': '#/components/schemas/Paginated_Score_Pagination_'}
+    items = schema['components']['schemas']['Paginated_Score_Pagination_']['properties']['items']
+    assert items['items'] == {'$ref': '#/components/schemas/Score_Pagination'}
@@ -0,0 +1,86 @@
+import os
+from typing import List
+
+import pytest
+from fastapi import Depends, FastAPI, HTTPException
+from fastapi.testclient import TestClient
+from pydantic import BaseModel
+
+from class_based_fastapi import Routable, get, post
+from class_based_fastapi.executors import ProcessPool, get_default_process_pool
+
+reports_pool = ProcessPool(max_workers=1, name='c-process-reports')
+sessions: List[str] = []
+
+
+def get_session() -> str:
+    sessions.append('session')
+    return 'session'
+
+
+class Report(BaseModel):
+    title: str
+    rows: List[int]
+
+
+class CProcess_Reports(Routable):
+    SCALE = 10
+
+    session: str = Depends(get_session)
+
+    def render(self, report: Report) -> str:
+        return f'{report.title}: {sum(report.rows) * self.SCALE}'
+
+    @post('render', executor=reports_pool)
+    def render_report(self, report: Report) -> dict:
+        return {'text': self.render(report), 'pid': os.getpid()}
+
+    @get('score', executor='process')
+    def score(self, value: int) -> int:
+        if value < 0:
+            raise HTTPException(status_code=422, detail='negative')
+        return value * value
+
+    @get('session')
+    def current_session(self) -> str:
+        return self.session
+
+
+app = FastAPI()
+app.include_router(CProcess_Reports.routes())
+
+
+def test_runs_in_process_pool() -> None:
+    sessions.clear()
+    with TestClient(app) as client:
+        assert reports_pool._executor is not None
+        response = client.post('/c-process-reports/v1.0/render', json={'title': 'total', 'rows': [1, 2, 3]})
+        assert response.json()['text'] == 'total: 60'
+        assert response.json()['pid'] != os.getpid()
+        assert client.get('/c-process-reports/v1.0/score', params={'value': 3}).json() == 9
+        assert client.get('/c-process-reports/v1.0/score', params={'value': -1}).json() == {'detail': 'negative'}
+        # Зависимости экземпляра контроллера для методов в пуле процессов не создаются
+        assert sessions == []
+        assert client.get('/c-process-reports/v1.0/session').json() == 'session'
+        assert reports_pool.metrics()['completed'] == 1
+        assert reports_pool.metrics()['in_flight'] == 0
+    assert reports_pool._executor is None
+    assert get_default_process_pool()._executor is None
+
+
+def test_invalid_methods() -> None:
+    class CProcess_Local(Routable):
+        @get('', executor='process')
+        def index(self) -> int:
+            return 1
+
+    with pytest.raises(ValueError):
+        CProcess_Local.routes()
+
+    class CProcess_Async(CProcess_Reports):
+        @get('async', executor='process')
+        async def async_method(self) -> int:
+            return 1
+
+    with pytest.raises(ValueError):
+        CProcess_Async.routes()
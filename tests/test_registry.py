@@ -0,0 +1,72 @@
+import gc
+import weakref
+
+from class_based_fastapi import Routable, get
+from class_based_fastapi.registry import ClassRegistry
+from class_based_fastapi.routable import RoutableMeta
+
+
+class CRegistry_Base(Routable):
+
+    @get(path='item')
+    def item(self) -> int:
+        return 1
+
+
+def create_controllers(count: int) -> list:
+    controllers = []
+    for i in range(count):
+        controller = type(f'CRegistry_Generated{i}', (CRegistry_Base,), {'NAME_MODULE': f'Module{i}'})
+        controller.routes()
+        controllers.append(controller)
+    return controllers
+
+
+def test_lookup_by_name_and_qualname() -> None:
+    registry = RoutableMeta.__registry__
+
+    assert registry.find(CRegistry_Base.__name__) is CRegistry_Base
+    assert registry.get(CRegistry_Base.__module__, CRegistry_Base.__qualname__) is CRegistry_Base
+    assert RoutableMeta.get_type_instance(RoutableMeta, CRegistry_Base.__name__) is CRegistry_Base
+
+
+def test_latest_class_with_same_name_wins() -> None:
+    registry = ClassRegistry()
+    first = type('Same', (), {})
+    second = type('Same', (), {})
+    registry.register(first)
+    registry.register(second)
+    assert registry.find('Same') is second
+
+    del second
+    gc.collect()
+    assert registry.find('Same') is first
+
+
+def test_inheritors() -> None:
+    registry = ClassRegistry()
+    base = type('Base', (), {})
+    child = type('Child', (base,), {})
+    registry.register(base)
+    registry.register(child)
+
+    assert registry.inheritors(base) == [child]
+    assert registry.inheritors(child) == []
+
+
+def test_dropped_classes_are_released() -> None:
+    gc.collect()
+    registry = RoutableMeta.__registry__
+    baseline = len(registry)
+
+    controllers = create_controllers(50)
+    refs = [weakref.ref(controller) for controller in controllers]
+    assert len(registry) > baseline
+    assert all(controller in registry for controller in controllers)
+
+    del controllers
+    gc.collect()
+
+    assert all(ref() is None for ref in refs)
+    assert len(registry) == baseline
+    assert registry.find('CRegistry_Generated0') is None
@@ -0,0 +1,97 @@
+import dataclasses
+import datetime
+import uuid
+from typing import Any, Dict, List
+
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
+from fastapi.routing import APIRoute
+from fastapi.testclient import TestClient
+from pydantic import BaseModel
+
+from class_based_fastapi import Routable, get, responses
+from class_based_fastapi.responses import FastJSONResponse
+
+ID = uuid.UUID('12345678-1234-5678-1234-567812345678')
+CREATED = datetime.datetime(2024, 1, 2, 3, 4, 5, tzinfo=datetime.timezone.utc)
+
+
+@dataclasses.dataclass
+class Point:
+    x: int
+    y: int
+
+
+class Book(BaseModel):
+    id: uuid.UUID
+    created: datetime.datetime
+
+
+class CResponses_Books(Routable):
+    RESPONSE_CLASS = FastJSONResponse
+
+    @get('book')
+    def book(self) -> Book:
+        return Book(id=ID, created=CREATED)
+
+    @get('book/precompiled', precompile=True)
+    def precompiled(self) -> Book:
+        return Book(id=ID, created=CREATED)
+
+    @get('text', response_class=PlainTextResponse)
+    def text(self) -> str:
+        return 'plain'
+
+    @get('mapping')
+    def mapping(self) -> Dict[int, str]:
+        return {1: 'one'}
+
+
+class CResponses_Default(Routable):
+    @get('points')
+    def points(self) -> List[Any]:
+        return [Point(1, 2)]
+
+
+@pytest.fixture
+def client() -> TestClient:
+    app = FastAPI()
+    app.include_router(CResponses_Books.routes())
+    app.include_router(CResponses_Default.routes())
+    return TestClient(app)
+
+
+def route_class(controller: type, name: str) -> type:
+    route = next(route for route in controller.routes().routes if isinstance(route, APIRoute) and route.name == name)
+    return route.response_class.value if hasattr(route.response_class, 'value') else route.response_class
+
+
+def test_controller_response_class(client: TestClient) -> None:
+    expected = {'id': str(ID), 'created': '2024-01-02T03:04:05Z'}
+    assert route_class(CResponses_Books, 'book') is FastJSONResponse
+    assert client.get('/c-responses-books/v1.0/book').json() == expected
+    assert client.get('/c-responses-books/v1.0/book/precompiled').json() == expected
+    assert client.get('/c-responses-books/v1.0/mapping').json() == {'1': 'one'}
+    # Класс ответа декоратора имеет приоритет
+    assert client.get('/c-responses-books/v1.0/text').text == 'plain'
+
+
+def test_global_switch(monkeypatch) -> None:
+    assert route_class(CResponses_Default, 'points') is not FastJSONResponse
+    monkeypatch.setattr(Routable, 'RESPONSE_CLASS', FastJSONResponse)
+    assert route_class(CResponses_Default, 'points') is FastJSONResponse
+
+
+def test_native_types() -> None:
+    content = {'point': Point(1, 2), 'id': ID, 'created': CREATED, 'book': Book(id=ID, created=CREATED)}
+    assert FastJSONResponse(content).body == (
+        b'{"point":{"x":1,"y":2},"id":"12345678-1234-5678-1234-567812345678","created":"2024-01-02T03:04:05+00:00",'
+        b'"book":{"id":"12345678-1234-5678-1234-567812345678","created":"2024-01-02T03:04:05Z"}}'
+    )
+
+
+def test_fallback_without_orjson(monkeypatch) -> None:
+    monkeypatch.setattr(responses, 'orjson', None)
+    response = FastJSONResponse({'point': Point(1, 2), 'id': ID})
+    assert response.body == '{"point":{"x":1,"y":2},"id":"12345678-1234-5678-1234-567812345678"}'.encode()
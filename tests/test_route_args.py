@@ -0,0 +1,75 @@
+import dataclasses
+from typing import Dict, List
+
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.routing import APIRoute
+from fastapi.testclient import TestClient
+from sqlmodel import SQLModel
+
+from class_based_fastapi import Routable, get
+from class_based_fastapi.defaults import API_METHODS
+from class_based_fastapi.route_args import RouteArgs
+
+
+class Model_RouteArgs(SQLModel):
+    value: int
+
+
+def check_header() -> None:
+    pass
+
+
+RESPONSES: Dict[int, Dict[str, str]] = {404: {'description': 'Not found'}}
+DEPENDENCY = Depends(check_header)
+
+
+class CRouteArgs_Base(Routable):
+
+    @get(path='items', response_model=List[Model_RouteArgs], responses=RESPONSES, dependencies=[DEPENDENCY])
+    def items(self) -> List[Model_RouteArgs]:
+        return [Model_RouteArgs(value=1)]
+
+    @get(path='keyword')
+    def keyword(self, *, limit: int = 10) -> int:
+        return limit
+
+
+class CRouteArgs_Child(CRouteArgs_Base):
+    NAME_MODULE = 'Child'
+
+
+def test_route_args_are_immutable() -> None:
+    args = RouteArgs(path='')
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        args.path = '/other'
+
+
+def test_inherited_endpoints_share_route_args() -> None:
+    base_args = getattr(CRouteArgs_Base, API_METHODS)['items']
+    child_args = getattr(CRouteArgs_Child, API_METHODS)['items']
+    assert child_args is base_args
+
+
+def test_route_fields_are_not_copied() -> None:
+    route = next(
+        route for route in CRouteArgs_Child.routes().routes
+        if isinstance(route, APIRoute) and route.path.endswith('/items')
+    )
+    assert route.path == '/child/c-route-args-child/v1.0/items'
+    assert route.dependencies[0] is DEPENDENCY
+    assert route.responses == RESPONSES
+
+    base_args = getattr(CRouteArgs_Base, API_METHODS)['items']
+    assert base_args.path == 'items'
+    assert base_args.tags is None
+
+
+def test_keyword_only_defaults_are_kept() -> None:
+    app = FastAPI()
+    app.include_router(CRouteArgs_Child.routes())
+    client = TestClient(app)
+
+    response = client.get('/child/c-route-args-child/v1.0/keyword')
+    assert response.status_code == 200
+    assert response.json() == 10
@@ -0,0 +1,77 @@
+from fastapi import FastAPI
+from fastapi.routing import APIRoute
+from fastapi.testclient import TestClient
+
+from class_based_fastapi import Routable, get
+from class_based_fastapi.routable import RoutableMeta
+
+
+class CRoutesCache_Base(Routable):
+    NAME_MODULE = 'Cache'
+
+    @get(path='item')
+    def item(self) -> int:
+        return 1
+
+
+class CRoutesCache_Child(CRoutesCache_Base):
+    pass
+
+
+def paths(router) -> list:
+    return sorted(route.path for route in router.routes if isinstance(route, APIRoute))
+
+
+def test_second_call_reuses_compiled_routes(monkeypatch) -> None:
+    CRoutesCache_Base.invalidate_routes()
+    first = CRoutesCache_Base.routes()
+
+    calls = []
+    original = RoutableMeta.get_router
+    monkeypatch.setattr(RoutableMeta, 'get_router', staticmethod(lambda cls: calls.append(cls) or original(cls)))
+
+    second = CRoutesCache_Base.routes()
+    assert calls == []
+    assert first is not second
+    assert [id(route) for route in first.routes] == [id(route) for route in second.routes]
+
+
+def test_returned_router_does_not_affect_cache() -> None:
+    router = CRoutesCache_Base.routes()
+    router.routes.clear()
+
+    assert paths(CRoutesCache_Base.routes()) == ['/cache/c-routes-cache-base/v1.0/item']
+
+
+def test_attribute_change_rebuilds_routes(monkeypatch) -> None:
+    assert paths(CRoutesCache_Child.routes()) == ['/cache/c-routes-cache-child/v1.0/item']
+
+    monkeypatch.setattr(CRoutesCache_Child, 'VERSION_API', '2.0')
+    assert paths(CRoutesCache_Child.routes()) == ['/cache/c-routes-cache-child/v2.0/item']
+
+    monkeypatch.setattr(CRoutesCache_Base, 'NAME_MODULE', 'Other')
+    assert paths(CRoutesCache_Child.routes()) == ['/other/c-routes-cache-child/v2.0/item']
+
+
+def test_invalidate_routes_rebuilds_children(monkeypatch) -> None:
+    CRoutesCache_Base.routes()
+    CRoutesCache_Child.routes()
+
+    calls = []
+    original = RoutableMeta.get_router
+    monkeypatch.setattr(RoutableMeta, 'get_router', staticmethod(lambda cls: calls.append(cls) or original(cls)))
+
+    CRoutesCache_Base.invalidate_routes()
+    CRoutesCache_Base.routes()
+    CRoutesCache_Child.routes()
+    assert len(calls) == 2
+
+
+def test_cached_routes_respond_in_several_apps() -> None:
+    for _ in range(2):
+        app = FastAPI()
+        app.include_router(CRoutesCache_Base.routes())
+
+        response = TestClient(app).get('/cache/c-routes-cache-base/v1.0/item')
+        assert response.status_code == 200
+        assert response.text == '1'
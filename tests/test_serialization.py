@@ -0,0 +1,106 @@
+from typing import List, Optional
+
+import pytest
+from fastapi import FastAPI, Response
+from fastapi.testclient import TestClient
+from pydantic import BaseModel, ConfigDict, Field
+
+from class_based_fastapi import Routable, get
+from class_based_fastapi.serialization import PreSerializedJSONResponse
+
+
+class Book(BaseModel):
+    model_config = ConfigDict(populate_by_name=True)
+
+    id: int
+    title: str = Field(alias='bookTitle')
+    note: Optional[str] = None
+
+
+class BookRow:
+    """Объект ORM: читается по атрибутам."""
+
+    def __init__(self, id: int, title: str) -> None:
+        self.id = id
+        self.title = title
+        self.note = None
+
+
+class CSerialization_Books(Routable):
+    PRECOMPILE_SERIALIZERS = True
+
+    @get('books')
+    def books(self) -> List[Book]:
+        return [BookRow(1, 'Dune'), BookRow(2, 'Солярис')]
+
+    @get('book', response_model_exclude_none=True, response_model_by_alias=False)
+    async def book(self, response: Response) -> Book:
+        response.headers['x-source'] = 'db'
+        response.status_code = 203
+        return Book(id=1, bookTitle='Dune')
+
+    @get('trusted', validate_response=False)
+    async def trusted(self) -> List[Book]:
+        return [Book(id=3, bookTitle='Ubik', note='pkd')]
+
+    @get('invalid')
+    def invalid(self) -> Book:
+        return {'id': 'x'}
+
+
+class CSerialization_Default(Routable):
+    @get('book')
+    def book(self) -> Book:
+        return Book(id=1, bookTitle='Dune')
+
+
+@pytest.fixture
+def client() -> TestClient:
+    app = FastAPI()
+    app.include_router(CSerialization_Books.routes())
+    app.include_router(CSerialization_Default.routes())
+    return TestClient(app, raise_server_exceptions=False)
+
+
+URL = '/c-serialization-books/v1.0/'
+
+
+def test_precompiled_from_attributes(client: TestClient) -> None:
+    response = client.get(URL + 'books')
+    assert response.status_code == 200
+    assert response.headers['content-type'] == 'application/json'
+    assert response.content == (
+        '[{"id":1,"bookTitle":"Dune","note":null},{"id":2,"bookTitle":"Солярис","note":null}]'.encode()
+    )
+
+
+def test_route_options_and_sub_response(client: TestClient) -> None:
+    response = client.get(URL + 'book')
+    assert response.status_code == 203
+    assert response.headers['x-source'] == 'db'
+    assert response.json() == {'id': 1, 'title': 'Dune'}
+
+
+def test_skip_validation(client: TestClient) -> None:
+    assert client.get(URL + 'trusted').json() == [{'id': 3, 'bookTitle': 'Ubik', 'note': 'pkd'}]
+
+
+def test_invalid_response(client: TestClient) -> None:
+    assert client.get(URL + 'invalid').status_code == 500
+
+
+def test_openapi_unchanged(client: TestClient) -> None:
+    schema = client.get('/openapi.json').json()
+    operation = schema['paths'][URL + 'books']['get']
+    assert 'parameters' not in operation
+    response = operation['responses']['200']['content']['application/json']
+    assert response['schema']['items'] == {'$ref': '#/components/schemas/Book'}
+    assert 'parameters' not in schema['paths'][URL + 'book']['get']
+
+
+def test_opt_in() -> None:
+    precompiled = {route.path: route.endpoint for route in CSerialization_Books.routes().routes}
+    default = {route.path: route.endpoint for route in CSerialization_Default.routes().routes}
+    assert '_cbv_response' in precompiled[URL + 'books'].__signature__.parameters
+    assert '_cbv_response' not in default['/c-serialization-default/v1.0/book'].__signature__.parameters
+    assert PreSerializedJSONResponse(b'{"a":1}').body == b'{"a":1}'
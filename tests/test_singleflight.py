@@ -0,0 +1,131 @@
+import asyncio
+import threading
+import time
+from typing import Dict, List
+
+import httpx
+import pytest
+from fastapi import FastAPI, HTTPException
+
+from class_based_fastapi import Routable, get, post
+from class_based_fastapi.singleflight import SingleFlightOptions
+from class_based_fastapi.streaming import Stream
+
+calls: Dict[str, int] = {}
+lock = threading.Lock()
+
+
+def count(name: str) -> int:
+    with lock:
+        calls[name] = calls.get(name, 0) + 1
+        return calls[name]
+
+
+class CSingleFlight_Catalogue(Routable):
+    @get('async', singleflight=True)
+    async def async_items(self, category: str = 'all') -> List[str]:
+        number = count('async')
+        await asyncio.sleep(0.05)
+        return [category, str(number)]
+
+    @get('sync', singleflight=True)
+    def sync_items(self) -> int:
+        number = count('sync')
+        time.sleep(0.05)
+        return number
+
+    @get('failing', singleflight=True)
+    async def failing(self) -> int:
+        count('failing')
+        await asyncio.sleep(0.05)
+        raise HTTPException(status_code=409, detail='conflict')
+
+    @get('tenant', singleflight=SingleFlightOptions(headers=('x-tenant',)), cache=60)
+    async def tenant(self) -> int:
+        number = count('tenant')
+        await asyncio.sleep(0.05)
+        return number
+
+    @get('plain')
+    async def plain(self) -> int:
+        number = count('plain')
+        await asyncio.sleep(0.05)
+        return number
+
+
+app = FastAPI()
+app.include_router(CSingleFlight_Catalogue.routes())
+
+
+async def fetch_all(*requests) -> List[httpx.Response]:
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url='http://test') as client:
+        return await asyncio.gather(*[client.get(url, **kwargs) for url, kwargs in requests])
+
+
+@pytest.fixture(autouse=True)
+def reset_calls() -> None:
+    calls.clear()
+
+
+URL = '/c-single-flight-catalogue/v1.0/'
+
+
+def test_async_endpoint_coalesced() -> None:
+    responses = asyncio.run(fetch_all(*[(URL + 'async', {'params': {'category': 'books'}})] * 20))
+    assert {tuple(response.json()) for response in responses} == {('books', '1')}
+    assert calls['async'] == 1
+
+    # Последовательные запросы выполняются заново
+    asyncio.run(fetch_all((URL + 'async', {'params': {'category': 'books'}})))
+    assert calls['async'] == 2
+
+
+def test_different_keys_not_coalesced() -> None:
+    responses = asyncio.run(fetch_all(
+        (URL + 'async', {'params': {'category': 'books'}}),
+        (URL + 'async', {'params': {'category': 'games'}}),
+    ))
+    assert sorted(response.json()[0] for response in responses) == ['books', 'games']
+    assert calls['async'] == 2
+
+
+def test_sync_endpoint_coalesced() -> None:
+    responses = asyncio.run(fetch_all(*[(URL + 'sync', {})] * 10))
+    assert {response.json() for response in responses} == {1}
+    assert calls['sync'] == 1
+
+
+def test_exception_shared() -> None:
+    responses = asyncio.run(fetch_all(*[(URL + 'failing', {})] * 5))
+    assert {response.status_code for response in responses} == {409}
+    assert calls['failing'] == 1
+
+
+def test_header_key_with_cache() -> None:
+    responses = asyncio.run(fetch_all(
+        *[(URL + 'tenant', {'headers': {'x-tenant': 'a'}})] * 5,
+        *[(URL + 'tenant', {'headers': {'x-tenant': 'b'}})] * 5,
+    ))
+    assert sorted({response.json() for response in responses}) == [1, 2]
+    assert calls['tenant'] == 2
+
+
+def test_disabled_by_default() -> None:
+    asyncio.run(fetch_all(*[(URL + 'plain', {})] * 5))
+    assert calls['plain'] == 5
+
+
+def test_unsafe_routes_rejected() -> None:
+    class CSingleFlight_Post(Routable):
+        @post('echo', singleflight=True)
+        async def echo(self, value: dict) -> dict:
+            return value
+
+    class CSingleFlight_Stream(Routable):
+        @get('items', singleflight=True)
+        async def items(self) -> Stream[int]:
+            yield 1
+
+    for controller in (CSingleFlight_Post, CSingleFlight_Stream):
+        with pytest.raises(ValueError):
+            controller.routes()
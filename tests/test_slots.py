@@ -0,0 +1,63 @@
+from typing import ClassVar
+
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+
+from class_based_fastapi import Routable, get
+
+
+def get_db() -> int:
+    return 5
+
+
+def get_name() -> str:
+    return 'slots'
+
+
+class CSlots_Base(Routable):
+    SLOTS = True
+    db: int = Depends(get_db)
+    limit: ClassVar[int] = 10
+
+    @get(path='db')
+    def get_db(self) -> int:
+        return self.db + self.limit
+
+
+class CSlots_Child(CSlots_Base):
+    __slots__ = ('computed',)
+    name: str = Depends(get_name)
+
+    def __init__(self) -> None:
+        self.computed = len(self.name)
+
+    @get(path='name')
+    def get_name(self) -> str:
+        return f'{self.name} {self.db} {self.computed}'
+
+
+def test_instances_have_no_dict() -> None:
+    controller = CSlots_Base(db=1)
+    assert not hasattr(controller, '__dict__')
+    assert CSlots_Base.__slots__ == ('db',)
+    assert CSlots_Child.__slots__ == ('computed', 'name')
+
+    with pytest.raises(AttributeError):
+        controller.other = 1
+
+
+def test_missing_dependency_uses_declared_default() -> None:
+    controller = CSlots_Base()
+    assert controller.db.dependency is get_db
+
+
+def test_slots_controllers_serve_requests() -> None:
+    app = FastAPI()
+    app.include_router(CSlots_Base.routes())
+    app.include_router(CSlots_Child.routes())
+    client = TestClient(app)
+
+    assert client.get('/c-slots-base/v1.0/db').json() == 15
+    assert client.get('/c-slots-child/v1.0/name').json() == 'slots 5 5'
+    assert client.get('/c-slots-child/v1.0/db').json() == 15
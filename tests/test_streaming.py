@@ -0,0 +1,176 @@
+import asyncio
+from typing import AsyncIterator, Dict, Generic, Iterator, List, TypeVar
+
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+from sqlmodel import SQLModel
+
+from class_based_fastapi import Routable, get
+from class_based_fastapi import streaming
+from class_based_fastapi.streaming import Stream
+
+T = TypeVar('T')
+
+
+class Row_Streaming(SQLModel):
+    id: int
+    name: str
+
+
+class CStreaming_Base(Routable, Generic[T]):
+    @get('ndjson')
+    async def ndjson(self, count: int = 3) -> Stream[T]:
+        for i in range(count):
+            yield {'id': i, 'name': f'row {i}', 'extra': 'dropped'}
+
+    @get('array', stream='json')
+    def array(self, count: int = 3) -> Iterator[T]:
+        for i in range(count):
+            yield Row_Streaming(id=i, name=f'row {i}')
+
+    @get('list', stream=True)
+    def as_list(self) -> List[T]:
+        return [Row_Streaming(id=1, name='one')]
+
+
+class CStreaming_Rows(CStreaming_Base[Row_Streaming]):
+    pass
+
+
+class CStreaming_LazyRows(CStreaming_Base[Row_Streaming]):
+    LAZY_ROUTES = True
+
+
+events: List[str] = []
+
+
+async def get_session() -> AsyncIterator[Dict[str, bool]]:
+    session = {'open': True}
+    events.append('open')
+    yield session
+    session['open'] = False
+    events.append('close')
+
+
+class CStreaming_Export(Routable):
+    session: Dict[str, bool] = Depends(get_session)
+
+    async def __aenter__(self) -> 'CStreaming_Export':
+        events.append('enter')
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        events.append('exit')
+
+    @get('export')
+    async def export(self) -> Stream[int]:
+        for i in range(3):
+            events.append(f'item {i}: {"open" if self.session["open"] else "closed"}')
+            yield i
+
+
+class CStreaming_LazyExport(CStreaming_Export):
+    LAZY_ROUTES = True
+
+
+def create_client(controller: type) -> TestClient:
+    app = FastAPI()
+    app.include_router(controller.routes())
+    return TestClient(app)
+
+
+@pytest.mark.parametrize('controller, prefix', [
+    (CStreaming_Rows, '/c-streaming-rows/v1.0'),
+    (CStreaming_LazyRows, '/c-streaming-lazy-rows/v1.0'),
+])
+def test_ndjson_stream(controller: type, prefix: str) -> None:
+    response = create_client(controller).get(f'{prefix}/ndjson', params={'count': 2})
+    assert response.status_code == 200
+    assert response.headers['content-type'] == 'application/x-ndjson'
+    assert response.text == '{"id":0,"name":"row 0"}\n{"id":1,"name":"row 1"}\n'
+
+
+def test_json_array_stream() -> None:
+    client = create_client(CStreaming_Rows)
+    response = client.get('/c-streaming-rows/v1.0/array')
+    assert response.headers['content-type'] == 'application/json'
+    assert response.json() == [{'id': i, 'name': f'row {i}'} for i in range(3)]
+    assert client.get('/c-streaming-rows/v1.0/array', params={'count': 0}).json() == []
+    assert client.get('/c-streaming-rows/v1.0/list').text == '{"id":1,"name":"one"}\n'
+
+
+def test_openapi_describes_items() -> None:
+    schema = create_client(CStreaming_Rows).get('/openapi.json').json()
+    expected = {'type': 'array', 'items': {'$ref': '#/components/schemas/Row_Streaming'}}
+
+    content = schema['paths']['/c-streaming-rows/v1.0/ndjson']['get']['responses']['200']['content']
+    assert list(content) == ['application/x-ndjson']
+    assert {k: v for k, v in content['application/x-ndjson']['schema'].items() if k != 'title'} == expected
+
+    content = schema['paths']['/c-streaming-rows/v1.0/array']['get']['responses']['200']['content']
+    assert {k: v for k, v in content['application/json']['schema'].items() if k != 'title'} == expected
+
+
+def test_items_are_sent_in_chunks(monkeypatch) -> None:
+    monkeypatch.setattr(streaming, 'STREAM_CHUNK_SIZE', 10)
+
+    async def items() -> AsyncIterator[int]:
+        for i in range(5):
+            yield i * 1111
+
+    async def collect() -> list:
+        return [chunk async for chunk in streaming._encode(items(), lambda item: str(item).encode(), 'json')]
+
+    chunks = asyncio.run(collect())
+    assert b''.join(chunks) == b'[0,1111,2222,3333,4444]'
+    assert len(chunks) > 1
+
+
+def test_sync_items_are_fetched_in_batches(monkeypatch) -> None:
+    monkeypatch.setattr(streaming, 'STREAM_BATCH_SIZE', 2)
+
+    def items() -> Iterator[int]:
+        yield from range(5)
+        raise RuntimeError('broken cursor')
+
+    async def collect(result, received: list) -> None:
+        async for item in streaming._iterate(result):
+            received.append(item)
+
+    received: list = []
+    with pytest.raises(RuntimeError, match='broken cursor'):
+        asyncio.run(collect(items(), received))
+    # Элементы, полученные до исключения, отправляются
+    assert received == [0, 1, 2, 3, 4]
+
+    received = []
+    asyncio.run(collect((1, 2, 3), received))
+    assert received == [1, 2, 3]
+
+
+@pytest.mark.parametrize('controller, prefix', [
+    (CStreaming_Export, '/c-streaming-export/v1.0'),
+    (CStreaming_LazyExport, '/c-streaming-lazy-export/v1.0'),
+])
+def test_dependencies_stay_open_while_streaming(controller: type, prefix: str) -> None:
+    events.clear()
+    client = create_client(controller)
+    assert client.get(f'{prefix}/export').text == '0\n1\n2\n'
+    assert events == ['open', 'enter', 'item 0: open', 'item 1: open', 'item 2: open', 'exit', 'close']
+
+    # Подмены зависимостей приложения применяются как обычно
+    events.clear()
+    client.app.dependency_overrides[get_session] = lambda: {'open': True}
+    assert client.get(f'{prefix}/export').text == '0\n1\n2\n'
+    assert events == ['enter', 'item 0: open', 'item 1: open', 'item 2: open', 'exit']
+
+
+def test_unknown_stream_format() -> None:
+    class CStreaming_Unknown(Routable):
+        @get('csv', stream='csv')
+        def rows(self) -> List[int]:
+            return []
+
+    with pytest.raises(ValueError, match='stream'):
+        CStreaming_Unknown.routes()
@@ -0,0 +1,47 @@
+import pytest
+
+from class_based_fastapi.templates_formatting import (
+    TEMPLATE_CACHE_SIZE,
+    _rest_api_naming,
+    compile_path_template,
+    format_route_path,
+    render_path_template,
+)
+
+BASE_TEMPLATE = '/{module}/{controller}/v{version}/{user_path}'
+
+
+def test_compile_path_template() -> None:
+    assert compile_path_template(BASE_TEMPLATE) == (
+        '/', 'module', '/', 'controller', '/v', 'version', '/', 'user_path', ''
+    )
+    assert compile_path_template('/static/{id}') == ('/static/{id}',)
+
+
+def test_render_keeps_unknown_parameters() -> None:
+    segments = compile_path_template(BASE_TEMPLATE)
+    assert render_path_template(segments, {'user_path': '{id}'}) == '/{module}/{controller}/v{version}/{id}'
+
+
+@pytest.mark.parametrize(
+    'user_path, name_module, path',
+    [
+        ('{id:int}', 'Children', '/children/example-controller/v1.0/{id:int}'),
+        ('', 'Children', '/children/example-controller/v1.0'),
+        ('items', '', '/example-controller/v1.0/items'),
+        ('items', None, '/example-controller/v1.0/items'),
+        ('/{controller}/get', '', '/example-controller/get'),
+        ('/{module}/get', 'Test', '/test/get'),
+        ('/{module}/get', '', '/get'),
+        ('/{version}/base-method', '', '/1.0/base-method'),
+        ('/add/{x:int}', '', '/add/{x:int}'),
+    ]
+)
+def test_format_route_path(user_path: str, name_module: str, path: str) -> None:
+    assert format_route_path(BASE_TEMPLATE, user_path, name_module, '1.0', 'ExampleController') == path
+
+
+def test_naming_cache_is_bounded() -> None:
+    assert _rest_api_naming('ExampleRoutableParent') == 'example-routable-parent'
+    assert _rest_api_naming.cache_info().maxsize == TEMPLATE_CACHE_SIZE
+    assert compile_path_template.cache_info().maxsize == TEMPLATE_CACHE_SIZE